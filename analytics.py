@@ -0,0 +1,137 @@
+import datetime
+
+import pandas as pd
+import streamlit as st
+
+from db import ConnectionUnavailable, get_query_cache, iter_query, run_query, supports_window_functions
+from frames import concat_frames
+from scheduler import run_queries
+from schema import DIMENSIONS, RATING_COLUMNS, game_join, get_dimension
+
+# ANALYTICS QUERIES SHARED BY THE PAGES
+
+DREAM_GAME_DIMENSIONS = (
+    "developer", "publisher", "genre", "setting",
+    "perspective", "pacing", "interface", "input_device",
+    "business_model", "media_type", "maturity_rating",
+)
+
+
+def _check_metric(metric):
+    if metric not in RATING_COLUMNS:
+        raise ValueError(f"Unknown rating column: {metric!r}")
+
+
+def best_in_dimension_sql(dimension_key, metric="players_rating"):
+    """Builds the query for the value of one dimension with the highest average `metric`, and that average."""
+    _check_metric(metric)
+    dim = get_dimension(dimension_key)
+    return f"""
+        SELECT '{dim.key}' AS dimension, CAST(l.{dim.column} AS CHAR) AS value, AVG(v.{metric}) AS score
+        FROM Video_game v JOIN {dim.table} l ON {game_join("v", "l")}
+        WHERE v.{metric} IS NOT NULL
+        GROUP BY l.{dim.column}
+        ORDER BY score DESC LIMIT 1
+    """
+
+
+def best_by_dimension(dimension_keys=None, metric="players_rating"):
+    """
+    Returns a DataFrame indexed by dimension key with the best `value` and its
+    average `score`. Dimensions without any rated game are missing from the index.
+
+    Each dimension is its own query and they run as one concurrent batch, so
+    the page waits for the slowest dimension rather than for all of them in
+    turn (MySQL would run the branches of a single UNION ALL one by one).
+    """
+    if dimension_keys is None:
+        dimension_keys = [dim.key for dim in DIMENSIONS]
+    results = run_queries({key: (best_in_dimension_sql(key, metric), None) for key in dimension_keys})
+    frames = [results[key] for key in dimension_keys if not results[key].empty]
+    if not frames:
+        return pd.DataFrame(columns=["value", "score"])
+    return concat_frames(frames).set_index("dimension")
+
+
+def top_n_per_group_sql(source_sql, group_column, order_column, n):
+    """Wraps `source_sql` so the database keeps only the top `n` rows of each group (needs window functions)."""
+    return f"""
+        SELECT ranked.* FROM (
+            SELECT src.*, ROW_NUMBER() OVER (PARTITION BY src.{group_column} ORDER BY src.{order_column} DESC) AS group_rank
+            FROM ({source_sql}) src
+        ) ranked
+        WHERE ranked.group_rank <= {int(n)}
+        ORDER BY ranked.{group_column}, ranked.group_rank
+    """
+
+
+def top_n_per_group(source_sql, group_column, order_column, n, params=None):
+    """
+    Returns the `n` rows with the highest `order_column` inside each
+    `group_column` group of `source_sql`, sorted by group then rank.
+
+    The ranking runs inside the database with ROW_NUMBER() so only the
+    winning rows are transferred. Servers without window functions fall back
+    to fetching `source_sql` whole and ranking it in pandas.
+    """
+    if supports_window_functions():
+        df = run_query(top_n_per_group_sql(source_sql, group_column, order_column, n), params, compact=True)
+        return df.drop(columns="group_rank", errors="ignore").reset_index(drop=True)
+
+    # The ranked result is cached under the window query it stands in for,
+    # which reads the same tables, so writes invalidate it like any result
+    cache = get_query_cache()
+    key = cache.make_key(top_n_per_group_sql(source_sql, group_column, order_column, n), params)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    generation = cache.generation(key)
+
+    # Stream the source rows and keep only the running top `n` of each group,
+    # so memory stays bounded by the number of groups rather than the catalog.
+    # A read that fails part way is reported like run_query() and never cached.
+    top = None
+    try:
+        for chunk in iter_query(source_sql, params, compact=True):
+            if top is not None:
+                chunk = concat_frames([top, chunk])
+            top = chunk.sort_values(order_column, ascending=False).groupby(group_column, observed=True).head(n)
+    except ConnectionUnavailable as e:
+        st.error(f"Error connecting to database: {e}")
+        return pd.DataFrame()
+    except Exception as e:
+        st.error(f"Query failed: {e}")
+        return pd.DataFrame()
+    if top is None or top.empty:
+        return pd.DataFrame()
+    top = top.sort_values([group_column, order_column], ascending=[True, False]).reset_index(drop=True)
+    cache.put(key, top, generation=generation)
+    return top
+
+
+def top_rated_games_sql(metric, n=10, genre=None, year=None):
+    """Builds the query for the `n` best games by `metric`, optionally limited to one genre or one release year."""
+    _check_metric(metric)
+    conditions = [f"v.{metric} IS NOT NULL"]
+    params = []
+    query = f"SELECT v.game_name, v.{metric} FROM Video_game v"
+    if genre is not None:
+        query += f" JOIN Video_game_genre g ON {game_join('v', 'g')}"
+        conditions.append("g.genre_name = %s")
+        params.append(genre)
+    if year is not None:
+        # A date range instead of YEAR(...) = %s so the release date index can be used
+        conditions.append("v.initial_release_date BETWEEN %s AND %s")
+        params.extend([datetime.date(int(year), 1, 1), datetime.date(int(year), 12, 31)])
+    query += " WHERE " + " AND ".join(conditions) + f" ORDER BY v.{metric} DESC LIMIT {int(n)}"
+    return query, tuple(params)
+
+
+def top_rated_games(metric, n=10, genre=None, year=None):
+    """Returns the `n` best games by `metric`, optionally limited to one genre or one release year."""
+    return run_query(*top_rated_games_sql(metric, n, genre, year))
+
+
+def top_rated_games_by_metric(metrics, n=10, genre=None, year=None):
+    """top_rated_games for several metrics at once, queried concurrently; returns {metric: DataFrame}."""
+    return run_queries({metric: top_rated_games_sql(metric, n, genre, year) for metric in metrics})
@@ -0,0 +1,15 @@
+"""
+Offline benchmarks for the VGDB app.
+
+    python -m benchmarks.generate --games 100000 --out bench_data        # synthetic MobyGames-shaped CSVs
+    python -m benchmarks.load --data bench_data --database vgdb_bench    # load them into a local MySQL
+    python -m benchmarks.harness --database vgdb_bench --output head.json  # replay every page's queries
+    python -m benchmarks.harness --compare base.json head.json           # diff two runs
+    python -m benchmarks.startup --output startup.json                   # cold start and rerun times
+
+The harness replays the SQL the pages send (queries.py, analytics.py,
+browser.py, director_graph.py) straight against MySQL, bypassing the app's
+result cache, so the numbers measure the database work of each page. The
+startup benchmark runs app.py itself in fresh interpreters and times the
+first script run and every page's reruns.
+"""
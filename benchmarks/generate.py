@@ -0,0 +1,193 @@
+"""
+Generates a synthetic, MobyGames-shaped catalog as one CSV file per table.
+
+    python -m benchmarks.generate --games 100000 --out bench_data [--users N] [--ratings N] [--seed 7]
+
+Every game's attributes are derived from its index with a seeded RNG, so the
+same arguments always produce the same files and ratings can reference games
+without keeping the catalog in memory (5M games stream in constant memory).
+NULLs are written as \\N, which LOAD DATA understands.
+"""
+import argparse
+import bisect
+import csv
+import datetime
+import itertools
+import os
+import random
+
+from schema import DIMENSIONS
+
+NULL = "\\N"
+
+ADJECTIVES = [
+    "Super", "Dark", "Final", "Eternal", "Lost", "Crimson", "Galactic", "Hidden", "Iron", "Mystic",
+    "Neon", "Ancient", "Broken", "Silent", "Wild", "Frozen", "Golden", "Shadow", "Cyber", "Little",
+]
+NOUNS = [
+    "Quest", "Legends", "Kingdom", "Racer", "Warriors", "Tactics", "Odyssey", "Frontier", "Dungeon",
+    "Saga", "Empire", "Rally", "Hero", "Chronicles", "Arena", "Islands", "Station", "Fortress", "Heist", "Drift",
+]
+SUFFIXES = ["", "", "", " II", " III", " 2", " 64", ": Remastered", " Deluxe", ": Director's Cut"]
+
+LOOKUP_SIZES = {
+    "genre": 30, "setting": 40, "perspective": 8, "pacing": 3, "interface": 20, "input_device": 15,
+    "business_model": 8, "media_type": 10, "maturity_rating": 40, "platform": 120,
+}
+# (min, max) number of values per game for each dimension; counts are skewed toward the minimum
+FAN_OUT = {
+    "developer": (1, 2), "publisher": (1, 2), "genre": (1, 3), "setting": (0, 2), "perspective": (1, 1),
+    "pacing": (0, 1), "interface": (0, 3), "input_device": (0, 3), "business_model": (1, 1),
+    "media_type": (1, 2), "maturity_rating": (0, 3), "platform": (1, 8),
+}
+COUNTRIES = ["USA", "Egypt", "Japan", "Germany", "Brazil", "UK", "France", "Canada", "India", "Korea"]
+GENDERS = ["Male", "Female", "Non-binary", "Prefer not to say"]
+
+
+class Skewed:
+    """Picks items with a Zipf-like skew, so a few genres/platforms/companies dominate like in real data."""
+
+    def __init__(self, items, exponent=1.1):
+        self.items = items
+        self.cumulative = list(itertools.accumulate(1 / (rank ** exponent) for rank in range(1, len(items) + 1)))
+
+    def pick(self, rng):
+        return self.items[bisect.bisect(self.cumulative, rng.random() * self.cumulative[-1])]
+
+    def sample(self, rng, k):
+        chosen = []
+        while len(chosen) < min(k, len(self.items)):
+            item = self.pick(rng)
+            if item not in chosen:
+                chosen.append(item)
+        return chosen
+
+
+def lookup_values(dim_key, companies):
+    if dim_key in ("developer", "publisher"):
+        return companies
+    label = dim_key.replace("_", " ").title()
+    return [f"{label} {i}" for i in range(1, LOOKUP_SIZES[dim_key] + 1)]
+
+
+def game_key(seed, index):
+    """Returns the (game_name, release_date) of game `index`; stable for a given seed."""
+    rng = random.Random(seed * 1_000_003 + index)
+    name = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}{rng.choice(SUFFIXES)} #{index}"
+    if rng.random() < 0.02:
+        return name, datetime.date(9999, 12, 31)   # unreleased / unknown date, as in the real catalog
+    return name, datetime.date(1975, 1, 1) + datetime.timedelta(days=rng.randrange(50 * 365))
+
+
+def _maybe(rng, probability, value):
+    return value if rng.random() < probability else NULL
+
+
+def _fan_out(rng, low, high):
+    count = low
+    while count < high and rng.random() < 0.45:
+        count += 1
+    return count
+
+
+def generate(out_dir, games, users, ratings, seed=7):
+    """Writes the CSV files into `out_dir` and returns the row count per table."""
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    companies = [f"Company {i}" for i in range(1, max(50, games // 8) + 1)]
+    directors = [f"Director {i}" for i in range(1, max(20, games // 5) + 1)]
+    pickers = {dim.key: Skewed(lookup_values(dim.key, companies)) for dim in DIMENSIONS}
+    director_picker = Skewed(directors, exponent=0.8)
+    counts = {}
+
+    def writer(table):
+        handle = open(os.path.join(out_dir, f"{table}.csv"), "w", newline="", encoding="utf-8")
+        counts[table] = 0
+        return handle, csv.writer(handle)
+
+    # Lookup tables
+    for table, values in [
+        ("Genre", lookup_values("genre", companies)),
+        ("Platform", lookup_values("platform", companies)),
+        ("Company", companies),
+    ]:
+        handle, out = writer(table)
+        for value in values:
+            out.writerow([value])
+        counts[table] = len(values)
+        handle.close()
+
+    # Games and every link table, streamed game by game
+    handles = {}
+    game_handle, game_out = writer("Video_game")
+    for dim in DIMENSIONS:
+        handles[dim.key] = writer(dim.table)
+    for index in range(games):
+        name, release_date = game_key(seed, index)
+        game_rng = random.Random(seed * 7_000_003 + index)
+        game_out.writerow([
+            name, release_date,
+            _maybe(game_rng, 0.65, round(game_rng.uniform(3.0, 9.5), 1)),     # moby_score
+            _maybe(game_rng, 0.60, round(game_rng.uniform(30, 98), 0)),        # critics_rating
+            _maybe(game_rng, 0.70, round(game_rng.uniform(1.5, 5.0), 1)),      # players_rating
+            _maybe(game_rng, 0.50, director_picker.pick(game_rng)),
+        ])
+        for dim in DIMENSIONS:
+            low, high = FAN_OUT[dim.key]
+            _, out = handles[dim.key]
+            for value in pickers[dim.key].sample(game_rng, _fan_out(game_rng, low, high)):
+                out.writerow([name, release_date, value])
+                counts[dim.table] += 1
+    counts["Video_game"] = games
+    game_handle.close()
+    for handle, _ in handles.values():
+        handle.close()
+
+    # Users and their ratings; each user rates distinct games, popular games more often
+    game_picker = Skewed(range(games), exponent=0.6) if games <= 200_000 else None
+    user_handle, user_out = writer("User")
+    rating_handle, rating_out = writer("User_Rating")
+    per_user = max(1, ratings // max(1, users))
+    for user in range(users):
+        email = f"user{user}@example.com"
+        user_out.writerow([
+            f"user{user}", email, rng.choice(GENDERS), rng.randint(13, 70),
+            datetime.date(1950, 1, 1) + datetime.timedelta(days=rng.randrange(55 * 365)), rng.choice(COUNTRIES),
+        ])
+        rated = set()
+        for _ in range(min(games, rng.randint(1, per_user * 2 - 1))):
+            # Zipf over the whole catalog is too slow to set up for millions of games; sample uniformly there
+            index = game_picker.pick(rng) if game_picker else rng.randrange(games)
+            if index in rated:
+                continue
+            rated.add(index)
+            name, release_date = game_key(seed, index)
+            rating_out.writerow([
+                email, name, release_date, round(rng.uniform(1, 10), 1),
+                datetime.date(2020, 1, 1) + datetime.timedelta(days=rng.randrange(5 * 365)),
+            ])
+            counts["User_Rating"] += 1
+    counts["User"] = users
+    user_handle.close()
+    rating_handle.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic VGDB dataset as CSV files.")
+    parser.add_argument("--games", type=int, default=10_000, help="number of games (10k to 5M)")
+    parser.add_argument("--users", type=int, help="number of users (default: games / 10)")
+    parser.add_argument("--ratings", type=int, help="approximate number of user ratings (default: games * 2)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default="bench_data")
+    args = parser.parse_args()
+
+    users = args.users if args.users is not None else max(1, args.games // 10)
+    ratings = args.ratings if args.ratings is not None else args.games * 2
+    counts = generate(args.out, args.games, users, ratings, args.seed)
+    for table, count in sorted(counts.items()):
+        print(f"{table:<28} {count:>12,}")
+
+
+if __name__ == "__main__":
+    main()
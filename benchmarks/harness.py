@@ -0,0 +1,325 @@
+"""
+Replays the query workload of every page against a MySQL database and
+reports latency percentiles and throughput as JSON.
+
+    python -m benchmarks.harness --database vgdb_bench --iterations 50 --output head.json
+    python -m benchmarks.harness --compare base.json head.json [--fail-over 1.2]
+
+Each scenario sends exactly the SQL the page builds (queries.py, analytics.py,
+browser.py) on a plain connection, without the app's result cache, with
+parameters sampled from the loaded data. Write scenarios insert into
+User / User_Rating one transaction per row like the app does, and delete
+their rows again afterwards.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+
+import mysql.connector
+
+from analytics import DREAM_GAME_DIMENSIONS, best_in_dimension_sql, top_n_per_group_sql, top_rated_games_sql
+from browser import browse_games_sql
+from db import version_supports_window_functions
+from director_graph import checksum_sql
+from instrumentation import percentile
+from queries import (
+    COMPANY_LIST,
+    GENRE_LIST,
+    MY_RATINGS,
+    PLATFORM_LIST,
+    RATING_INSERT,
+    USER_BY_EMAIL,
+    USER_INSERT,
+    YEAR_LIST,
+    devs_by_genre_source_sql,
+    platform_stats_sql,
+    top_by_genre_source_sql,
+    top_by_setting_source_sql,
+)
+from schema import get_dimension, get_game_key, set_game_key
+from search import GameSearchIndex
+
+
+def _fetch(cursor, query, params=None):
+    cursor.execute(query, params)
+    return cursor.fetchall()
+
+
+class Workload:
+    """Samples realistic parameters from the database and builds each page's scenarios."""
+
+    def __init__(self, conn, rng, window_functions=True):
+        self.conn = conn
+        self.rng = rng
+        self.window_functions = window_functions
+        cursor = conn.cursor()
+        self.genres = [row[0] for row in _fetch(cursor, GENRE_LIST)]
+        self.platforms = [row[0] for row in _fetch(cursor, PLATFORM_LIST)]
+        self.companies = [row[0] for row in _fetch(cursor, COMPANY_LIST)]
+        self.years = [row[0] for row in _fetch(cursor, YEAR_LIST)]
+        self.emails = [row[0] for row in _fetch(cursor, "SELECT email FROM User ORDER BY RAND() LIMIT 1000")]
+        self.games = _fetch(cursor, "SELECT game_name, initial_release_date FROM Video_game ORDER BY RAND() LIMIT 1000")
+        cursor.close()
+
+    def _pick(self, values):
+        return self.rng.choice(values) if values else None
+
+    def _top_n(self, source_sql, group_column, order_column, n):
+        # Mirrors analytics.top_n_per_group: rank in the database when possible, else fetch the source rows
+        if self.window_functions:
+            return top_n_per_group_sql(source_sql, group_column, order_column, n), None
+        return source_sql, None
+
+    def _browser(self, keys, next_page=False):
+        def build():
+            filters = {
+                "genre": self._pick(self.genres) if "genre" in keys else None,
+                "platform": self._pick(self.platforms) if "platform" in keys else None,
+                "developer": self._pick(self.companies) if "developer" in keys else None,
+                "publisher": self._pick(self.companies) if "publisher" in keys else None,
+            }
+            cursor = None
+            if next_page:
+                # Continue after the last row of the first page, as the Next button does
+                query, params = browse_games_sql(filters)
+                reader = self.conn.cursor()
+                rows = _fetch(reader, query, params)
+                reader.close()
+                if len(rows) > 100:
+                    last = rows[99]
+                    cursor = (float(last[2]) if last[2] is not None else None, last[0], last[1])
+            return browse_games_sql(filters, cursor)
+        return build
+
+    def read_scenarios(self):
+        """Returns [(page, scenario, build)] where build() returns (sql, params) for one iteration."""
+        def genre():
+            return self._pick(self.genres)
+
+        return [
+            ("Rate Games", "user lookup", lambda: (USER_BY_EMAIL, (self._pick(self.emails),))),
+            ("My Ratings", "rating history", lambda: (MY_RATINGS, (self._pick(self.emails),))),
+            ("Game Browser", "dropdown lists", lambda: (COMPANY_LIST, None)),
+            ("Game Browser", "no filter", self._browser(())),
+            ("Game Browser", "genre", self._browser(("genre",))),
+            ("Game Browser", "platform", self._browser(("platform",))),
+            ("Game Browser", "developer", self._browser(("developer",))),
+            ("Game Browser", "genre + platform", self._browser(("genre", "platform"))),
+            ("Game Browser", "all four filters", self._browser(("genre", "platform", "developer", "publisher"))),
+            ("Game Browser", "genre, page 2", self._browser(("genre",), next_page=True)),
+            ("Top Charts", "by genre: critics", lambda: top_rated_games_sql("critics_rating", 10, genre=genre())),
+            ("Top Charts", "by genre: players", lambda: top_rated_games_sql("players_rating", 10, genre=genre())),
+            ("Top Charts", "by year: critics", lambda: top_rated_games_sql("critics_rating", 10, year=self._pick(self.years))),
+            ("Top Charts", "by year: players", lambda: top_rated_games_sql("players_rating", 10, year=self._pick(self.years))),
+            ("Top Charts", "top 5 moby (genre)", lambda: self._top_n(top_by_genre_source_sql(), "genre_name", "moby_score", 5)),
+            ("Top Charts", "top 5 moby (setting)", lambda: self._top_n(top_by_setting_source_sql(), "setting_name", "moby_score", 5)),
+            ("Top Charts", "top 5 devs (genre)", lambda: self._top_n(devs_by_genre_source_sql(), "genre_name", "avg_critic_rating", 5)),
+            # The page runs one query per dimension concurrently; its latency is the slowest one's
+            ("Dream Game Builder", "best in one dimension", lambda: (best_in_dimension_sql(self._pick(DREAM_GAME_DIMENSIONS)), None)),
+            ("Director Analytics", "graph checksums: games", lambda: (checksum_sql(), None)),
+            ("Director Analytics", "graph checksums: developer", lambda: (checksum_sql(get_dimension("developer")), None)),
+            ("Platform Stats", "platform aggregate", lambda: (platform_stats_sql(), None)),
+        ]
+
+
+def _summarize(page, scenario, samples_ms, elapsed):
+    ordered = sorted(samples_ms)
+    return {
+        "page": page,
+        "scenario": scenario,
+        "iterations": len(ordered),
+        "p50_ms": round(percentile(ordered, 50), 3),
+        "p95_ms": round(percentile(ordered, 95), 3),
+        "p99_ms": round(percentile(ordered, 99), 3),
+        "mean_ms": round(sum(ordered) / len(ordered), 3),
+        "min_ms": round(ordered[0], 3),
+        "max_ms": round(ordered[-1], 3),
+        "ops_per_s": round(len(ordered) / elapsed, 2) if elapsed else None,
+    }
+
+
+def run_reads(conn, workload, iterations, warmup, pages=None):
+    results = []
+    cursor = conn.cursor()
+    for page, scenario, build in workload.read_scenarios():
+        if pages and page not in pages:
+            continue
+        for _ in range(warmup):
+            _fetch(cursor, *build())
+        samples = []
+        started = time.perf_counter()
+        for _ in range(iterations):
+            query, params = build()
+            t0 = time.perf_counter()
+            _fetch(cursor, query, params)
+            samples.append((time.perf_counter() - t0) * 1000)
+        results.append(_summarize(page, scenario, samples, time.perf_counter() - started))
+        print(f"{page:<20} {scenario:<24} p50 {results[-1]['p50_ms']:>9.2f} ms  p95 {results[-1]['p95_ms']:>9.2f} ms", file=sys.stderr)
+    cursor.close()
+    return results
+
+
+def run_writes(conn, workload, burst):
+    """User registrations and a burst of rating submissions, one commit per row like the app."""
+    tag = uuid.uuid4().hex[:8]
+    cursor = conn.cursor()
+    results = []
+
+    samples = []
+    started = time.perf_counter()
+    emails = []
+    for i in range(burst):
+        email = f"bench-{tag}-{i}@example.com"
+        t0 = time.perf_counter()
+        cursor.execute(USER_INSERT, (f"bench{tag}{i}", email, "Prefer not to say", 30, datetime.date(1990, 1, 1), "Nowhere"))
+        conn.commit()
+        samples.append((time.perf_counter() - t0) * 1000)
+        emails.append(email)
+    results.append(_summarize("User Registration", "register user", samples, time.perf_counter() - started))
+
+    samples = []
+    started = time.perf_counter()
+    for i in range(burst):
+        game_name, release_date = workload.games[i % len(workload.games)]
+        t0 = time.perf_counter()
+        cursor.execute(RATING_INSERT, (emails[i % len(emails)], game_name, release_date, round(workload.rng.uniform(1, 10), 1)))
+        conn.commit()
+        samples.append((time.perf_counter() - t0) * 1000)
+    results.append(_summarize("Rate Games", "rating insert burst", samples, time.perf_counter() - started))
+
+    # Clean up so repeated runs measure the same data
+    cursor.execute("DELETE FROM User_Rating WHERE email LIKE %s", (f"bench-{tag}-%",))
+    cursor.execute("DELETE FROM User WHERE email LIKE %s", (f"bench-{tag}-%",))
+    conn.commit()
+    cursor.close()
+    return results
+
+
+def run_search(conn, workload, iterations):
+    """Build time of the in-process title index and its latency on typed prefixes/substrings."""
+    cursor = conn.cursor()
+    started = time.perf_counter()
+    index = GameSearchIndex()
+    index.sync(_fetch(cursor, "SELECT game_name, initial_release_date FROM Video_game"))
+    build_ms = (time.perf_counter() - started) * 1000
+    cursor.close()
+
+    samples = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        name = workload.rng.choice(workload.games)[0]
+        start = workload.rng.randrange(max(1, len(name) - 4))
+        term = name[start:start + workload.rng.randint(2, 8)]
+        t0 = time.perf_counter()
+        index.search(term)
+        samples.append((time.perf_counter() - t0) * 1000)
+    result = _summarize("Rate Games", "title search (index)", samples, time.perf_counter() - started)
+    result["build_ms"] = round(build_ms, 1)
+    return [result]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _dataset_sizes(conn):
+    cursor = conn.cursor()
+    sizes = {table: _fetch(cursor, f"SELECT COUNT(*) FROM {table}")[0][0] for table in ["Video_game", "User", "User_Rating"]}
+    cursor.close()
+    return sizes
+
+
+def compare(base_path, head_path, fail_over=None):
+    """Prints p50/p95 of two result files side by side; returns 1 if any p95 regressed beyond `fail_over`."""
+    with open(base_path) as handle:
+        base = {(r["page"], r["scenario"]): r for r in json.load(handle)["results"]}
+    with open(head_path) as handle:
+        head = {(r["page"], r["scenario"]): r for r in json.load(handle)["results"]}
+
+    status = 0
+    print(f"{'page':<20} {'scenario':<24} {'p50 base':>10} {'p50 head':>10} {'p95 base':>10} {'p95 head':>10} {'p95 x':>7}")
+    for key in sorted(base.keys() & head.keys()):
+        b, h = base[key], head[key]
+        ratio = h["p95_ms"] / b["p95_ms"] if b["p95_ms"] else float("inf")
+        flag = ""
+        if fail_over and ratio > fail_over:
+            flag = "  <- regression"
+            status = 1
+        print(f"{key[0]:<20} {key[1]:<24} {b['p50_ms']:>10.2f} {h['p50_ms']:>10.2f} "
+              f"{b['p95_ms']:>10.2f} {h['p95_ms']:>10.2f} {ratio:>7.2f}{flag}")
+    for key in sorted(base.keys() ^ head.keys()):
+        print(f"{key[0]:<20} {key[1]:<24} only in {'base' if key in base else 'head'}")
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the VGDB page queries against MySQL.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3306)
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default=os.environ.get("MYSQL_PWD", ""))
+    parser.add_argument("--database", default="vgdb_bench")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--burst", type=int, default=200, help="rows per write scenario")
+    parser.add_argument("--pages", help="comma-separated page names to run (default: all)")
+    parser.add_argument("--game-key", choices=["composite", "surrogate"], default="composite")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write the JSON results here (default: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="compare two result files")
+    parser.add_argument("--fail-over", type=float, help="with --compare: exit 1 if a p95 grew by more than this factor")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(*args.compare, fail_over=args.fail_over))
+
+    set_game_key(args.game_key)
+    pages = set(args.pages.split(",")) if args.pages else None
+    conn = mysql.connector.connect(
+        host=args.host, port=args.port, user=args.user, password=args.password, database=args.database,
+    )
+    server = conn.get_server_info()
+    workload = Workload(conn, random.Random(args.seed), window_functions=version_supports_window_functions(server))
+
+    results = run_reads(conn, workload, args.iterations, args.warmup, pages)
+    if not pages or "Rate Games" in pages:
+        results += run_search(conn, workload, args.iterations * 20)
+    if not pages or pages & {"Rate Games", "User Registration"}:
+        results += run_writes(conn, workload, args.burst)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "server": server,
+            "python": platform.python_version(),
+            "game_key": get_game_key(),
+            "iterations": args.iterations,
+            "dataset": _dataset_sizes(conn),
+        },
+        "results": results,
+    }
+    conn.close()
+
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
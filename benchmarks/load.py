@@ -0,0 +1,174 @@
+"""
+Loads a dataset written by benchmarks.generate into a local MySQL database.
+
+    python -m benchmarks.load --data bench_data --database vgdb_bench [--host 127.0.0.1 --port 3306 --user root --password ...]
+                              [--migrate] [--surrogate-keys]
+
+Creates the tables (dropping existing ones), bulk loads each CSV with
+LOAD DATA LOCAL INFILE (falling back to batched inserts when the server has
+local_infile disabled) and optionally applies the app's migrations so a run
+can be compared with and without the indexes.
+"""
+import argparse
+import csv
+import os
+import time
+
+import mysql.connector
+
+from bulk_import import batches
+from migrations import MIGRATIONS, SURROGATE_KEY_MIGRATIONS, apply_migrations
+from schema import DIMENSIONS
+
+LINK_TABLE_DDL = """
+    CREATE TABLE {table} (
+        game_name VARCHAR(255) NOT NULL,
+        initial_release_date DATE NOT NULL,
+        {column} VARCHAR(255) NOT NULL,
+        PRIMARY KEY (game_name, initial_release_date, {column})
+    )
+"""
+
+TABLE_DDL = {
+    "Genre": "CREATE TABLE Genre (genre_name VARCHAR(255) PRIMARY KEY)",
+    "Platform": "CREATE TABLE Platform (platform_name VARCHAR(255) PRIMARY KEY)",
+    "Company": "CREATE TABLE Company (name VARCHAR(255) PRIMARY KEY)",
+    "Video_game": """
+        CREATE TABLE Video_game (
+            game_name VARCHAR(255) NOT NULL,
+            initial_release_date DATE NOT NULL,
+            moby_score DECIMAL(4, 2) NULL,
+            critics_rating DECIMAL(5, 2) NULL,
+            players_rating DECIMAL(4, 2) NULL,
+            director_name VARCHAR(255) NULL,
+            PRIMARY KEY (game_name, initial_release_date)
+        )
+    """,
+    "User": """
+        CREATE TABLE User (
+            email VARCHAR(255) PRIMARY KEY,
+            username VARCHAR(255) NOT NULL,
+            gender VARCHAR(32) NULL,
+            age INT NULL,
+            birthdate DATE NULL,
+            country VARCHAR(64) NULL
+        )
+    """,
+    "User_Rating": """
+        CREATE TABLE User_Rating (
+            email VARCHAR(255) NOT NULL,
+            game_name VARCHAR(255) NOT NULL,
+            initial_release_date DATE NOT NULL,
+            rating_score DECIMAL(3, 1) NOT NULL,
+            rating_date DATE NOT NULL,
+            PRIMARY KEY (email, game_name, initial_release_date)
+        )
+    """,
+}
+for _dim in DIMENSIONS:
+    TABLE_DDL[_dim.table] = LINK_TABLE_DDL.format(table=_dim.table, column=_dim.column)
+
+# Column order of each CSV file, matching benchmarks.generate
+TABLE_COLUMNS = {
+    "Genre": ["genre_name"],
+    "Platform": ["platform_name"],
+    "Company": ["name"],
+    "Video_game": ["game_name", "initial_release_date", "moby_score", "critics_rating", "players_rating", "director_name"],
+    "User": ["username", "email", "gender", "age", "birthdate", "country"],
+    "User_Rating": ["email", "game_name", "initial_release_date", "rating_score", "rating_date"],
+}
+for _dim in DIMENSIONS:
+    TABLE_COLUMNS[_dim.table] = ["game_name", "initial_release_date", _dim.column]
+
+
+def create_tables(conn):
+    cursor = conn.cursor()
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    for table, ddl in TABLE_DDL.items():
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.execute(ddl)
+    cursor.execute("DROP TABLE IF EXISTS schema_migrations")
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+    cursor.close()
+
+
+def _load_infile(cursor, table, path):
+    columns = ", ".join(TABLE_COLUMNS[table])
+    cursor.execute(f"""
+        LOAD DATA LOCAL INFILE %s INTO TABLE {table}
+        CHARACTER SET utf8mb4
+        FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"'
+        LINES TERMINATED BY '\\r\\n'
+        ({columns})
+    """, (os.path.abspath(path),))
+
+
+def _load_batched(conn, table, path, batch_size=5000):
+    columns = TABLE_COLUMNS[table]
+    statement = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+    cursor = conn.cursor()
+    with open(path, newline="", encoding="utf-8") as handle:
+        rows = ([None if value == "\\N" else value for value in row] for row in csv.reader(handle))
+        for batch in batches(rows, batch_size):
+            cursor.executemany(statement, batch)
+            conn.commit()
+    cursor.close()
+
+
+def load_table(conn, table, path, use_infile=True):
+    """Loads one CSV file; returns False when LOAD DATA LOCAL was refused and the batched path was used."""
+    if use_infile:
+        cursor = conn.cursor()
+        try:
+            _load_infile(cursor, table, path)
+            conn.commit()
+            return True
+        except mysql.connector.Error:
+            conn.rollback()
+        finally:
+            cursor.close()
+    _load_batched(conn, table, path)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load a generated VGDB dataset into MySQL.")
+    parser.add_argument("--data", default="bench_data")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3306)
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default=os.environ.get("MYSQL_PWD", ""))
+    parser.add_argument("--database", default="vgdb_bench")
+    parser.add_argument("--migrate", action="store_true", help="apply the app's index migrations after loading")
+    parser.add_argument("--surrogate-keys", action="store_true", help="also apply the integer game_id migrations")
+    args = parser.parse_args()
+
+    conn = mysql.connector.connect(
+        host=args.host, port=args.port, user=args.user, password=args.password, allow_local_infile=True,
+    )
+    cursor = conn.cursor()
+    cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{args.database}`")
+    cursor.execute(f"USE `{args.database}`")
+    cursor.close()
+
+    create_tables(conn)
+    use_infile = True
+    for table in TABLE_DDL:
+        path = os.path.join(args.data, f"{table}.csv")
+        if not os.path.exists(path):
+            print(f"{table:<28} skipped (no {path})")
+            continue
+        started = time.perf_counter()
+        use_infile = load_table(conn, table, path, use_infile)
+        print(f"{table:<28} {time.perf_counter() - started:8.1f}s")
+
+    if args.migrate or args.surrogate_keys:
+        migrations = MIGRATIONS + (SURROGATE_KEY_MIGRATIONS if args.surrogate_keys else [])
+        started = time.perf_counter()
+        applied = apply_migrations(conn, migrations)
+        print(f"Applied migrations {applied} in {time.perf_counter() - started:.1f}s")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Measures how long the app takes to start and to rerun, without a browser.
+
+    python -m benchmarks.startup                                    # every page, 5 cold starts
+    python -m benchmarks.startup --runs 10 --reruns 20 --pages "Top Charts,Platform Stats"
+    python -m benchmarks.startup --output startup.json
+
+Each run starts a fresh interpreter, as a new container does on scale-out,
+and drives app.py with Streamlit's AppTest using .streamlit/secrets.toml
+(run it from the project directory). Per run it records:
+
+  process_ms     interpreter start until the first page is on screen
+  first_run_ms   the first script run (app imports, shared resources, default page)
+  pages          for each page: first_ms, the first switch to it (imports its
+                 views/ module), and p50/p95 of `--reruns` reruns that change nothing
+
+The report holds the median of every number over the runs. Pages query the
+configured database, so point the secrets at a loaded one (benchmarks.load)
+for representative page times.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from instrumentation import percentile
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+SCRIPT_TIMEOUT = 120   # seconds AppTest waits for one script run
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def measure(pages, reruns, launched_at=None):
+    """
+    One cold start in this interpreter; returns the timings of a single run.
+    `launched_at` is the time.time() at which the parent started the process.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    from views import PAGES
+
+    at = AppTest.from_file(APP, default_timeout=SCRIPT_TIMEOUT)
+    started = time.perf_counter()
+    at.run()
+    result = {
+        "process_ms": _ms(time.time() - launched_at) if launched_at else None,
+        "first_run_ms": _ms(time.perf_counter() - started),
+        "errors": len(at.exception),
+        "pages": {},
+    }
+
+    for page in pages or PAGES:
+        started = time.perf_counter()
+        at.sidebar.radio[0].set_value(page).run()
+        first = time.perf_counter() - started
+        samples = []
+        for _ in range(reruns):
+            started = time.perf_counter()
+            at.run()
+            samples.append(time.perf_counter() - started)
+        samples.sort()
+        result["pages"][page] = {
+            "first_ms": _ms(first),
+            "rerun_p50_ms": _ms(percentile(samples, 50)) if samples else None,
+            "rerun_p95_ms": _ms(percentile(samples, 95)) if samples else None,
+            "errors": len(at.exception),
+        }
+    return result
+
+
+def _child_run(pages, reruns):
+    command = [sys.executable, "-m", "benchmarks.startup", "--child", "--reruns", str(reruns), "--launched-at", repr(time.time())]
+    if pages:
+        command += ["--pages", ",".join(pages)]
+    completed = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _median(values):
+    values = [value for value in values if value is not None]
+    return round(statistics.median(values), 3) if values else None
+
+
+def summarize(runs):
+    """Median of every timing over the runs."""
+    pages = runs[0]["pages"]
+    return {
+        "process_ms": _median([run["process_ms"] for run in runs]),
+        "first_run_ms": _median([run["first_run_ms"] for run in runs]),
+        "errors": max(run["errors"] for run in runs),
+        "pages": {
+            page: {key: _median([run["pages"][page][key] for run in runs]) for key in pages[page]}
+            for page in pages
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the VGDB app's cold start and rerun times.")
+    parser.add_argument("--runs", type=int, default=5, help="cold starts, each in a fresh interpreter")
+    parser.add_argument("--reruns", type=int, default=10, help="reruns timed per page")
+    parser.add_argument("--pages", help="comma-separated page names to visit (default: all)")
+    parser.add_argument("--output", help="write the JSON results here (default: stdout)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--launched-at", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    pages = args.pages.split(",") if args.pages else None
+
+    if args.child:
+        print(json.dumps(measure(pages, args.reruns, args.launched_at)))
+        return
+
+    runs = [_child_run(pages, args.reruns) for _ in range(args.runs)]
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "cwd": os.getcwd(),
+            "runs": args.runs,
+            "reruns": args.reruns,
+        },
+        "summary": summarize(runs),
+        "runs": runs,
+    }
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
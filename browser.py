@@ -0,0 +1,88 @@
+import datetime
+import math
+
+from db import run_query
+from schema import game_join, get_dimension
+
+# GAME BROWSER FILTERING
+#
+# Each active filter becomes an EXISTS probe on its link table, so a game that
+# has several genres or platforms still comes back exactly once and tables
+# without an active filter are never touched. Pages are walked with a keyset
+# cursor on the sort key (moby_score DESC, game_name, initial_release_date)
+# instead of OFFSET, so page 50 costs the same as page 1.
+
+PAGE_SIZE = 100
+BROWSER_COLUMNS = "v.game_name, v.initial_release_date, v.moby_score, v.critics_rating, v.players_rating"
+BROWSER_ORDER = "v.moby_score DESC, v.game_name, v.initial_release_date"
+
+
+def _keyset_condition(cursor):
+    """Returns the WHERE fragment and params selecting the rows that sort after `cursor`."""
+    score, name, release_date = cursor
+    after_name = "(v.game_name > %s OR (v.game_name = %s AND v.initial_release_date > %s))"
+    if score is None:
+        # MySQL sorts NULL scores last in DESC order, so only unscored games can follow
+        return f"(v.moby_score IS NULL AND {after_name})", [name, name, release_date]
+    return (
+        f"(v.moby_score < %s OR v.moby_score IS NULL OR (v.moby_score = %s AND {after_name}))",
+        [score, score, name, name, release_date],
+    )
+
+
+def browse_games_sql(filters, cursor=None, page_size=PAGE_SIZE):
+    """
+    Builds the Game Browser query.
+
+    `filters` maps a dimension key ("genre", "platform", "developer",
+    "publisher") to the selected value; empty values are skipped. `cursor` is
+    the sort key of the last row of the previous page. One extra row is
+    fetched so the caller can tell whether another page follows.
+    """
+    conditions = []
+    params = []
+
+    for key, value in filters.items():
+        if value is None:
+            continue
+        dim = get_dimension(key)
+        conditions.append(
+            f"EXISTS (SELECT 1 FROM {dim.table} f WHERE {game_join('v', 'f')} AND f.{dim.column} = %s)"
+        )
+        params.append(value)
+
+    if cursor is not None:
+        condition, cursor_params = _keyset_condition(cursor)
+        conditions.append(condition)
+        params.extend(cursor_params)
+
+    query = f"SELECT {BROWSER_COLUMNS} FROM Video_game v"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += f" ORDER BY {BROWSER_ORDER} LIMIT {int(page_size) + 1}"
+    return query, tuple(params)
+
+
+def _cursor_from_row(row):
+    score = row["moby_score"]
+    if score is None or (isinstance(score, float) and math.isnan(score)):
+        score = None
+    else:
+        score = float(score)
+    release_date = row["initial_release_date"]
+    if isinstance(release_date, datetime.datetime):
+        release_date = release_date.date()
+    return score, row["game_name"], release_date
+
+
+def browse_games(filters, cursor=None, page_size=PAGE_SIZE):
+    """
+    Returns (page, next_cursor) for the Game Browser. `next_cursor` is None on
+    the last page.
+    """
+    query, params = browse_games_sql(filters, cursor, page_size)
+    df = run_query(query, params)
+    if len(df) <= page_size:
+        return df, None
+    page = df.iloc[:page_size]
+    return page, _cursor_from_row(page.iloc[-1])
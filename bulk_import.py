@@ -0,0 +1,323 @@
+"""
+Bulk import of users and ratings from CSV or JSONL files.
+
+Run from the project directory (reads .streamlit/secrets.toml):
+
+    python bulk_import.py users users.csv
+    python bulk_import.py ratings ratings.jsonl --batch-size 5000 --rejects rejects.csv
+
+Files are streamed and loaded in batches, one transaction per batch, so
+memory use does not grow with the file size. Rows that fail validation or
+insertion are written to the rejects file with the reason and never stop
+the rest of the load.
+
+Columns:
+    users    username, email, gender, age, birthdate, country
+    ratings  email, game_name, initial_release_date, rating_score, rating_date (optional, defaults to today)
+"""
+import argparse
+import csv
+import datetime
+import json
+import sys
+from itertools import islice
+
+import mysql.connector
+
+from queries import RATING_IMPORT, USER_INSERT
+
+DEFAULT_BATCH_SIZE = 1000
+DEADLOCK_RETRIES = 3
+# Deadlock and lock wait timeout: the server may have rolled back the rows
+# inserted so far, so the whole batch is retried instead of counted
+RETRY_ERRNOS = (1205, 1213)
+
+
+class RowError(ValueError):
+    """A row that cannot be imported; the message is written to the rejects file."""
+
+
+# READING
+
+def read_rows(path, fmt=None):
+    """Yields (line_number, row dict) from a CSV or JSONL file, one row at a time."""
+    if fmt is None:
+        fmt = "jsonl" if path.endswith((".jsonl", ".ndjson", ".json")) else "csv"
+    handle = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(handle)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as err:
+                    row = {"_error": f"invalid JSON: {err}"}
+                if not isinstance(row, dict):
+                    row = {"_error": "expected a JSON object per line"}
+                yield line_number, row
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def batches(rows, size):
+    """Groups an iterator into lists of at most `size` items."""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+# VALIDATION
+
+def _required(row, field):
+    value = row.get(field)
+    if value is None or str(value).strip() == "":
+        raise RowError(f"missing {field}")
+    return str(value).strip()
+
+
+def _date(row, field, default=None):
+    value = row.get(field)
+    if value is None or str(value).strip() == "":
+        if default is not None:
+            return default
+        raise RowError(f"missing {field}")
+    try:
+        return datetime.date.fromisoformat(str(value).strip()[:10])
+    except ValueError:
+        raise RowError(f"invalid {field}: {value!r}") from None
+
+
+def parse_user(row):
+    """Returns the INSERT parameters for a user row or raises RowError."""
+    age = row.get("age")
+    try:
+        age = int(age) if age not in (None, "") else None
+    except (TypeError, ValueError):
+        raise RowError(f"invalid age: {age!r}") from None
+    return (
+        _required(row, "username"),
+        _required(row, "email"),
+        row.get("gender") or None,
+        age,
+        _date(row, "birthdate") if row.get("birthdate") else None,
+        row.get("country") or None,
+    )
+
+
+def parse_rating(row):
+    """Returns the INSERT parameters for a rating row or raises RowError."""
+    try:
+        score = float(_required(row, "rating_score"))
+    except ValueError:
+        raise RowError(f"invalid rating_score: {row.get('rating_score')!r}") from None
+    if not 1.0 <= score <= 10.0:
+        raise RowError(f"rating_score out of range: {score}")
+    return (
+        _required(row, "email"),
+        _required(row, "game_name"),
+        _date(row, "initial_release_date"),
+        score,
+        _date(row, "rating_date", default=datetime.date.today()),
+    )
+
+
+# The lookups below compare like the database's default case-insensitive
+# collation does, so a row the foreign key would accept is not rejected
+# because its email or title differs from the stored one in case only.
+
+def _existing_emails(cursor, emails):
+    """Returns the casefolded emails among `emails` that are registered."""
+    if not emails:
+        return set()
+    placeholders = ", ".join(["%s"] * len(emails))
+    cursor.execute(f"SELECT email FROM User WHERE email IN ({placeholders})", list(emails))
+    return {row[0].casefold() for row in cursor.fetchall()}
+
+
+def _existing_games(cursor, keys):
+    """Returns the (casefolded game_name, initial_release_date) keys among `keys` that exist."""
+    if not keys:
+        return set()
+    placeholders = ", ".join(["(%s, %s)"] * len(keys))
+    params = [value for key in keys for value in key]
+    cursor.execute(
+        f"SELECT game_name, initial_release_date FROM Video_game"
+        f" WHERE (game_name, initial_release_date) IN ({placeholders})",
+        params,
+    )
+    return {(name.casefold(), release_date) for name, release_date in cursor.fetchall()}
+
+
+# LOADING
+
+class ImportReport:
+    """Counts loaded and rejected rows and streams the rejects to a CSV file."""
+
+    def __init__(self, rejects_path=None):
+        self.loaded = 0
+        self.rejected = 0
+        self._file = open(rejects_path, "w", newline="", encoding="utf-8") if rejects_path else None
+        self._writer = csv.writer(self._file) if self._file else None
+        if self._writer:
+            self._writer.writerow(["line", "reason", "row"])
+
+    def reject(self, line_number, reason, row):
+        self.rejected += 1
+        if self._writer:
+            self._writer.writerow([line_number, reason, json.dumps(row, default=str)])
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+
+def _try_batch(conn, cursor, statement, good):
+    """
+    Inserts a validated batch in one transaction; on failure retries row by
+    row to isolate bad rows. Returns the (line_number, reason, row) of the
+    rows skipped once the rest is committed. Deadlocks are raised.
+    """
+    try:
+        cursor.executemany(statement, [params for _, params, _ in good])
+        conn.commit()
+        return []
+    except mysql.connector.Error as err:
+        if err.errno in RETRY_ERRNOS:
+            raise
+        conn.rollback()
+
+    # A statement error leaves the InnoDB transaction open, so the good rows
+    # still commit together after the bad ones are skipped
+    failed = []
+    for line_number, params, row in good:
+        try:
+            cursor.execute(statement, params)
+        except mysql.connector.Error as err:
+            if err.errno in RETRY_ERRNOS:
+                raise
+            failed.append((line_number, f"insert failed: {err.msg}", row))
+    conn.commit()
+    return failed
+
+
+def _insert_batch(conn, statement, good, report, pending):
+    """
+    Inserts a validated batch, retrying it whole after a deadlock. Rows
+    leave `pending` (line number -> row) once they are counted as loaded or
+    rejected, which only happens after the commit.
+    """
+    cursor = conn.cursor()
+    try:
+        for attempt in range(DEADLOCK_RETRIES + 1):
+            try:
+                failed = _try_batch(conn, cursor, statement, good)
+                break
+            except mysql.connector.Error as err:
+                if err.errno not in RETRY_ERRNOS or attempt == DEADLOCK_RETRIES:
+                    raise
+                conn.rollback()
+        for line_number, reason, row in failed:
+            report.reject(line_number, reason, row)
+        report.loaded += len(good) - len(failed)
+        pending.clear()
+    finally:
+        cursor.close()
+
+
+def load(kind, rows, pool, batch_size=DEFAULT_BATCH_SIZE, report=None, progress=None):
+    """
+    Validates and inserts (line_number, row) pairs of the given kind
+    ("users" or "ratings") in batches and returns the ImportReport.
+    """
+    report = report or ImportReport()
+    parse = parse_user if kind == "users" else parse_rating
+    statement = USER_INSERT if kind == "users" else RATING_IMPORT
+
+    for batch in batches(rows, batch_size):
+        parsed = []
+        for line_number, row in batch:
+            try:
+                if "_error" in row:
+                    raise RowError(row["_error"])
+                parsed.append((line_number, parse(row), row))
+            except RowError as err:
+                report.reject(line_number, str(err), row)
+
+        # Valid rows not yet counted as loaded or rejected
+        pending = {line_number: row for line_number, _, row in parsed}
+        try:
+            with pool.connection() as conn:
+                cursor = conn.cursor()
+                emails = _existing_emails(cursor, {params[1 if kind == "users" else 0] for _, params, _ in parsed})
+                games = set() if kind == "users" else _existing_games(cursor, {(p[1], p[2]) for _, p, _ in parsed})
+                cursor.close()
+
+                good = []
+                for line_number, params, row in parsed:
+                    if kind == "users":
+                        email = params[1].casefold()
+                        if email in emails:
+                            report.reject(line_number, f"email already registered: {params[1]}", row)
+                            del pending[line_number]
+                            continue
+                        # Also catches the same email twice in one file
+                        emails.add(email)
+                    else:
+                        if params[0].casefold() not in emails:
+                            report.reject(line_number, f"unknown user: {params[0]}", row)
+                            del pending[line_number]
+                            continue
+                        if (params[1].casefold(), params[2]) not in games:
+                            report.reject(line_number, f"unknown game: {params[1]} ({params[2]})", row)
+                            del pending[line_number]
+                            continue
+                    good.append((line_number, params, row))
+
+                if good:
+                    _insert_batch(conn, statement, good, report, pending)
+        except mysql.connector.Error as err:
+            # Lost the connection mid-batch: record the rows still in flight and keep going with a fresh one
+            for line_number, row in pending.items():
+                report.reject(line_number, f"batch failed: {err}", row)
+
+        if progress:
+            progress(report)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import users or ratings into the VGDB database.")
+    parser.add_argument("kind", choices=["users", "ratings"])
+    parser.add_argument("path", help="CSV or JSONL file, or - for stdin")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="file format (default: from the extension)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--rejects", help="CSV file to write rejected rows to")
+    args = parser.parse_args()
+
+    from db import ConnectionPool, load_db_config
+    pool = ConnectionPool(load_db_config(), size=1)
+    report = ImportReport(args.rejects)
+
+    def progress(r):
+        print(f"\rloaded {r.loaded:,}  rejected {r.rejected:,}", end="", file=sys.stderr, flush=True)
+
+    try:
+        load(args.kind, read_rows(args.path, args.format), pool, args.batch_size, report, progress)
+    finally:
+        report.close()
+        pool.close()
+    print(file=sys.stderr)
+    print(f"Loaded {report.loaded:,} {args.kind}, rejected {report.rejected:,}.")
+
+
+if __name__ == "__main__":
+    main()
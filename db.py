@@ -0,0 +1,662 @@
+import logging
+import math
+import queue
+import threading
+import time
+from contextlib import closing, contextmanager
+
+import mysql.connector
+import pandas as pd
+import streamlit as st
+
+from frames import compact_frame, concat_frames, frame_bytes
+from instrumentation import get_metrics
+from migrations import FULLTEXT_MIGRATIONS, MIGRATIONS, SURROGATE_KEY_MIGRATIONS, applied_versions, warn_missing_indexes
+from query_cache import DEFAULT_TTL, QueryCache, tables_read, tables_written
+from schema import set_game_key
+
+logger = logging.getLogger(__name__)
+
+# DATABASE CONNECTION CONFIGURATION
+
+DEFAULT_PORT = 15535
+DEFAULT_POOL_SIZE = 5
+DEFAULT_POOL_TIMEOUT = 10.0   # seconds a session waits for a free connection
+DEFAULT_PING_AFTER = 30.0     # idle seconds after which a connection is pinged on checkout
+DEFAULT_CHUNK_ROWS = 50_000   # rows fetched from the server at a time
+DEFAULT_MAX_ROWS = 1_000_000  # per-query result caps, see run_query()
+DEFAULT_MAX_RESULT_MB = 512
+DEFAULT_REPLICA_MAX_LAG = 30.0         # seconds a replica may trail the primary and still serve reads
+DEFAULT_REPLICA_CHECK_INTERVAL = 10.0  # seconds between replica health checks
+
+# Query routing (see run_query's `route`)
+PRIMARY = "primary"
+REPLICA = "replica"
+# Per-user data must reflect the user's own writes at once, so it is always read from the primary
+PRIMARY_ONLY_TABLES = frozenset({"user", "user_rating"})
+
+
+def load_db_config():
+    """Reads the MySQL connection settings from the Streamlit secrets."""
+    secrets = st.secrets["mysql"]
+    return {
+        "host": secrets["host"],
+        "user": secrets["user"],
+        "password": secrets["password"],
+        "database": secrets["database"],
+        "port": int(secrets.get("port", DEFAULT_PORT)),
+    }
+
+
+class PoolTimeout(mysql.connector.Error):
+    """Raised when no pooled connection became free within the pool timeout."""
+
+
+class ResultTooLarge(Exception):
+    """Raised while reading a result that exceeds the per-query row or memory cap."""
+
+
+class ConnectionUnavailable(Exception):
+    """Raised by fetch_query() when no database connection could be checked out."""
+
+
+class ConnectionPool:
+    """
+    A fixed-size pool of MySQL connections.
+
+    Connections are opened lazily, handed out one per caller and put back on
+    release, so the TCP/TLS handshake and authentication are paid once per
+    connection instead of once per query. A connection that sat idle for more
+    than `ping_after` seconds is pinged on checkout and reopened if the server
+    dropped it.
+    """
+
+    def __init__(self, config, size=DEFAULT_POOL_SIZE, timeout=DEFAULT_POOL_TIMEOUT, ping_after=DEFAULT_PING_AFTER):
+        self.config = dict(config)
+        self.size = size
+        self.timeout = timeout
+        self.ping_after = ping_after
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._stats = {
+            "created": 0,
+            "reused": 0,
+            "reconnects": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "in_use": 0,
+        }
+
+    def _bump(self, counter, amount=1):
+        with self._lock:
+            self._stats[counter] += amount
+
+    def _connect(self):
+        conn = mysql.connector.connect(**self.config)
+        self._bump("created")
+        return conn
+
+    def _revive(self, conn, idle_since):
+        """Returns a live connection, pinging or replacing `conn` if it may be stale."""
+        if time.monotonic() - idle_since < self.ping_after:
+            self._bump("reused")
+            return conn
+        try:
+            conn.ping(reconnect=False)
+            self._bump("reused")
+            return conn
+        except mysql.connector.Error:
+            self._close_quietly(conn)
+            self._bump("reconnects")
+            return self._connect()
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def acquire(self):
+        """Checks a connection out of the pool, waiting up to `timeout` seconds for a free slot."""
+        if not self._slots.acquire(blocking=False):
+            self._bump("waits")
+            if not self._slots.acquire(timeout=self.timeout):
+                self._bump("timeouts")
+                raise PoolTimeout(msg=f"No database connection became free within {self.timeout:.0f}s")
+
+        try:
+            try:
+                conn, idle_since = self._idle.get_nowait()
+                conn = self._revive(conn, idle_since)
+            except queue.Empty:
+                conn = self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+        self._bump("in_use")
+        return conn
+
+    def release(self, conn, discard=False):
+        """Returns a connection to the pool; broken or discarded connections are closed instead."""
+        try:
+            if not discard:
+                try:
+                    # Never hand out a connection with half a transaction on it
+                    if conn.in_transaction:
+                        conn.rollback()
+                except mysql.connector.Error:
+                    discard = True
+            if discard:
+                self._close_quietly(conn)
+            else:
+                self._idle.put((conn, time.monotonic()))
+        finally:
+            self._bump("in_use", -1)
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that checks a connection out and always gives it back."""
+        conn = self.acquire()
+        discard = False
+        try:
+            yield conn
+        except BaseException:
+            # A driver error may leave the connection unusable and any other
+            # exception may leave unread rows on it, so don't recycle it
+            discard = True
+            raise
+        finally:
+            self.release(conn, discard=discard)
+
+    def stats(self):
+        """Returns a snapshot of the pool counters."""
+        with self._lock:
+            snapshot = dict(self._stats)
+        snapshot["idle"] = self._idle.qsize()
+        snapshot["size"] = self.size
+        return snapshot
+
+    def close(self):
+        """Closes every idle connection."""
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._close_quietly(conn)
+
+
+@st.cache_resource
+def get_pool():
+    """Creates the connection pool once per process; every session shares it."""
+    secrets = st.secrets["mysql"]
+    return ConnectionPool(
+        load_db_config(),
+        size=int(secrets.get("pool_size", DEFAULT_POOL_SIZE)),
+        timeout=float(secrets.get("pool_timeout", DEFAULT_POOL_TIMEOUT)),
+        ping_after=float(secrets.get("pool_ping_after", DEFAULT_PING_AFTER)),
+    )
+
+class ReplicaSet:
+    """
+    Read replicas with their own connection pools. A background thread
+    checks every replica's replication lag; reads are spread round-robin
+    over the replicas that answered and trail the primary by at most
+    `max_lag` seconds.
+    """
+
+    def __init__(self, pools, max_lag=DEFAULT_REPLICA_MAX_LAG, check_interval=DEFAULT_REPLICA_CHECK_INTERVAL):
+        self.pools = dict(pools)            # name -> ConnectionPool
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._health = {name: {"healthy": False, "lag": None, "error": "not checked yet", "reads": 0} for name in self.pools}
+        self._next = 0
+        self._primary_reads = 0
+        if self.pools:
+            self.check()
+            threading.Thread(target=self._monitor, name="replica-health", daemon=True).start()
+
+    @staticmethod
+    def _replication_lag(conn):
+        """Seconds the server trails its source, or None when replication is not running."""
+        cursor = conn.cursor(dictionary=True)
+        try:
+            try:
+                cursor.execute("SHOW REPLICA STATUS")
+            except mysql.connector.ProgrammingError:
+                # MySQL before 8.0.22 and older MariaDB
+                cursor.execute("SHOW SLAVE STATUS")
+            status = cursor.fetchone()
+            cursor.fetchall()
+        finally:
+            cursor.close()
+        if not status:
+            raise mysql.connector.Error(msg="replication is not configured on this server")
+        lag = status.get("Seconds_Behind_Source", status.get("Seconds_Behind_Master"))
+        return None if lag is None else float(lag)
+
+    def check(self):
+        """Measures the lag of every replica once."""
+        for name, pool in self.pools.items():
+            try:
+                with pool.connection() as conn:
+                    lag = self._replication_lag(conn)
+                if lag is None:
+                    error = "replication threads are stopped"
+                elif lag > self.max_lag:
+                    error = f"{lag:.0f}s behind the primary"
+                else:
+                    error = None
+            except PoolTimeout:
+                continue   # busy, not broken: keep the last verdict
+            except mysql.connector.Error as err:
+                lag, error = None, str(err)
+            with self._lock:
+                health = self._health[name]
+                health["lag"] = lag
+                health["error"] = error
+                health["healthy"] = lag is not None and lag <= self.max_lag
+            if error:
+                logger.warning("Replica %s is not serving reads: %s", name, error)
+
+    def _monitor(self):
+        while True:
+            time.sleep(self.check_interval)
+            self.check()
+
+    def choose(self):
+        """Returns (name, pool) of the next healthy replica, or None when reads must go to the primary."""
+        with self._lock:
+            healthy = [name for name, health in self._health.items() if health["healthy"]]
+            if not healthy:
+                return None
+            name = healthy[self._next % len(healthy)]
+            self._next += 1
+            self._health[name]["reads"] += 1
+            return name, self.pools[name]
+
+    def mark_down(self, name, error):
+        """Takes a replica out of rotation until the next health check finds it healthy again."""
+        with self._lock:
+            self._health[name].update(healthy=False, error=str(error))
+        logger.warning("Replica %s taken out of rotation: %s", name, error)
+
+    def read_failed(self, pool, error):
+        """Takes the replica behind `pool` out of rotation after a driver error; the primary's pool is ignored."""
+        for name, replica_pool in self.pools.items():
+            if replica_pool is pool:
+                self.mark_down(name, error)
+                return
+
+    def note_primary_read(self):
+        with self._lock:
+            self._primary_reads += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_lag": self.max_lag,
+                "primary_reads": self._primary_reads,
+                "replicas": {name: dict(health, pool=self.pools[name].stats()) for name, health in self._health.items()},
+            }
+
+
+@st.cache_resource
+def get_replicas():
+    """
+    Creates the replica pools once per process from the [[mysql.replicas]]
+    secrets; each entry overrides the primary's connection settings.
+    """
+    secrets = st.secrets["mysql"]
+    primary = load_db_config()
+    pools = {}
+    for i, replica in enumerate(secrets.get("replicas", [])):
+        replica = dict(replica)
+        name = replica.pop("name", None) or f"{replica.get('host', primary['host'])}:{replica.get('port', primary['port'])}"
+        config = dict(primary, **replica)
+        config["port"] = int(config["port"])
+        pools[name] = ConnectionPool(
+            config,
+            size=int(secrets.get("pool_size", DEFAULT_POOL_SIZE)),
+            timeout=float(secrets.get("pool_timeout", DEFAULT_POOL_TIMEOUT)),
+            ping_after=float(secrets.get("pool_ping_after", DEFAULT_PING_AFTER)),
+        )
+    return ReplicaSet(
+        pools,
+        max_lag=float(secrets.get("replica_max_lag", DEFAULT_REPLICA_MAX_LAG)),
+        check_interval=float(secrets.get("replica_check_interval", DEFAULT_REPLICA_CHECK_INTERVAL)),
+    )
+
+
+def _acquire_for_read(query, route):
+    """
+    Checks out a connection for a read and returns (conn, pool).
+
+    route=PRIMARY always reads from the primary. route=REPLICA uses a healthy
+    replica when there is one. route=None (the default) does the same unless
+    the query reads per-user tables, or a table it reads was written through
+    run_transaction within the replica lag bound, so a session always sees
+    its own writes. A replica that fails to connect is taken out of rotation
+    and the read falls back to the primary; callers report driver errors
+    raised later by the query through ReplicaSet.read_failed().
+    """
+    replicas = get_replicas()
+    if route != PRIMARY and replicas.pools:
+        tables = tables_read(query)
+        needs_primary = route is None and (
+            tables & PRIMARY_ONLY_TABLES or get_query_cache().written_within(tables, replicas.max_lag)
+        )
+        if not needs_primary:
+            chosen = replicas.choose()
+            if chosen is not None:
+                name, pool = chosen
+                try:
+                    return pool.acquire(), pool
+                except PoolTimeout:
+                    pass   # busy, not broken
+                except mysql.connector.Error as err:
+                    replicas.mark_down(name, err)
+        replicas.note_primary_read()
+    pool = get_pool()
+    return pool.acquire(), pool
+
+
+@st.cache_resource
+def get_server_version():
+    """
+    Returns the server version string (e.g. "8.0.35" or "10.6.12-MariaDB").
+    Raises mysql.connector.Error when the server is unreachable; the failure
+    is not cached, so the next call asks again.
+    """
+    with get_pool().connection() as conn:
+        return conn.get_server_info() or ""
+
+
+@st.cache_resource
+def _check_schema():
+    # Raises on connection errors so that a failed check is not cached
+    mode = st.secrets["mysql"].get("game_key", "composite")
+    migrations = list(MIGRATIONS)
+    if st.secrets["mysql"].get("search_backend", "index") == "fulltext":
+        migrations += FULLTEXT_MIGRATIONS
+    with get_pool().connection() as conn:
+        if mode == "surrogate":
+            required = {m.version for m in SURROGATE_KEY_MIGRATIONS}
+            if required <= applied_versions(conn):
+                migrations += SURROGATE_KEY_MIGRATIONS
+            else:
+                logger.warning("game_key = \"surrogate\" but the game_id migrations are not applied; "
+                               "run `python migrations.py --surrogate-keys`. Using composite keys.")
+                mode = "composite"
+        set_game_key(mode)
+        return warn_missing_indexes(conn, migrations)
+
+
+def check_schema():
+    """
+    Picks the game join key from the secrets and warns (in the server log)
+    about indexes the app expects but the database lacks. Runs once per
+    process once the database answers; until then every call tries again
+    and composite keys stay in use. Returns the missing (table, index) pairs,
+    or None when the check could not run.
+    """
+    try:
+        return _check_schema()
+    except mysql.connector.Error as err:
+        logger.warning("Could not check the database schema: %s", err)
+        return None
+
+
+def version_supports_window_functions(version):
+    """True when a server version string is MySQL 8.0+ or MariaDB 10.2+ (ROW_NUMBER() OVER (...))."""
+    mariadb = "mariadb" in version.lower()
+    if mariadb and version.startswith("5.5.5-"):
+        version = version[len("5.5.5-"):]   # prefix older MariaDB servers report for client compatibility
+    try:
+        major, minor = (int(part) for part in version.split("-")[0].split(".")[:2])
+    except ValueError:
+        return False
+    if mariadb:
+        return (major, minor) >= (10, 2)
+    return major >= 8
+
+
+def supports_window_functions():
+    """True when the server understands ROW_NUMBER() OVER (...)."""
+    try:
+        version = get_server_version()
+    except mysql.connector.Error:
+        return False   # this call only; the next one retries
+    return version_supports_window_functions(version)
+
+# HELPER FUNCTIONS
+
+def get_connection():
+    """Checks a connection out of the shared pool. Give it back with release_connection()."""
+    try:
+        return get_pool().acquire()
+    except mysql.connector.Error as err:
+        st.error(f"Error connecting to database: {err}")
+        return None
+
+
+def release_connection(conn, discard=False):
+    """Returns a connection obtained from get_connection() to the pool."""
+    get_pool().release(conn, discard=discard)
+
+
+@st.cache_resource
+def get_query_cache():
+    """Creates the query result cache once per process; every session shares it."""
+    secrets = st.secrets["mysql"]
+    max_mb = secrets.get("cache_max_mb")
+    return QueryCache() if max_mb is None else QueryCache(max_bytes=int(max_mb) * 1024 * 1024)
+
+
+def explain_query(query, params=None):
+    """Returns the EXPLAIN rows for a SELECT as a list of dicts (used by the slow-query log)."""
+    with get_pool().connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(f"EXPLAIN {query}", params)
+        plan = cursor.fetchall()
+        cursor.close()
+        return plan
+
+
+@st.cache_resource
+def get_result_limits():
+    """Returns the (max_rows, max_bytes) cap applied to every run_query result."""
+    secrets = st.secrets["mysql"]
+    max_rows = int(secrets.get("query_max_rows", DEFAULT_MAX_ROWS))
+    max_mb = float(secrets.get("query_max_mb", DEFAULT_MAX_RESULT_MB))
+    return max_rows, int(max_mb * 1024 * 1024)
+
+
+def read_chunks(conn, query, params, chunksize, compact):
+    """Yields the result as DataFrames of up to `chunksize` rows (one empty frame when there are no rows)."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query, params)
+        columns = cursor.column_names
+        first = True
+        while True:
+            rows = cursor.fetchmany(chunksize)
+            if not rows:
+                if first:
+                    yield pd.DataFrame(columns=columns)
+                return
+            first = False
+            # coerce_float turns DECIMAL columns into floats, as pd.read_sql does
+            chunk = pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+            yield compact_frame(chunk) if compact else chunk
+    finally:
+        try:
+            cursor.close()
+        except mysql.connector.Error:
+            pass   # unread rows left by an aborted read; the caller discards the connection
+
+
+def run_query(query, params=None, ttl=DEFAULT_TTL, compact=False, max_rows=None, max_mb=None, route=None):
+    """
+    Executes a query and returns the result as a Pandas DataFrame.
+
+    Results are cached for `ttl` seconds (pass ttl=0 to always hit the
+    database). Callers must not modify the returned DataFrame in place.
+
+    With `compact=True` repeated text comes back as categoricals, other text
+    as Arrow strings and integers downcast (see frames.py). The result is
+    read in chunks and the query fails, with an error instead of a partial
+    result, once it passes `max_rows` rows or `max_mb` MB (defaults from the
+    query_max_rows / query_max_mb secrets; pass 0 to lift a cap, for loaders
+    that deliberately hold a whole table). For results too large to hold,
+    use iter_query().
+
+    When read replicas are configured, `route` picks where the query runs:
+    PRIMARY, REPLICA or None to decide from the tables it reads (see
+    _acquire_for_read).
+    """
+    try:
+        return fetch_query(query, params, ttl, compact, max_rows, max_mb, route)
+    except ConnectionUnavailable as e:
+        st.error(f"Error connecting to database: {e}")
+    except Exception as e:
+        st.error(f"Query failed: {e}")
+    return pd.DataFrame()
+
+
+def fetch_query(query, params=None, ttl=DEFAULT_TTL, compact=False, max_rows=None, max_mb=None, route=None):
+    """
+    run_query() without the page output: failures are raised instead of
+    shown, so it can run outside the script thread (see scheduler.py).
+    Raises ConnectionUnavailable when no connection could be checked out.
+    """
+    metrics = get_metrics()
+    started = time.perf_counter()
+    cache = get_query_cache() if ttl else None
+    if cache is not None:
+        key = cache.make_key(query, params) + (compact,)
+        cached = cache.get(key)
+        if cached is not None:
+            metrics.record_query(query, params, time.perf_counter() - started, cached=True)
+            return cached
+        generation = cache.generation(key)
+
+    limit_rows, limit_bytes = get_result_limits()
+    if max_rows is not None:
+        limit_rows = max_rows or math.inf
+    if max_mb is not None:
+        limit_bytes = int(max_mb * 1024 * 1024) if max_mb else math.inf
+
+    try:
+        conn, pool = _acquire_for_read(query, route)
+    except mysql.connector.Error as err:
+        raise ConnectionUnavailable(str(err)) from err
+    rows = 0
+    try:
+        chunks, nbytes = [], 0
+        with closing(read_chunks(conn, query, params, DEFAULT_CHUNK_ROWS, compact)) as reader:
+            for chunk in reader:
+                rows += len(chunk)
+                nbytes += frame_bytes(chunk)
+                if rows > limit_rows:
+                    raise ResultTooLarge(f"result has more than {limit_rows:,} rows; narrow the query or use iter_query()")
+                if nbytes > limit_bytes:
+                    raise ResultTooLarge(
+                        f"result needs more than {limit_bytes / 1024 / 1024:,.0f} MB; narrow the query or use iter_query()"
+                    )
+                chunks.append(chunk)
+        df = concat_frames(chunks)
+    except BaseException as e:
+        # An aborted read leaves unread rows on the connection
+        pool.release(conn, discard=True)
+        if isinstance(e, mysql.connector.Error):
+            get_replicas().read_failed(pool, e)
+        metrics.record_query(query, params, time.perf_counter() - started, rows=rows, error=e, explain=explain_query)
+        raise
+    pool.release(conn)
+    metrics.record_query(
+        query, params, time.perf_counter() - started,
+        rows=len(df), nbytes=frame_bytes(df), explain=explain_query,
+    )
+    if cache is not None:
+        cache.put(key, df, ttl, generation)
+    return df
+
+
+def iter_query(query, params=None, chunksize=DEFAULT_CHUNK_ROWS, compact=False, route=None):
+    """
+    Streams a query's result as DataFrames of up to `chunksize` rows, so a
+    caller that aggregates as it goes never holds the whole result. Nothing
+    is cached and no size cap applies. The connection stays checked out
+    until the iteration ends or the generator is closed. `route` is as for
+    run_query().
+
+    Failures are raised as by fetch_query(), after the chunks read so far
+    were yielded, so a caller must not keep what it built from them.
+    """
+    metrics = get_metrics()
+    started = time.perf_counter()
+    try:
+        conn, pool = _acquire_for_read(query, route)
+    except mysql.connector.Error as err:
+        raise ConnectionUnavailable(str(err)) from err
+    rows = nbytes = 0
+    finished = False
+    try:
+        with closing(read_chunks(conn, query, params, chunksize, compact)) as reader:
+            for chunk in reader:
+                rows += len(chunk)
+                nbytes += frame_bytes(chunk)
+                yield chunk
+        finished = True
+    except Exception as e:
+        if isinstance(e, mysql.connector.Error):
+            get_replicas().read_failed(pool, e)
+        metrics.record_query(query, params, time.perf_counter() - started, rows=rows, error=e, explain=explain_query)
+        raise
+    finally:
+        # A caller that stopped early leaves unread rows on the connection
+        pool.release(conn, discard=not finished)
+    metrics.record_query(query, params, time.perf_counter() - started, rows=rows, nbytes=nbytes, explain=explain_query)
+
+
+def invalidate_tables(tables):
+    """Drops cached results that read any of the given tables."""
+    if tables:
+        get_query_cache().invalidate_tables(tables)
+
+
+def run_transaction(query, params):
+    """
+    Executes an INSERT/UPDATE query on the primary and drops the cached
+    results it makes stale. The written table is read from the primary for
+    the next replica_max_lag seconds (see _acquire_for_read).
+    """
+    metrics = get_metrics()
+    started = time.perf_counter()
+    conn = get_connection()
+    if conn:
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            rows = cursor.rowcount
+            conn.commit()
+            cursor.close()
+        except mysql.connector.Error as err:
+            st.error(f"Transaction failed: {err}")
+            release_connection(conn, discard=True)
+            metrics.record_query(query, params, time.perf_counter() - started, error=err)
+            return False
+        except BaseException:
+            release_connection(conn, discard=True)
+            raise
+        release_connection(conn)
+        metrics.record_query(query, params, time.perf_counter() - started, rows=max(rows, 0))
+        invalidate_tables(tables_written(query))
+        return True
+    return False
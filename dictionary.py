@@ -0,0 +1,170 @@
+import bisect
+import threading
+import time
+
+import streamlit as st
+
+from db import get_query_cache, run_query
+from query_cache import QueryCache
+from queries import COMPANY_LIST, DIRECTOR_LIST, GENRE_LIST, PLATFORM_LIST
+from scheduler import QueryBatch
+
+# DIMENSION DICTIONARIES
+#
+# The lookup lists behind the filter dropdowns (genres, platforms, companies,
+# directors) are loaded once per process and shared by every session. A
+# dictionary reloads when its table is written through run_transaction, and
+# at most every REFRESH_INTERVAL seconds to pick up outside changes. Large lists are
+# never sent to the browser whole: dimension_selector() shows a type-ahead
+# box and only the matching slice ends up in the dropdown.
+
+REFRESH_INTERVAL = 3600   # seconds
+SELECTOR_LIMIT = 50       # values per dropdown page; smaller lists are shown whole
+
+DICTIONARY_QUERIES = {
+    "genre": GENRE_LIST,
+    "platform": PLATFORM_LIST,
+    "company": COMPANY_LIST,
+    "director": DIRECTOR_LIST,
+}
+
+
+class DimensionDictionary:
+    """A sorted, case-insensitively searchable list of one dimension's values."""
+
+    def __init__(self, query):
+        self.query = query
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._values = []
+        self._lowered = []
+        self._sorted_lowered = []   # (lowered value, position in _values)
+        self.version = None
+        self.loaded_at = None
+
+    def current_version(self):
+        return get_query_cache().generation(QueryCache.make_key(self.query))
+
+    def load(self):
+        version = self.current_version()
+        # ttl=0: the dictionary is the cache; no result caps, it needs every value
+        self.fill(run_query(self.query, ttl=0, max_rows=0, max_mb=0), version)
+
+    def fill(self, df, version):
+        """Replaces the values with the first column of `df`, read when the table was at `version`."""
+        if df.empty:
+            return
+        values = [value for value in df.iloc[:, 0].tolist() if value is not None]
+        lowered = [str(value).lower() for value in values]
+        with self._lock:
+            self._values = values
+            self._lowered = lowered
+            self._sorted_lowered = sorted((text, i) for i, text in enumerate(lowered))
+            self.version = version
+            self.loaded_at = time.time()
+
+    def is_stale(self):
+        if self.loaded_at is None or time.time() - self.loaded_at >= REFRESH_INTERVAL:
+            return True
+        return self.current_version() != self.version
+
+    def refresh_if_stale(self):
+        """Reloads when stale; concurrent callers wait for a single reload instead of each querying."""
+        if not self.is_stale():
+            return
+        with self._load_lock:
+            if self.is_stale():
+                self.load()
+
+    def __len__(self):
+        return len(self._values)
+
+    def values(self):
+        return list(self._values)
+
+    def matches(self, term, offset=0, limit=SELECTOR_LIMIT):
+        """
+        Returns (values, total): the `limit` values from `offset` among those
+        containing `term`, prefix matches first, and the number of matches.
+        """
+        term = term.strip().lower()
+        with self._lock:
+            if not term:
+                return self._values[offset:offset + limit], len(self._values)
+            start = bisect.bisect_left(self._sorted_lowered, (term,))
+            prefix = []
+            for text, i in self._sorted_lowered[start:]:
+                if not text.startswith(term):
+                    break
+                prefix.append(i)
+            prefixed = set(prefix)
+            ordered = sorted(prefix) + [
+                i for i, text in enumerate(self._lowered) if term in text and i not in prefixed
+            ]
+            return [self._values[i] for i in ordered[offset:offset + limit]], len(ordered)
+
+
+@st.cache_resource
+def _dictionaries():
+    return {name: DimensionDictionary(query) for name, query in DICTIONARY_QUERIES.items()}
+
+
+def get_dictionary(name):
+    """Returns the shared dictionary for "genre", "platform", "company" or "director", (re)loading it when stale."""
+    dictionary = _dictionaries()[name]
+    dictionary.refresh_if_stale()
+    return dictionary
+
+
+def prefetch_dictionaries(names):
+    """Loads every stale dictionary among `names` with one concurrent batch of queries."""
+    stale = {name: _dictionaries()[name] for name in names if _dictionaries()[name].is_stale()}
+    if len(stale) < 2:
+        return
+    versions = {name: dictionary.current_version() for name, dictionary in stale.items()}
+    batch = QueryBatch()
+    for name, dictionary in stale.items():
+        # Uncapped, as in DimensionDictionary.load()
+        batch.add(name, dictionary.query, ttl=0, max_rows=0, max_mb=0)
+    for name, df in batch.run().items():
+        stale[name].fill(df, versions[name])
+
+
+def dimension_selector(label, name, key, all_label="All"):
+    """
+    A dropdown over one dimension that returns the selected value, or None
+    for `all_label`. Lists longer than SELECTOR_LIMIT get a search box and
+    are paged, so only the matching slice is sent to the browser.
+    """
+    dictionary = get_dictionary(name)
+    if len(dictionary) <= SELECTOR_LIMIT:
+        choice = st.selectbox(label, [all_label] + dictionary.values(), key=key)
+        return None if choice == all_label else choice
+
+    term = st.text_input(f"{label} (type to search)", key=f"{key}_term")
+    page_key = f"{key}_page"
+    if st.session_state.get(f"{key}_last_term") != term:
+        st.session_state[f"{key}_last_term"] = term
+        st.session_state[page_key] = 0
+    page = st.session_state.get(page_key, 0)
+    values, total = dictionary.matches(term, page * SELECTOR_LIMIT, SELECTOR_LIMIT)
+
+    # Keep the current choice selectable while the search term changes
+    current = st.session_state.get(key)
+    options = [all_label] + ([current] if current not in (None, all_label) and current not in values else []) + values
+    choice = st.selectbox(label, options, key=key)
+
+    if total > SELECTOR_LIMIT:
+        pages = (total + SELECTOR_LIMIT - 1) // SELECTOR_LIMIT
+        prev_col, info_col, next_col = st.columns([1, 3, 1])
+        with prev_col:
+            if st.button("◀", key=f"{key}_prev", disabled=page == 0):
+                st.session_state[page_key] = page - 1
+                st.rerun()
+        with info_col:
+            st.caption(f"{total:,} matches · page {page + 1} of {pages}")
+        with next_col:
+            if st.button("▶", key=f"{key}_next", disabled=page + 1 >= pages):
+                st.session_state[page_key] = page + 1
+                st.rerun()
+    return None if choice == all_label else choice
@@ -0,0 +1,445 @@
+import logging
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from db import ConnectionUnavailable, fetch_query, get_query_cache
+from frames import concat_frames
+from query_cache import QueryCache
+from schema import game_join, get_dimension
+
+logger = logging.getLogger(__name__)
+
+# DIRECTOR COLLABORATION GRAPH
+#
+# Director Analytics answers its questions from an in-process graph instead
+# of grouping Video_game and its link tables on every view. For each
+# dimension in GRAPH_DIMENSIONS the graph keeps the director <-> value
+# adjacency (games together, average critic and player rating) as
+# integer-coded arrays sorted by director, plus an ordering by value, so the
+# top partners of any director and the top directors of any company or genre
+# are array slices. A director's games are kept in release order for the
+# career timeline.
+#
+# The graph is loaded once per process and shared by every session. A
+# refresh runs in the background every REFRESH_INTERVAL seconds, or sooner
+# after a source table is written through run_transaction. It first reads a
+# row count and checksum of each director's games and links, then reloads
+# only the rows of the directors whose checksum changed, and swaps in a new
+# graph built from the patched rows. When most directors changed it reloads
+# everything.
+
+GRAPH_DIMENSIONS = ("developer", "genre")
+REFRESH_INTERVAL = 600      # seconds between checksum checks
+FULL_RELOAD_SHARE = 0.25    # share of changed directors above which a refresh reloads all rows
+RELOAD_BATCH = 500          # directors per IN (...) list when reloading changed ones
+TOP_N = 10
+
+
+def _games_sql(where=""):
+    return f"""
+        SELECT v.director_name, v.game_name, v.initial_release_date, v.critics_rating, v.players_rating
+        FROM Video_game v
+        WHERE v.director_name IS NOT NULL{where}
+    """
+
+
+def _links_sql(dim, where=""):
+    return f"""
+        SELECT v.director_name, v.game_name, v.initial_release_date, l.{dim.column} AS value
+        FROM Video_game v
+                 JOIN {dim.table} l ON {game_join('v', 'l')}
+        WHERE v.director_name IS NOT NULL{where}
+    """
+
+
+def checksum_sql(dim=None):
+    """Row count and checksum per director of its games (dim=None) or of one dimension's links."""
+    if dim is None:
+        row = "v.game_name, v.initial_release_date, COALESCE(v.critics_rating, ''), COALESCE(v.players_rating, '')"
+        source = "Video_game v"
+    else:
+        row = f"v.game_name, v.initial_release_date, l.{dim.column}"
+        source = f"Video_game v JOIN {dim.table} l ON {game_join('v', 'l')}"
+    return f"""
+        SELECT v.director_name, COUNT(*) AS row_count, BIT_XOR(CRC32(CONCAT_WS('|', {row}))) AS checksum
+        FROM {source}
+        WHERE v.director_name IS NOT NULL
+        GROUP BY v.director_name
+    """
+
+
+def _fetch(query, params=None):
+    # ttl=0: the graph is the cache; no result caps, the graph needs every row
+    return fetch_query(query, params, ttl=0, compact=True, max_rows=0, max_mb=0)
+
+
+def read_checksums():
+    """One row per director with (row_count, checksum) columns for the games and each dimension."""
+    sources = {"games": checksum_sql()}
+    sources.update({key: checksum_sql(get_dimension(key)) for key in GRAPH_DIMENSIONS})
+    frames = {}
+    for name, query in sources.items():
+        df = _fetch(query)
+        frames[name] = (
+            df.assign(director_name=df["director_name"].astype(str))
+            .set_index("director_name")[["row_count", "checksum"]]
+            .astype("int64")
+        )
+    return pd.concat(frames, axis=1).fillna(-1).astype("int64")
+
+
+def read_rows(directors=None):
+    """Returns (games, {dimension: links}) for `directors`, or for every director when None."""
+    if directors is None:
+        return _fetch(_games_sql()), {key: _fetch(_links_sql(get_dimension(key))) for key in GRAPH_DIMENSIONS}
+    games, links = [], {key: [] for key in GRAPH_DIMENSIONS}
+    for start in range(0, len(directors), RELOAD_BATCH):
+        batch = list(directors[start:start + RELOAD_BATCH])
+        where = f" AND v.director_name IN ({', '.join(['%s'] * len(batch))})"
+        games.append(_fetch(_games_sql(where), batch))
+        for key in GRAPH_DIMENSIONS:
+            links[key].append(_fetch(_links_sql(get_dimension(key), where), batch))
+    return concat_frames(games), {key: concat_frames(parts) for key, parts in links.items()}
+
+
+def _game_keys(df):
+    return df["game_name"].astype(str) + "\x1f" + df["initial_release_date"].astype(str)
+
+
+def _offsets(sorted_codes, count):
+    """Start of each code's run in `sorted_codes`; code c spans [start[c], start[c + 1])."""
+    return np.searchsorted(sorted_codes, np.arange(count + 1))
+
+
+class _Adjacency:
+    """Director <-> value edges of one dimension, indexed from both ends."""
+
+    def __init__(self, values, director, value, games, avg_critic, avg_player, director_count):
+        self.values = values                     # pd.Index of value names; edges store positions in it
+        order = np.lexsort((-games, director))   # by director, most games first
+        self.director = director[order]
+        self.value = value[order]
+        self.games = games[order]
+        self.avg_critic = avg_critic[order]
+        self.avg_player = avg_player[order]
+        self.director_start = _offsets(self.director, director_count)
+        self.by_value = np.lexsort((-self.games, self.value)).astype(np.int32)
+        self.value_start = _offsets(self.value[self.by_value], len(values))
+
+    def __len__(self):
+        return len(self.director)
+
+    def of_director(self, code):
+        return np.arange(self.director_start[code], self.director_start[code + 1])
+
+    def of_value(self, code):
+        return self.by_value[self.value_start[code]:self.value_start[code + 1]]
+
+
+class CollaborationGraph:
+    """Directors, their games and their adjacency to each of GRAPH_DIMENSIONS."""
+
+    def __init__(self, games, links, checksums):
+        # Source rows and checksums, kept to patch in the next refresh
+        self.games_frame = games
+        self.links_frame = links
+        self.checksums = checksums
+        self.built_at = time.time()
+
+        games = games.drop_duplicates(["game_name", "initial_release_date"])
+        names = games["director_name"].astype(str).to_numpy()
+        self.directors = pd.Index(np.unique(names))
+        codes = self.directors.get_indexer(names).astype(np.int32)
+        dates = pd.to_datetime(games["initial_release_date"].astype(str), errors="coerce")
+        dates = dates.where(dates.dt.year < 9999)   # 9999-12-31 marks an unknown date
+        order = np.lexsort((dates.to_numpy(), codes))
+
+        self._game_director = codes[order]
+        self._game_start = _offsets(self._game_director, len(self.directors))
+        self._game_name = games["game_name"].astype(str).to_numpy()[order]
+        self._release_date = games["initial_release_date"].to_numpy()[order]
+        self._year = dates.dt.year.to_numpy()[order]
+        self._critics = pd.to_numeric(games["critics_rating"]).to_numpy(np.float32)[order]
+        self._players = pd.to_numeric(games["players_rating"]).to_numpy(np.float32)[order]
+        game_index = pd.Index(_game_keys(games).to_numpy()[order])
+
+        self._adjacency = {}
+        self._game_values = {}
+        for key, link in links.items():
+            positions = game_index.get_indexer(_game_keys(link))
+            keep = positions >= 0
+            positions = positions[keep]
+            names = link["value"].astype(str).to_numpy()[keep]
+            values = pd.Index(np.unique(names))
+            value_codes = values.get_indexer(names).astype(np.int32)
+            edges = (
+                pd.DataFrame({
+                    "director": self._game_director[positions],
+                    "value": value_codes,
+                    "critics": self._critics[positions],
+                    "players": self._players[positions],
+                })
+                .groupby(["director", "value"], sort=False)
+                .agg(games=("critics", "size"), avg_critic=("critics", "mean"), avg_player=("players", "mean"))
+                .reset_index()
+            )
+            self._adjacency[key] = _Adjacency(
+                values,
+                edges["director"].to_numpy(np.int32),
+                edges["value"].to_numpy(np.int32),
+                edges["games"].to_numpy(np.int32),
+                edges["avg_critic"].to_numpy(np.float32),
+                edges["avg_player"].to_numpy(np.float32),
+                len(self.directors),
+            )
+            # Values of each game, for the timeline
+            by_game = np.argsort(positions, kind="stable")
+            self._game_values[key] = (value_codes[by_game], _offsets(positions[by_game], len(game_index)))
+
+    def _code(self, director):
+        return self.directors.get_indexer([director])[0] if director is not None else -1
+
+    def _games_of(self, code):
+        return np.arange(self._game_start[code], self._game_start[code + 1])
+
+    def __contains__(self, director):
+        return self._code(director) >= 0
+
+    def prolific_directors(self, n=5):
+        """The `n` directors with the most games: director_name and game_count columns."""
+        counts = np.diff(self._game_start)
+        top = np.argsort(-counts, kind="stable")[:n]
+        return pd.DataFrame({"director_name": self.directors[top], "game_count": counts[top]})
+
+    def top_collaborations(self, n=5, dimension="developer"):
+        """
+        The `n` (director, value) pairs with the most games: director_name,
+        the dimension's column (company_name for developers) and collab_count.
+        """
+        adj = self._adjacency[dimension]
+        top = np.argsort(-adj.games, kind="stable")[:n]
+        return pd.DataFrame({
+            "director_name": self.directors[adj.director[top]],
+            get_dimension(dimension).column: adj.values[adj.value[top]],
+            "collab_count": adj.games[top],
+        })
+
+    def summary(self, director):
+        """Game count, active years and average ratings of one director, or None when unknown."""
+        code = self._code(director)
+        if code < 0:
+            return None
+        rows = self._games_of(code)
+        years = self._year[rows]
+        years = years[~np.isnan(years)]
+        return {
+            "games": len(rows),
+            "first_year": int(years.min()) if len(years) else None,
+            "last_year": int(years.max()) if len(years) else None,
+            "avg_critic": float(np.nanmean(self._critics[rows])) if np.isfinite(self._critics[rows]).any() else None,
+            "avg_player": float(np.nanmean(self._players[rows])) if np.isfinite(self._players[rows]).any() else None,
+        }
+
+    def timeline(self, director):
+        """A director's games in release order with their ratings and the values of each dimension."""
+        code = self._code(director)
+        rows = self._games_of(code) if code >= 0 else np.arange(0)
+        df = pd.DataFrame({
+            "year": pd.array(self._year[rows], dtype="Int16"),
+            "game_name": self._game_name[rows],
+            "initial_release_date": self._release_date[rows],
+            "critics_rating": self._critics[rows],
+            "players_rating": self._players[rows],
+        })
+        for key, (value_codes, start) in self._game_values.items():
+            values = self._adjacency[key].values
+            df[get_dimension(key).column] = [
+                ", ".join(values[value_codes[start[row]:start[row + 1]]]) for row in rows
+            ]
+        return df
+
+    def top_partners(self, director, dimension="developer", n=TOP_N):
+        """The companies (or genres, ...) a director made the most games with."""
+        adj = self._adjacency[dimension]
+        code = self._code(director)
+        rows = adj.of_director(code)[:n] if code >= 0 else np.arange(0)
+        return pd.DataFrame({
+            get_dimension(dimension).column: adj.values[adj.value[rows]],
+            "games": adj.games[rows],
+            "avg_critic": adj.avg_critic[rows],
+            "avg_player": adj.avg_player[rows],
+        })
+
+    def top_directors(self, value, dimension="developer", n=TOP_N):
+        """The directors with the most games for one company (or genre, ...)."""
+        adj = self._adjacency[dimension]
+        code = adj.values.get_indexer([value])[0] if value is not None else -1
+        rows = adj.of_value(code)[:n] if code >= 0 else np.arange(0)
+        return pd.DataFrame({
+            "director_name": self.directors[adj.director[rows]],
+            "games": adj.games[rows],
+            "avg_critic": adj.avg_critic[rows],
+            "avg_player": adj.avg_player[rows],
+        })
+
+    def shared_partners(self, director_a, director_b, dimension="developer"):
+        """Values both directors worked with and how many games each made with them."""
+        adj = self._adjacency[dimension]
+        code_a, code_b = self._code(director_a), self._code(director_b)
+        rows_a = adj.of_director(code_a) if code_a >= 0 else np.arange(0)
+        rows_b = adj.of_director(code_b) if code_b >= 0 else np.arange(0)
+        shared, in_a, in_b = np.intersect1d(adj.value[rows_a], adj.value[rows_b], return_indices=True)
+        df = pd.DataFrame({
+            get_dimension(dimension).column: adj.values[shared],
+            "games_a": adj.games[rows_a[in_a]],
+            "games_b": adj.games[rows_b[in_b]],
+        })
+        order = np.argsort(-(df["games_a"].to_numpy() + df["games_b"].to_numpy()), kind="stable")
+        return df.iloc[order].reset_index(drop=True)
+
+    def similar_directors(self, director, dimension="developer", n=TOP_N):
+        """Directors sharing the most companies (or genres, ...) with `director`."""
+        adj = self._adjacency[dimension]
+        code = self._code(director)
+        if code < 0:
+            return pd.DataFrame(columns=["director_name", "shared"])
+        partner_rows = [adj.of_value(value) for value in adj.value[adj.of_director(code)]]
+        others = adj.director[np.concatenate(partner_rows)] if partner_rows else np.arange(0)
+        shared = np.bincount(others, minlength=len(self.directors))
+        shared[code] = 0
+        top = np.argsort(-shared, kind="stable")[:n]
+        top = top[shared[top] > 0]
+        return pd.DataFrame({"director_name": self.directors[top], "shared": shared[top]})
+
+    def refreshed(self):
+        """
+        Returns a graph of the current catalog, reloading only the rows of
+        directors whose checksums changed, or self when nothing changed.
+        """
+        checksums = read_checksums()
+        directors = checksums.index.union(self.checksums.index)
+        current = checksums.reindex(directors, fill_value=-1)
+        previous = self.checksums.reindex(index=directors, columns=checksums.columns, fill_value=-1)
+        changed = directors[(current != previous).any(axis=1).to_numpy()]
+        if changed.empty:
+            self.checksums = checksums
+            return self
+        if len(changed) > FULL_RELOAD_SHARE * len(directors):
+            logger.info("Director graph: %d of %d directors changed, reloading all", len(changed), len(directors))
+            games, links = read_rows()
+        else:
+            logger.info("Director graph: reloading %d changed director(s)", len(changed))
+            fresh_games, fresh_links = read_rows(list(changed))
+            games = concat_frames([self._without(self.games_frame, changed), fresh_games])
+            links = {
+                key: concat_frames([self._without(self.links_frame[key], changed), fresh_links[key]])
+                for key in GRAPH_DIMENSIONS
+            }
+        return CollaborationGraph(games, links, checksums)
+
+    @staticmethod
+    def _without(df, directors):
+        return df[~df["director_name"].astype(str).isin(directors)]
+
+    def stats(self):
+        return {
+            "directors": len(self.directors),
+            "games": len(self._game_director),
+            "edges": {key: len(adj) for key, adj in self._adjacency.items()},
+            "mb": round(sum(
+                array.nbytes for adj in self._adjacency.values()
+                for array in (adj.director, adj.value, adj.games, adj.avg_critic, adj.avg_player, adj.by_value)
+            ) / 1e6, 2),
+            "built_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.built_at)),
+        }
+
+
+def load_graph():
+    """Builds the graph from the whole catalog."""
+    checksums = read_checksums()
+    games, links = read_rows()
+    return CollaborationGraph(games, links, checksums)
+
+
+def _source_version():
+    cache = get_query_cache()
+    return tuple(cache.generation(QueryCache.make_key(_links_sql(get_dimension(key)))) for key in GRAPH_DIMENSIONS)
+
+
+class _GraphHolder:
+    """Keeps the current graph and swaps in refreshed ones built in the background."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self.current = None
+        self._refreshing = False
+        self.version = None
+        self.checked_at = None
+        self.last_error = None
+
+    def get(self):
+        if self.current is None:
+            # Concurrent first callers wait for a single load
+            with self._load_lock:
+                if self.current is None:
+                    version = _source_version()
+                    self.current = load_graph()
+                    self.version, self.checked_at = version, time.time()
+        elif self._due():
+            self.trigger_refresh()
+        return self.current
+
+    def _due(self):
+        return time.time() - self.checked_at >= REFRESH_INTERVAL or _source_version() != self.version
+
+    def trigger_refresh(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name="director-graph-refresh", daemon=True).start()
+
+    def _refresh(self):
+        version = _source_version()
+        try:
+            fresh = self.current.refreshed()
+            self.last_error = None
+        except Exception as err:
+            logger.warning("Director graph refresh failed: %s", err)
+            self.last_error = str(err)
+            fresh = None
+        with self._lock:
+            if fresh is not None:
+                self.current = fresh
+                self.version = version
+            self.checked_at = time.time()
+            self._refreshing = False
+
+
+@st.cache_resource
+def _get_holder():
+    return _GraphHolder()
+
+
+def get_graph():
+    """Returns the shared graph, loading it on first use; None after showing the error when it cannot be loaded."""
+    try:
+        return _get_holder().get()
+    except ConnectionUnavailable as e:
+        st.error(f"Error connecting to database: {e}")
+    except Exception as e:
+        st.error(f"Query failed: {e}")
+    return None
+
+
+def graph_stats():
+    """Size and freshness of the graph for the Diagnostics page (None before the first load)."""
+    holder = _get_holder()
+    if holder.current is None:
+        return None
+    return dict(holder.current.stats(), refreshing=holder._refreshing, last_error=holder.last_error)
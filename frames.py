@@ -0,0 +1,68 @@
+import pandas as pd
+
+# COMPACT RESULT FRAMES
+#
+# Query results default to one Python object per cell for text columns. The
+# analytics pages return long lists of (genre, game) or (platform, ...) rows
+# where the same few hundred names repeat thousands of times, so compact mode
+# stores repeated text as categoricals, other text as Arrow-backed strings
+# (plain pandas strings when pyarrow is not installed) and integers in the
+# smallest type that holds them. Floats stay float64 so scores display as
+# stored.
+
+CATEGORY_RATIO = 0.5   # text columns with at most this share of distinct values become categoricals
+
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = "string[pyarrow]"
+except ImportError:
+    STRING_DTYPE = "string"
+
+
+def frame_bytes(df):
+    """Memory used by the DataFrame's values, strings included."""
+    return int(df.memory_usage(index=False, deep=True).sum())
+
+
+def compact_frame(df):
+    """Returns `df` with categorical / Arrow string text columns and downcast integer columns."""
+    if df.empty:
+        return df
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_integer_dtype(series.dtype):
+            columns[column] = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_bool_dtype(series.dtype) or isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        elif pd.api.types.infer_dtype(series, skipna=True) == "string":
+            if series.nunique(dropna=True) <= CATEGORY_RATIO * len(series):
+                columns[column] = series.astype("category")
+            else:
+                columns[column] = series.astype(STRING_DTYPE)
+    return df.assign(**columns) if columns else df
+
+
+def concat_frames(chunks):
+    """
+    Concatenates result chunks. Columns that are categorical in every chunk
+    stay categorical with the merged categories; columns that only some
+    chunks made categorical become strings.
+    """
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks[0]
+    dtypes = {}
+    for column in chunks[0].columns:
+        is_categorical = [isinstance(chunk[column].dtype, pd.CategoricalDtype) for chunk in chunks]
+        if all(is_categorical):
+            categories = set()
+            for chunk in chunks:
+                categories.update(chunk[column].cat.categories)
+            dtypes[column] = pd.CategoricalDtype(sorted(categories))
+        elif any(is_categorical):
+            dtypes[column] = STRING_DTYPE
+    if dtypes:
+        chunks = [chunk.astype(dtypes) for chunk in chunks]
+    return pd.concat(chunks, ignore_index=True)
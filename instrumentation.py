@@ -0,0 +1,170 @@
+import math
+import threading
+import time
+from collections import deque
+
+import streamlit as st
+
+from query_cache import normalize_sql
+
+# QUERY AND PAGE INSTRUMENTATION
+#
+# run_query / run_transaction report every database call here and app.py
+# reports the render time of every page. Everything is kept in memory per
+# process (shared by all sessions) and shown on the admin-only Diagnostics
+# page, which can also download it as JSON.
+
+DEFAULT_SLOW_QUERY_MS = 500
+SAMPLES_PER_KEY = 1000       # most recent timings kept per query / page for percentiles
+SLOW_LOG_SIZE = 100
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+def params_shape(params):
+    """Describes parameters by type only, e.g. "(str, int)", so values never end up in the logs."""
+    if params is None:
+        return "()"
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in params.items()) + "}"
+    return "(" + ", ".join(type(v).__name__ for v in params) + ")"
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def _histogram(samples_ms):
+    counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+    for value in samples_ms:
+        for i, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    labels = [f"<={bound}ms" for bound in HISTOGRAM_BUCKETS_MS] + [f">{HISTOGRAM_BUCKETS_MS[-1]}ms"]
+    return dict(zip(labels, counts))
+
+
+class _Series:
+    """Counters plus a bounded window of recent timings for one query or page."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.total_ms = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.samples = deque(maxlen=SAMPLES_PER_KEY)
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        executed = self.count - self.cache_hits
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "total_ms": round(self.total_ms, 2),
+            "mean_ms": round(self.total_ms / executed, 2) if executed else None,
+            "p50_ms": percentile(ordered, 50),
+            "p95_ms": percentile(ordered, 95),
+            "p99_ms": percentile(ordered, 99),
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "histogram": _histogram(ordered),
+        }
+
+
+class Metrics:
+    """Process-wide store of query timings, page render timings and the slow-query log."""
+
+    def __init__(self, slow_query_ms=DEFAULT_SLOW_QUERY_MS):
+        self.slow_query_ms = slow_query_ms
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._queries = {}    # normalized sql -> _Series
+        self._pages = {}      # page name -> _Series
+        self._slow = deque(maxlen=SLOW_LOG_SIZE)
+        self._explained = {}  # normalized sql -> EXPLAIN rows, captured once per statement
+
+    def record_query(self, query, params, seconds, rows=0, nbytes=0, error=None, cached=False, explain=None):
+        """
+        Records one run_query / run_transaction call. `explain(query, params)`
+        is called in a background thread the first time a statement is slow.
+        """
+        sql = normalize_sql(query)
+        ms = seconds * 1000
+        with self._lock:
+            series = self._queries.setdefault(sql, _Series())
+            series.count += 1
+            if cached:
+                series.cache_hits += 1
+                return
+            series.total_ms += ms
+            series.samples.append(round(ms, 3))
+            series.rows += rows
+            series.bytes += nbytes
+            if error is not None:
+                series.errors += 1
+            if ms < self.slow_query_ms:
+                return
+            entry = {
+                "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "sql": sql,
+                "params": params_shape(params),
+                "ms": round(ms, 2),
+                "rows": rows,
+                "error": str(error) if error is not None else None,
+            }
+            self._slow.append(entry)
+            needs_explain = explain is not None and sql not in self._explained and sql.lstrip("( ").upper().startswith("SELECT")
+            if needs_explain:
+                self._explained[sql] = None
+
+        if needs_explain:
+            def capture():
+                try:
+                    plan = explain(query, params)
+                except Exception as err:
+                    plan = [{"error": str(err)}]
+                with self._lock:
+                    self._explained[sql] = plan
+            threading.Thread(target=capture, name="explain-capture", daemon=True).start()
+
+    def record_page(self, page, seconds):
+        with self._lock:
+            series = self._pages.setdefault(page, _Series())
+            series.count += 1
+            series.total_ms += seconds * 1000
+            series.samples.append(round(seconds * 1000, 3))
+
+    def snapshot(self):
+        """Returns everything collected so far as plain JSON-serialisable data."""
+        with self._lock:
+            slow = [dict(entry, explain=self._explained.get(entry["sql"])) for entry in self._slow]
+            return {
+                "since": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started_at)),
+                "slow_query_ms": self.slow_query_ms,
+                "queries": {sql: series.summary() for sql, series in self._queries.items()},
+                "pages": {page: series.summary() for page, series in self._pages.items()},
+                "slow_queries": slow,
+            }
+
+    def reset(self):
+        with self._lock:
+            self._queries.clear()
+            self._pages.clear()
+            self._slow.clear()
+            self._explained.clear()
+            self.started_at = time.time()
+
+
+@st.cache_resource
+def get_metrics():
+    """Creates the metrics store once per process; every session shares it."""
+    return Metrics(float(st.secrets["mysql"].get("slow_query_ms", DEFAULT_SLOW_QUERY_MS)))
@@ -0,0 +1,324 @@
+"""
+Versioned schema migrations for the VGDB database.
+
+Run from the project directory (reads .streamlit/secrets.toml):
+
+    python migrations.py            # apply pending migrations
+    python migrations.py --status   # list applied / pending versions
+    python migrations.py --check    # report indexes the app expects but the database lacks
+
+Add --surrogate-keys to any of these to include the opt-in integer game_id
+migrations (see SURROGATE_KEY_MIGRATIONS), and --fulltext for the title
+FULLTEXT index used by search_backend = "fulltext" (FULLTEXT_MIGRATIONS).
+"""
+import argparse
+import logging
+from collections import namedtuple
+
+import mysql.connector
+
+from schema import DIMENSIONS, GAME_REFERENCING_TABLES
+
+logger = logging.getLogger(__name__)
+
+Migration = namedtuple("Migration", ["version", "description", "steps"])
+AddIndex = namedtuple("AddIndex", ["table", "name", "columns", "kind"], defaults=[""])
+AddColumn = namedtuple("AddColumn", ["table", "column", "definition"])
+Sql = namedtuple("Sql", ["statement"])
+
+MIGRATIONS_TABLE = "schema_migrations"
+
+# MIGRATIONS
+#
+# Steps are written to be safe to re-run: MySQL DDL commits implicitly, so a
+# migration that failed half way is simply applied again from the start.
+
+MIGRATIONS = [
+    Migration(1, "Indexes for the app's access paths", [
+        # By Year: range scan on the release date; the ratings ride along and
+        # game_name comes from the primary key, so the lookup is index-only
+        AddIndex("Video_game", "idx_video_game_release", ["initial_release_date", "critics_rating", "players_rating"]),
+        # Game Browser ordering and keyset pagination
+        AddIndex("Video_game", "idx_video_game_moby", ["moby_score DESC", "game_name", "initial_release_date"]),
+        # Top 10 lists ordered by a single rating
+        AddIndex("Video_game", "idx_video_game_critics", ["critics_rating DESC"]),
+        AddIndex("Video_game", "idx_video_game_players", ["players_rating DESC"]),
+        # Director Analytics GROUP BY director_name
+        AddIndex("Video_game", "idx_video_game_director", ["director_name"]),
+        # My Ratings: WHERE email = %s ORDER BY rating_date
+        AddIndex("User_Rating", "idx_user_rating_email_date", ["email", "rating_date"]),
+    ] + [
+        # Filters and aggregates probe the link tables by value, then join back
+        # on the game key; this covers both without touching the base rows
+        AddIndex(dim.table, f"idx_{dim.table.lower()}_value", [dim.column, "game_name", "initial_release_date"])
+        for dim in DIMENSIONS
+    ]),
+    Migration(3, "Rating rollup tables (see rollups.py)", [
+        # Per dimension value sums and counts; the averages are stored generated
+        # columns so "best value of a dimension" is one index lookup
+        Sql("""
+            CREATE TABLE IF NOT EXISTS Rating_rollup (
+                dimension VARCHAR(32) NOT NULL,
+                value VARCHAR(255) NOT NULL,
+                game_count INT NOT NULL,
+                players_sum DOUBLE NOT NULL,
+                players_count INT NOT NULL,
+                critics_sum DOUBLE NOT NULL,
+                critics_count INT NOT NULL,
+                players_avg DOUBLE AS (IF(players_count > 0, players_sum / players_count, NULL)) STORED,
+                critics_avg DOUBLE AS (IF(critics_count > 0, critics_sum / critics_count, NULL)) STORED,
+                refreshed_at DATETIME(6) NOT NULL,
+                PRIMARY KEY (dimension, value),
+                INDEX idx_rating_rollup_players (dimension, players_avg),
+                INDEX idx_rating_rollup_critics (dimension, critics_avg)
+            )
+        """),
+        Sql("""
+            CREATE TABLE IF NOT EXISTS Rating_rollup_genre_developer (
+                genre_name VARCHAR(255) NOT NULL,
+                company_name VARCHAR(255) NOT NULL,
+                game_count INT NOT NULL,
+                critics_sum DOUBLE NOT NULL,
+                critics_count INT NOT NULL,
+                critics_avg DOUBLE AS (IF(critics_count > 0, critics_sum / critics_count, NULL)) STORED,
+                refreshed_at DATETIME(6) NOT NULL,
+                PRIMARY KEY (genre_name, company_name),
+                INDEX idx_rating_rollup_gd_critics (genre_name, critics_avg)
+            )
+        """),
+        # Games whose ratings changed since the last incremental refresh
+        Sql("""
+            CREATE TABLE IF NOT EXISTS Rating_rollup_dirty (
+                game_name VARCHAR(255) NOT NULL,
+                initial_release_date DATE NOT NULL,
+                changed_at DATETIME(6) NOT NULL,
+                PRIMARY KEY (game_name, initial_release_date),
+                INDEX idx_rating_rollup_dirty_changed (changed_at)
+            )
+        """),
+        Sql("""
+            CREATE TABLE IF NOT EXISTS Rating_rollup_status (
+                id TINYINT PRIMARY KEY,
+                full_rebuild_at DATETIME(6) NULL,
+                refreshed_at DATETIME(6) NULL
+            )
+        """),
+        Sql("INSERT IGNORE INTO Rating_rollup_status (id) VALUES (1)"),
+        Sql("DROP TRIGGER IF EXISTS trg_video_game_rollup_dirty"),
+        Sql("""
+            CREATE TRIGGER trg_video_game_rollup_dirty AFTER UPDATE ON Video_game FOR EACH ROW
+            BEGIN
+                IF NOT (OLD.players_rating <=> NEW.players_rating AND OLD.critics_rating <=> NEW.critics_rating) THEN
+                    INSERT INTO Rating_rollup_dirty (game_name, initial_release_date, changed_at)
+                    VALUES (NEW.game_name, NEW.initial_release_date, NOW(6))
+                    ON DUPLICATE KEY UPDATE changed_at = NOW(6);
+                END IF;
+            END
+        """),
+    ]),
+]
+
+
+
+def _surrogate_key_steps():
+    steps = [
+        # AUTO_INCREMENT numbers every existing game as the column is added
+        AddColumn("Video_game", "game_id", "INT UNSIGNED NOT NULL AUTO_INCREMENT UNIQUE"),
+    ]
+    for table in [dim.table for dim in DIMENSIONS] + GAME_REFERENCING_TABLES:
+        trigger = f"trg_{table.lower()}_game_id"
+        steps += [
+            AddColumn(table, "game_id", "INT UNSIGNED NULL"),
+            Sql(f"""
+                UPDATE {table} t
+                JOIN Video_game v ON v.game_name = t.game_name AND v.initial_release_date = t.initial_release_date
+                SET t.game_id = v.game_id
+                WHERE t.game_id IS NULL
+            """),
+            # Inserts keep using the composite key; the trigger fills game_id in
+            Sql(f"DROP TRIGGER IF EXISTS {trigger}"),
+            Sql(f"""
+                CREATE TRIGGER {trigger} BEFORE INSERT ON {table} FOR EACH ROW
+                SET NEW.game_id = (
+                    SELECT game_id FROM Video_game
+                    WHERE game_name = NEW.game_name AND initial_release_date = NEW.initial_release_date
+                )
+            """),
+        ]
+    for dim in DIMENSIONS:
+        steps.append(AddIndex(dim.table, f"idx_{dim.table.lower()}_game_id", ["game_id", dim.column]))
+    steps.append(AddIndex("User_Rating", "idx_user_rating_game_id", ["game_id"]))
+    return steps
+
+
+# Opt-in: a FULLTEXT index on game titles, only used with
+# search_backend = "fulltext". Apply with `python migrations.py --fulltext`.
+FULLTEXT_MIGRATIONS = [
+    Migration(2, "Full-text index on game titles (search_backend = \"fulltext\")", [
+        AddIndex("Video_game", "ft_video_game_name", ["game_name"], kind="FULLTEXT"),
+    ]),
+]
+
+
+# Opt-in: an integer game_id on Video_game and every table that references a
+# game, so joins compare one INT instead of a varchar plus a date. The
+# composite key stays the primary key for display and inserts. Apply with
+# `python migrations.py --surrogate-keys`, then set game_key = "surrogate".
+SURROGATE_KEY_MIGRATIONS = [
+    Migration(101, "Integer game_id surrogate keys", _surrogate_key_steps()),
+]
+
+
+def expected_indexes(migrations=MIGRATIONS):
+    """Returns every (table, index name) the given migrations create."""
+    return [
+        (step.table, step.name)
+        for migration in migrations
+        for step in migration.steps
+        if isinstance(step, AddIndex)
+    ]
+
+
+def existing_indexes(conn):
+    """Returns the set of (table, index name) pairs present in the current database."""
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT DISTINCT TABLE_NAME, INDEX_NAME FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE()"
+    )
+    found = {(table.lower(), name.lower()) for table, name in cursor.fetchall()}
+    cursor.close()
+    return found
+
+
+def missing_indexes(conn, migrations=MIGRATIONS):
+    """Returns the expected (table, index name) pairs that the database does not have."""
+    found = existing_indexes(conn)
+    return [
+        (table, name)
+        for table, name in expected_indexes(migrations)
+        if (table.lower(), name.lower()) not in found
+    ]
+
+
+def applied_versions(conn):
+    """
+    Returns the set of migration versions already recorded in the database.
+    Read-only: an empty set when no migration has ever been applied.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            (MIGRATIONS_TABLE,),
+        )
+        if not cursor.fetchone()[0]:
+            return set()
+        cursor.execute(f"SELECT version FROM {MIGRATIONS_TABLE}")
+        return {row[0] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+
+def _create_migrations_table(conn):
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+            version INT PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.close()
+
+
+def _has_column(cursor, table, column):
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.COLUMNS"
+        " WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+        (table, column),
+    )
+    return cursor.fetchone()[0] > 0
+
+
+def _apply_step(cursor, step, found):
+    if isinstance(step, AddColumn):
+        if not _has_column(cursor, step.table, step.column):
+            cursor.execute(f"ALTER TABLE {step.table} ADD COLUMN {step.column} {step.definition}")
+    elif isinstance(step, AddIndex):
+        if (step.table.lower(), step.name.lower()) in found:
+            return
+        columns = ", ".join(step.columns)
+        kind = f"{step.kind} " if step.kind else ""
+        cursor.execute(f"CREATE {kind}INDEX {step.name} ON {step.table} ({columns})")
+    else:
+        cursor.execute(step.statement)
+
+
+def apply_migrations(conn, migrations=MIGRATIONS):
+    """Applies every pending migration in version order and returns the versions applied."""
+    _create_migrations_table(conn)
+    done = applied_versions(conn)
+    applied = []
+    for migration in sorted(migrations, key=lambda m: m.version):
+        if migration.version in done:
+            continue
+        logger.info("Applying migration %s: %s", migration.version, migration.description)
+        found = existing_indexes(conn)
+        cursor = conn.cursor()
+        for step in migration.steps:
+            _apply_step(cursor, step, found)
+        cursor.execute(
+            f"INSERT INTO {MIGRATIONS_TABLE} (version, description) VALUES (%s, %s)",
+            (migration.version, migration.description),
+        )
+        conn.commit()
+        cursor.close()
+        applied.append(migration.version)
+    return applied
+
+
+def warn_missing_indexes(conn, migrations=MIGRATIONS):
+    """Logs a warning for every expected index the database lacks; returns the missing list."""
+    missing = missing_indexes(conn, migrations)
+    for table, name in missing:
+        logger.warning("Missing index %s on %s; run `python migrations.py` to create it", name, table)
+    return missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply or inspect VGDB schema migrations.")
+    parser.add_argument("--status", action="store_true", help="list applied and pending migrations")
+    parser.add_argument("--check", action="store_true", help="list expected indexes that are missing")
+    parser.add_argument("--surrogate-keys", action="store_true", help="include the opt-in integer game_id migrations")
+    parser.add_argument("--fulltext", action="store_true", help="include the opt-in FULLTEXT index on game titles")
+    args = parser.parse_args()
+    migrations = (
+        MIGRATIONS
+        + (FULLTEXT_MIGRATIONS if args.fulltext else [])
+        + (SURROGATE_KEY_MIGRATIONS if args.surrogate_keys else [])
+    )
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    from db import load_db_config
+    conn = mysql.connector.connect(**load_db_config())
+    try:
+        if args.status:
+            done = applied_versions(conn)
+            for migration in migrations:
+                state = "applied" if migration.version in done else "pending"
+                print(f"{migration.version:>4}  {state:<8} {migration.description}")
+        elif args.check:
+            missing = missing_indexes(conn, migrations)
+            for table, name in missing:
+                print(f"missing  {table}.{name}")
+            if not missing:
+                print("All expected indexes are present.")
+        else:
+            applied = apply_migrations(conn, migrations)
+            print(f"Applied {len(applied)} migration(s)." if applied else "Database is up to date.")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
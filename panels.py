@@ -0,0 +1,54 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+from db import get_query_cache
+from query_cache import DEFAULT_TTL
+
+# ON-DEMAND PAGE PANELS
+#
+# st.tabs runs the body of every tab on each rerun, so a page with five tabs
+# pays for five panels whenever any widget changes. Multi-panel pages pick
+# one panel with panel_selector() and only that panel's code runs. Each
+# panel's result is also kept in the session together with the inputs it was
+# computed from, so a rerun that changes nothing the panel depends on
+# (switching back to it, a widget on another panel) runs no query at all.
+
+
+def panel_selector(label, panels, key):
+    """Shows the panel names as a horizontal switch and returns the selected one."""
+    return st.radio(label, panels, horizontal=True, key=key, label_visibility="collapsed")
+
+
+def _is_empty(result):
+    if isinstance(result, pd.DataFrame):
+        return result.empty
+    if isinstance(result, tuple):
+        return all(_is_empty(part) for part in result)
+    if isinstance(result, dict):
+        return all(_is_empty(part) for part in result.values())
+    return result is None
+
+
+def memoized_panel(panel, inputs, compute, ttl=DEFAULT_TTL):
+    """
+    Returns compute() for `panel`, reusing the previous result while `inputs`
+    are unchanged, no table was written through run_transaction and `ttl`
+    seconds have not passed. Empty results (including failed queries) are not
+    kept, so the next rerun tries again.
+    """
+    memo = st.session_state.setdefault("panel_results", {})
+    version = get_query_cache().data_version()
+    entry = memo.get(panel)
+    if entry is not None:
+        cached_inputs, cached_version, expires_at, result = entry
+        if cached_inputs == inputs and cached_version == version and expires_at > time.monotonic():
+            return result
+
+    result = compute()
+    if _is_empty(result):
+        memo.pop(panel, None)
+    else:
+        memo[panel] = (inputs, version, time.monotonic() + ttl, result)
+    return result
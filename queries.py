@@ -0,0 +1,94 @@
+from schema import game_join
+
+# PAGE QUERIES
+#
+# The SQL each page sends, kept in one place so the benchmark harness
+# (benchmarks/harness.py) replays exactly what the app runs. Statements that
+# join link tables are functions because the join depends on the game key
+# mode (see schema.set_game_key).
+
+USER_INSERT = """
+    INSERT INTO User (username, email, gender, age, birthdate, country)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+RATING_INSERT = """
+    INSERT INTO User_Rating (email, game_name, initial_release_date, rating_score, rating_date)
+    VALUES (%s, %s, %s, %s, CURDATE())
+"""
+
+# Bulk import (bulk_import.py): each row keeps its own rating date
+RATING_IMPORT = """
+    INSERT INTO User_Rating (email, game_name, initial_release_date, rating_score, rating_date)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+# Write-behind flushes (write_behind.py): the submission date is kept, and a
+# row that is already stored (a retried batch) is left as it is
+RATING_INSERT_DATED = """
+    INSERT INTO User_Rating (email, game_name, initial_release_date, rating_score, rating_date)
+    VALUES (%s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE rating_score = rating_score
+"""
+
+RATING_EXISTS = """
+    SELECT 1 FROM User_Rating WHERE email = %s AND game_name = %s AND initial_release_date = %s
+"""
+
+USER_BY_EMAIL = "SELECT * FROM User WHERE email = %s"
+
+MY_RATINGS = """
+    SELECT game_name, initial_release_date, rating_score, rating_date
+    FROM User_Rating WHERE email = %s ORDER BY rating_date DESC
+"""
+
+GENRE_LIST = "SELECT DISTINCT genre_name FROM Genre ORDER BY genre_name"
+PLATFORM_LIST = "SELECT DISTINCT platform_name FROM Platform ORDER BY platform_name"
+COMPANY_LIST = "SELECT DISTINCT name FROM Company ORDER BY name"
+DIRECTOR_LIST = "SELECT DISTINCT director_name FROM Video_game WHERE director_name IS NOT NULL ORDER BY director_name"
+YEAR_LIST = """
+    SELECT DISTINCT YEAR(initial_release_date) as yr FROM Video_game
+    WHERE initial_release_date != '9999-12-31' ORDER BY yr DESC
+"""
+
+def top_by_genre_source_sql():
+    """Scored (genre, game) pairs ranked by the Top 5 MobyScore (Genre) tab."""
+    return f"""
+        SELECT g.genre_name, v.game_name, v.moby_score
+        FROM Video_game v
+                 JOIN Video_game_genre g ON {game_join('v', 'g')}
+        WHERE v.moby_score IS NOT NULL
+    """
+
+
+def top_by_setting_source_sql():
+    """Scored (setting, game) pairs ranked by the Top 5 MobyScore (Setting) tab."""
+    return f"""
+        SELECT s.setting_name, v.game_name, v.moby_score
+        FROM Video_game v
+                 JOIN Video_game_setting s ON {game_join('v', 's')}
+        WHERE v.moby_score IS NOT NULL
+    """
+
+
+def devs_by_genre_source_sql():
+    """Average critic rating of every developer within every genre (Top 5 Devs (Genre) tab)."""
+    return f"""
+        SELECT g.genre_name, d.company_name, AVG(v.critics_rating) as avg_critic_rating
+        FROM Video_game v
+                 JOIN Video_game_developer d ON {game_join('v', 'd')}
+                 JOIN Video_game_genre g ON {game_join('v', 'g')}
+        WHERE v.critics_rating IS NOT NULL
+        GROUP BY g.genre_name, d.company_name
+    """
+
+
+def platform_stats_sql():
+    """Game count and average ratings per platform."""
+    return f"""
+        SELECT p.platform_name, COUNT(*) as game_count, AVG(v.critics_rating) as avg_critic, AVG(v.players_rating) as avg_player
+        FROM Video_game v
+                 JOIN Video_game_platform p ON {game_join('v', 'p')}
+        GROUP BY p.platform_name
+        ORDER BY game_count DESC
+    """
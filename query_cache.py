@@ -0,0 +1,160 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# QUERY RESULT CACHE
+#
+# Results of run_query are kept per process and shared by every session.
+# Each entry remembers which tables its query read, so a write through
+# run_transaction only drops the entries that could now be out of date.
+
+DEFAULT_TTL = 300             # seconds
+STATIC_TTL = 3600             # lookup lists (Genre, Platform, Company...) rarely change
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_READ_TABLES = re.compile(r"\b(?:FROM|JOIN)\s+`?(\w+)`?", re.IGNORECASE)
+_WRITE_TABLES = re.compile(
+    r"^\s*(?:INSERT(?:\s+IGNORE)?\s+INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM|TRUNCATE(?:\s+TABLE)?)\s+`?(\w+)`?",
+    re.IGNORECASE,
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(query):
+    """Collapses whitespace so the same statement always produces the same cache key."""
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def tables_read(query):
+    """Returns the lower-cased names of the tables a SELECT reads from."""
+    return frozenset(name.lower() for name in _READ_TABLES.findall(query))
+
+
+def tables_written(query):
+    """Returns the lower-cased name of the table an INSERT/UPDATE/DELETE writes to."""
+    return frozenset(name.lower() for name in _WRITE_TABLES.findall(query))
+
+
+def _frame_size(df):
+    try:
+        return int(df.memory_usage(index=True, deep=True).sum())
+    except Exception:
+        return 0
+
+
+class QueryCache:
+    """A thread-safe LRU cache of DataFrames with per-entry TTLs and a memory bound."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # key -> (df, expires_at, tables, size)
+        self._by_table = {}             # table -> set of keys that read it
+        self._generations = {}          # table -> number of times it was invalidated
+        self._written_at = {}           # table -> monotonic time of the last invalidation
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    @staticmethod
+    def make_key(query, params=None):
+        return normalize_sql(query), tuple(params) if params is not None else None
+
+    def get(self, key):
+        """Returns the cached DataFrame for `key`, or None when missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if entry[1] < time.monotonic():
+                self._drop(key)
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def generation(self, key):
+        """Returns a token to pass to put(), taken before the query runs."""
+        tables = tables_read(key[0])
+        with self._lock:
+            return tuple(self._generations.get(table, 0) for table in sorted(tables))
+
+    def data_version(self):
+        """Returns a token that changes whenever any table is written through run_transaction."""
+        with self._lock:
+            return tuple(sorted(self._generations.items()))
+
+    def put(self, key, df, ttl=DEFAULT_TTL, generation=None):
+        """
+        Stores a result for `ttl` seconds, evicting least recently used entries
+        to stay under the memory bound.
+
+        When `generation` is given and one of the tables was written to since
+        it was taken, the result may already be stale and is not stored.
+        """
+        size = _frame_size(df)
+        if size > self.max_bytes:
+            return
+        tables = tables_read(key[0])
+        with self._lock:
+            if generation is not None:
+                current = tuple(self._generations.get(table, 0) for table in sorted(tables))
+                if current != generation:
+                    return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (df, time.monotonic() + ttl, tables, size)
+            self._bytes += size
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._stats["evictions"] += 1
+
+    def invalidate_tables(self, tables):
+        """Drops every entry whose query read one of `tables`."""
+        with self._lock:
+            stale = set()
+            for table in tables:
+                table = table.lower()
+                self._generations[table] = self._generations.get(table, 0) + 1
+                self._written_at[table] = time.monotonic()
+                stale |= self._by_table.get(table, set())
+            for key in stale:
+                self._drop(key)
+            self._stats["invalidations"] += len(stale)
+            return len(stale)
+
+    def written_within(self, tables, seconds):
+        """True when one of `tables` was written through run_transaction in the last `seconds`."""
+        since = time.monotonic() - seconds
+        with self._lock:
+            return any(self._written_at.get(table, float("-inf")) >= since for table in tables)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self._bytes = 0
+
+    def _drop(self, key):
+        # Caller holds the lock
+        _, _, tables, size = self._entries.pop(key)
+        self._bytes -= size
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    def stats(self):
+        """Returns a snapshot of the cache counters."""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["entries"] = len(self._entries)
+            snapshot["bytes"] = self._bytes
+        return snapshot
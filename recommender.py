@@ -0,0 +1,344 @@
+import importlib.util
+import logging
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from db import iter_query
+
+logger = logging.getLogger(__name__)
+
+# "RECOMMENDED FOR YOU"
+#
+# Item-item collaborative filtering over User_Rating. Ratings form a sparse
+# user x game matrix (SciPy CSR); every game keeps its TOP_K most similar
+# games by cosine similarity of their rating columns. A user's
+# recommendations are the games most similar to what they rated, weighted
+# by their ratings, which only touches TOP_K neighbours per rated game.
+#
+# A new rating only changes the rating column of its own game, so only that
+# game's similarities change: add_rating() recomputes its neighbour list
+# exactly and patches its weight into the lists of the games it is now
+# similar to. New ratings sit in a small side table until the next full
+# rebuild, which runs in the background every REBUILD_INTERVAL seconds or
+# after REBUILD_AFTER new ratings. Needs scipy; the page hides the section
+# without it.
+
+TOP_K = 50
+BLOCK_ITEMS = 512            # games per block when computing all similarities
+REBUILD_AFTER = 50_000       # new ratings before a full rebuild
+REBUILD_INTERVAL = 24 * 3600
+RECOMMENDATIONS = 10
+
+RATINGS_SOURCE = "SELECT email, game_name, initial_release_date, rating_score FROM User_Rating"
+
+
+def _game_key(game_name, release_date):
+    return game_name, str(release_date)
+
+
+def _top_k(candidates, weights, k):
+    """The `k` (candidate, weight) pairs with the highest weight, best first."""
+    if len(candidates) > k:
+        keep = np.argpartition(-weights, k - 1)[:k]
+        candidates, weights = candidates[keep], weights[keep]
+    order = np.argsort(-weights, kind="stable")
+    return candidates[order], weights[order]
+
+
+class ItemItemRecommender:
+    """Sparse rating matrix, per-game neighbour lists and the ratings added since they were built."""
+
+    def __init__(self, emails, game_keys, users, items, scores, k=TOP_K):
+        from scipy import sparse
+
+        self.k = k
+        self._lock = threading.RLock()
+        self.built_at = time.time()
+        self.users = {email: u for u, email in enumerate(emails)}
+        self.game_keys = list(game_keys)
+        self.items = {key: i for i, key in enumerate(self.game_keys)}
+        self.base = sparse.csr_matrix(
+            (np.asarray(scores, dtype=np.float32), (np.asarray(users), np.asarray(items))),
+            shape=(len(self.users), len(self.game_keys)),
+        )
+        self.base.sum_duplicates()
+        self.base_csc = self.base.tocsc()
+        self.norms = np.sqrt(np.asarray(self.base.multiply(self.base).sum(axis=0)).ravel()).astype(np.float64)
+        # Ratings added since the build, by user and by game
+        self.pending_by_user = {}
+        self.pending_by_item = {}
+        self.pending = 0
+        self.neighbors = np.full((len(self.game_keys), k), -1, dtype=np.int32)
+        self.weights = np.zeros((len(self.game_keys), k), dtype=np.float32)
+        self._compute_all_neighbors()
+
+    @classmethod
+    def from_frame(cls, df, k=TOP_K):
+        """Builds from rows of (email, game_name, initial_release_date, rating_score)."""
+        user_codes, emails = pd.factorize(df["email"])
+        game_keys = list(zip(df["game_name"], df["initial_release_date"].astype(str)))
+        item_codes, keys = pd.factorize(pd.Series(game_keys, dtype=object))
+        return cls(emails, keys, user_codes, item_codes, df["rating_score"].to_numpy(dtype=np.float32), k)
+
+    def _compute_all_neighbors(self):
+        n_items = len(self.game_keys)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inverse_norms = np.where(self.norms > 0, 1.0 / self.norms, 0.0)
+        items_by_users = self.base_csc.T.tocsr()
+        for start in range(0, n_items, BLOCK_ITEMS):
+            stop = min(start + BLOCK_ITEMS, n_items)
+            # Dot products of this block of games with every game, only where they share raters
+            dots = (items_by_users[start:stop] @ self.base).tocsr()
+            for row in range(stop - start):
+                i = start + row
+                cols = dots.indices[dots.indptr[row]:dots.indptr[row + 1]]
+                values = dots.data[dots.indptr[row]:dots.indptr[row + 1]]
+                similar = cols != i
+                cols = cols[similar]
+                sims = values[similar] * inverse_norms[i] * inverse_norms[cols]
+                self._set_neighbors(i, cols, sims)
+
+    def _set_neighbors(self, i, cols, sims):
+        cols, sims = _top_k(np.asarray(cols, dtype=np.int32), np.asarray(sims, dtype=np.float32), self.k)
+        self.neighbors[i] = -1
+        self.weights[i] = 0
+        self.neighbors[i, :len(cols)] = cols
+        self.weights[i, :len(sims)] = sims
+
+    def _grow(self, n_items):
+        extra = n_items - len(self.neighbors)
+        if extra > 0:
+            self.neighbors = np.vstack([self.neighbors, np.full((extra, self.k), -1, dtype=np.int32)])
+            self.weights = np.vstack([self.weights, np.zeros((extra, self.k), dtype=np.float32)])
+            self.norms = np.concatenate([self.norms, np.zeros(extra)])
+
+    def _user_ratings(self, u):
+        """(items, ratings) of one user, built and pending."""
+        items, ratings = [], []
+        if u < self.base.shape[0]:
+            start, stop = self.base.indptr[u], self.base.indptr[u + 1]
+            items.append(self.base.indices[start:stop])
+            ratings.append(self.base.data[start:stop])
+        pending = self.pending_by_user.get(u)
+        if pending:
+            items.append(np.fromiter(pending.keys(), dtype=np.int32, count=len(pending)))
+            ratings.append(np.fromiter(pending.values(), dtype=np.float32, count=len(pending)))
+        if not items:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        return np.concatenate(items), np.concatenate(ratings)
+
+    def _item_dots(self, i):
+        """Dot products of game i's rating column with every game's, as {game: dot}."""
+        from scipy import sparse
+
+        n_users = self.base.shape[0]
+        dots = {}
+        raters = {}
+        if i < self.base_csc.shape[1]:
+            start, stop = self.base_csc.indptr[i], self.base_csc.indptr[i + 1]
+            base_raters, base_ratings = self.base_csc.indices[start:stop], self.base_csc.data[start:stop]
+            # Built ratings x built ratings in one sparse product
+            column = sparse.csr_matrix((base_ratings, (np.zeros(len(base_raters)), base_raters)), shape=(1, n_users))
+            product = (column @ self.base).tocsr()
+            dots = dict(zip(product.indices.tolist(), product.data.astype(np.float64).tolist()))
+            raters = dict(zip(base_raters.tolist(), base_ratings.tolist()))
+
+        def add(j, value):
+            dots[j] = dots.get(j, 0.0) + value
+
+        for u, r in self.pending_by_item.get(i, {}).items():
+            if u < n_users:
+                start, stop = self.base.indptr[u], self.base.indptr[u + 1]
+                for j, s in zip(self.base.indices[start:stop].tolist(), self.base.data[start:stop].tolist()):
+                    add(j, r * s)
+            raters[u] = r
+        # Pending ratings of everyone who rated game i
+        for u, r in raters.items():
+            for j, s in self.pending_by_user.get(u, {}).items():
+                add(j, r * s)
+        dots.pop(i, None)
+        return dots
+
+    def add_rating(self, email, game_name, release_date, score):
+        """Folds one new rating in: game i's neighbour list is recomputed, other lists are patched."""
+        key = _game_key(game_name, release_date)
+        score = float(score)
+        with self._lock:
+            u = self.users.setdefault(email, len(self.users))
+            i = self.items.get(key)
+            if i is None:
+                i = self.items[key] = len(self.game_keys)
+                self.game_keys.append(key)
+                self._grow(len(self.game_keys))
+            if u < self.base.shape[0] and i < self.base.shape[1] and self.base[u, i] != 0:
+                return   # already counted (e.g. replayed after a rebuild)
+            if i in self.pending_by_user.get(u, {}):
+                return
+            self.pending_by_user.setdefault(u, {})[i] = score
+            self.pending_by_item.setdefault(i, {})[u] = score
+            self.pending += 1
+            self.norms[i] = np.sqrt(self.norms[i] ** 2 + score * score)
+
+            dots = self._item_dots(i)
+            if not dots:
+                return
+            cols = np.fromiter(dots.keys(), dtype=np.int32, count=len(dots))
+            sims = np.fromiter(dots.values(), dtype=np.float64, count=len(dots)) / (self.norms[i] * self.norms[cols])
+            self._set_neighbors(i, cols, sims)
+            for j, sim in zip(cols.tolist(), sims.tolist()):
+                self._offer_neighbor(j, i, sim)
+
+    def _offer_neighbor(self, j, i, sim):
+        row, weights = self.neighbors[j], self.weights[j]
+        present = np.flatnonzero(row == i)
+        if len(present):
+            weights[present[0]] = sim
+        else:
+            weakest = int(np.argmin(np.where(row >= 0, weights, -np.inf)))
+            if row[weakest] >= 0 and weights[weakest] >= sim:
+                return
+            row[weakest], weights[weakest] = i, sim
+        order = np.argsort(-np.where(row >= 0, weights, -np.inf), kind="stable")
+        self.neighbors[j], self.weights[j] = row[order], weights[order]
+
+    def recommend(self, email, n=RECOMMENDATIONS):
+        """
+        Returns up to `n` unrated games for `email` as a DataFrame of
+        game_name, initial_release_date and predicted_rating, best first.
+        """
+        with self._lock:
+            u = self.users.get(email)
+            if u is None:
+                return pd.DataFrame(columns=["game_name", "initial_release_date", "predicted_rating"])
+            rated, ratings = self._user_ratings(u)
+            neighbors = self.neighbors[rated].ravel()
+            weights = self.weights[rated].ravel()
+            given = np.repeat(ratings, self.k)
+        valid = (neighbors >= 0) & (weights > 0) & ~np.isin(neighbors, rated)
+        neighbors, weights, given = neighbors[valid], weights[valid], given[valid]
+        if len(neighbors) == 0:
+            return pd.DataFrame(columns=["game_name", "initial_release_date", "predicted_rating"])
+
+        candidates, inverse = np.unique(neighbors, return_inverse=True)
+        support = np.bincount(inverse, weights=weights)
+        weighted = np.bincount(inverse, weights=weights * given)
+        # Rank by evidence (sum of similarity x rating); show the similarity-weighted average rating
+        best, _ = _top_k(np.arange(len(candidates)), weighted, n)
+        return pd.DataFrame({
+            "game_name": [self.game_keys[j][0] for j in candidates[best]],
+            "initial_release_date": [self.game_keys[j][1] for j in candidates[best]],
+            "predicted_rating": np.round(weighted[best] / support[best], 1),
+        })
+
+    def stats(self):
+        with self._lock:
+            return {
+                "users": len(self.users),
+                "games": len(self.game_keys),
+                "ratings": int(self.base.nnz) + self.pending,
+                "pending_ratings": self.pending,
+                "built_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.built_at)),
+            }
+
+
+def load_recommender():
+    """
+    Builds a recommender from User_Rating, streaming the table in chunks.
+    Raises when the table cannot be read in full.
+    """
+    chunks = [
+        chunk[["email", "game_name", "initial_release_date", "rating_score"]]
+        for chunk in iter_query(RATINGS_SOURCE, chunksize=200_000)
+    ]
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=["email", "game_name", "initial_release_date", "rating_score"])
+    return ItemItemRecommender.from_frame(df)
+
+
+class _RecommenderHolder:
+    """Keeps the current recommender and swaps in a rebuilt one without losing ratings added meanwhile."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.current = None
+        self._rebuilding = False
+        self._replay = []
+
+    def get(self):
+        """The current recommender, or None until the first build (started in the background) is done."""
+        current = self.current
+        if current is None or self._due(current):
+            self.trigger_rebuild()
+        return current
+
+    @staticmethod
+    def _due(current):
+        return current.pending >= REBUILD_AFTER or time.time() - current.built_at >= REBUILD_INTERVAL
+
+    def trigger_rebuild(self):
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._rebuild, name="recommender-rebuild", daemon=True).start()
+
+    def _rebuild(self):
+        # On failure the previous recommender (or none) stays in place and the next get() retries
+        try:
+            fresh = load_recommender()
+        except Exception as err:
+            logger.warning("Recommender rebuild failed: %s", err)
+            fresh = None
+        with self._lock:
+            if fresh is not None:
+                # Ratings recorded while the table was being read may be missing from it
+                for rating in self._replay:
+                    fresh.add_rating(*rating)
+                self.current = fresh
+            self._replay = []
+            self._rebuilding = False
+
+    def add_rating(self, email, game_name, release_date, score):
+        with self._lock:
+            if self._rebuilding:
+                self._replay.append((email, game_name, release_date, score))
+            current = self.current
+        if current is not None:
+            current.add_rating(email, game_name, release_date, score)
+
+
+@st.cache_resource
+def _get_holder():
+    return _RecommenderHolder()
+
+
+def recommendations_enabled():
+    """True unless `recommendations = false` is set in the secrets; needs scipy."""
+    if not st.secrets["mysql"].get("recommendations", True):
+        return False
+    return importlib.util.find_spec("scipy") is not None
+
+
+def recommend_games(email, n=RECOMMENDATIONS):
+    """
+    Recommendations for the My Ratings page (empty when the user has no
+    usable ratings), or None while the recommender is still being built.
+    """
+    recommender = _get_holder().get()
+    if recommender is None:
+        return None
+    return recommender.recommend(email, n)
+
+
+def record_rating(email, game_name, release_date, score):
+    """Feeds a rating submitted on Rate Games into the recommender."""
+    if recommendations_enabled():
+        _get_holder().add_rating(email, game_name, release_date, score)
+
+
+def recommender_stats():
+    current = _get_holder().current
+    return current.stats() if current is not None else None
@@ -0,0 +1,273 @@
+"""
+Incrementally maintained rating rollups.
+
+Keeps SUM/COUNT of players_rating and critics_rating per dimension value
+(genre, platform, developer, ...) and per (genre, developer) pair, so the
+aggregate pages read a few indexed rows instead of averaging the whole
+Video_game x link-table join on every view. Tables come from migration 3.
+
+A trigger queues every game whose ratings change in Rating_rollup_dirty;
+an incremental refresh recomputes only the dimension values those games
+belong to. Adding or removing games or link rows needs a full rebuild:
+
+    python rollups.py          # incremental refresh
+    python rollups.py --full   # rebuild everything
+"""
+import argparse
+import threading
+import time
+
+import mysql.connector
+import pandas as pd
+import streamlit as st
+
+from db import get_pool, invalidate_tables, run_query
+from migrations import applied_versions
+from schema import DIMENSIONS, game_join, get_dimension
+
+ROLLUP_MIGRATION = 3
+ROLLUP_TABLES = ["Rating_rollup", "Rating_rollup_genre_developer", "Rating_rollup_status"]
+AUTO_REFRESH_INTERVAL = 60   # seconds between background incremental refreshes
+
+
+def _dimension_select(dim):
+    return f"""
+        SELECT '{dim.key}', CAST(l.{dim.column} AS CHAR), COUNT(*),
+               COALESCE(SUM(v.players_rating), 0), COUNT(v.players_rating),
+               COALESCE(SUM(v.critics_rating), 0), COUNT(v.critics_rating),
+               NOW(6)
+        FROM Video_game v JOIN {dim.table} l ON {game_join("v", "l")}
+    """
+
+
+_ROLLUP_COLUMNS = "(dimension, value, game_count, players_sum, players_count, critics_sum, critics_count, refreshed_at)"
+_PAIR_COLUMNS = "(genre_name, company_name, game_count, critics_sum, critics_count, refreshed_at)"
+
+
+def _pair_select():
+    return f"""
+        SELECT g.genre_name, d.company_name, COUNT(*),
+               COALESCE(SUM(v.critics_rating), 0), COUNT(v.critics_rating), NOW(6)
+        FROM Video_game v
+                 JOIN Video_game_developer d ON {game_join("v", "d")}
+                 JOIN Video_game_genre g ON {game_join("v", "g")}
+    """
+
+
+def _dirty_join(alias):
+    return (
+        f"Rating_rollup_dirty dirty ON dirty.game_name = {alias}.game_name"
+        f" AND dirty.initial_release_date = {alias}.initial_release_date"
+    )
+
+
+# REFRESHING
+
+def rebuild(conn):
+    """Recomputes every rollup from scratch in one transaction."""
+    cursor = conn.cursor()
+    try:
+        conn.start_transaction()
+        cursor.execute("SELECT NOW(6)")
+        started = cursor.fetchone()[0]
+        cursor.execute("DELETE FROM Rating_rollup")
+        for dim in DIMENSIONS:
+            cursor.execute(f"INSERT INTO Rating_rollup {_ROLLUP_COLUMNS} {_dimension_select(dim)} GROUP BY l.{dim.column}")
+        cursor.execute("DELETE FROM Rating_rollup_genre_developer")
+        cursor.execute(
+            f"INSERT INTO Rating_rollup_genre_developer {_PAIR_COLUMNS} {_pair_select()}"
+            f" GROUP BY g.genre_name, d.company_name"
+        )
+        cursor.execute("DELETE FROM Rating_rollup_dirty WHERE changed_at <= %s", (started,))
+        cursor.execute("UPDATE Rating_rollup_status SET full_rebuild_at = %s, refreshed_at = %s WHERE id = 1", (started, started))
+        conn.commit()
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def refresh(conn):
+    """
+    Recomputes only the dimension values and (genre, developer) pairs that
+    contain a game queued in Rating_rollup_dirty. Returns how many games
+    were processed.
+    """
+    cursor = conn.cursor()
+    try:
+        conn.start_transaction()
+        cursor.execute("SELECT NOW(6), COUNT(*) FROM Rating_rollup_dirty")
+        started, pending = cursor.fetchone()
+        if pending:
+            for dim in DIMENSIONS:
+                # Only the values that one of the changed games belongs to
+                cursor.execute(f"""
+                    REPLACE INTO Rating_rollup {_ROLLUP_COLUMNS}
+                    {_dimension_select(dim)}
+                    WHERE l.{dim.column} IN (
+                        SELECT a.{dim.column} FROM {dim.table} a JOIN {_dirty_join("a")}
+                        WHERE dirty.changed_at <= %s
+                    )
+                    GROUP BY l.{dim.column}
+                """, (started,))
+            cursor.execute(f"""
+                REPLACE INTO Rating_rollup_genre_developer {_PAIR_COLUMNS}
+                {_pair_select()}
+                WHERE (g.genre_name, d.company_name) IN (
+                    SELECT ag.genre_name, ad.company_name
+                    FROM Video_game_genre ag
+                             JOIN Video_game_developer ad
+                                  ON ad.game_name = ag.game_name AND ad.initial_release_date = ag.initial_release_date
+                             JOIN {_dirty_join("ag")}
+                    WHERE dirty.changed_at <= %s
+                )
+                GROUP BY g.genre_name, d.company_name
+            """, (started,))
+            # Games changed again while we were working keep a newer changed_at and stay queued
+            cursor.execute("DELETE FROM Rating_rollup_dirty WHERE changed_at <= %s", (started,))
+        cursor.execute("UPDATE Rating_rollup_status SET refreshed_at = %s WHERE id = 1", (started,))
+        conn.commit()
+        return pending
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+# READING
+
+@st.cache_resource
+def _rollups_installed():
+    # Raises on connection errors so that a failed check is not cached
+    with get_pool().connection() as conn:
+        return ROLLUP_MIGRATION in applied_versions(conn)
+
+
+def rollups_enabled():
+    """True when `use_rollups = true` is set in the secrets and migration 3 has been applied."""
+    if not st.secrets["mysql"].get("use_rollups", False):
+        return False
+    try:
+        return _rollups_installed()
+    except mysql.connector.Error:
+        return False   # this call only; the next one retries
+
+
+def rollup_status():
+    """Returns {"refreshed_at", "full_rebuild_at", "pending"} describing how current the rollups are."""
+    df = run_query("""
+        SELECT s.refreshed_at, s.full_rebuild_at, (SELECT COUNT(*) FROM Rating_rollup_dirty) AS pending
+        FROM Rating_rollup_status s WHERE s.id = 1
+    """, ttl=30)
+    if df.empty:
+        return {"refreshed_at": None, "full_rebuild_at": None, "pending": 0}
+    row = df.iloc[0]
+    return {"refreshed_at": row["refreshed_at"], "full_rebuild_at": row["full_rebuild_at"], "pending": int(row["pending"])}
+
+
+class _BackgroundRefresher:
+    """Runs at most one incremental refresh at a time per process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._running = False
+        self._last_started = 0.0
+
+    def trigger(self):
+        with self._lock:
+            if self._running or time.monotonic() - self._last_started < AUTO_REFRESH_INTERVAL:
+                return
+            self._running = True
+            self._last_started = time.monotonic()
+        threading.Thread(target=self._run, name="rollup-refresh", daemon=True).start()
+
+    def _run(self):
+        try:
+            with get_pool().connection() as conn:
+                refresh(conn)
+            invalidate_tables(ROLLUP_TABLES + ["Rating_rollup_dirty"])
+        except mysql.connector.Error:
+            pass
+        finally:
+            with self._lock:
+                self._running = False
+
+
+@st.cache_resource
+def _get_refresher():
+    return _BackgroundRefresher()
+
+
+def show_rollup_freshness():
+    """Writes a caption saying how current the rollups are, and queues a background refresh if games changed."""
+    status = rollup_status()
+    if status["pending"]:
+        _get_refresher().trigger()
+    if status["refreshed_at"] is None:
+        st.caption("⚠️ Rollups have never been built — run `python rollups.py --full`.")
+        return
+    note = f"Aggregates as of {pd.Timestamp(status['refreshed_at']):%Y-%m-%d %H:%M:%S}"
+    if status["pending"]:
+        note += f" · {status['pending']} updated game(s) pending refresh"
+    st.caption(note)
+
+
+def best_by_dimension_from_rollups(dimension_keys, metric="players_rating"):
+    """Same result as analytics.best_by_dimension, read from the rollup table."""
+    avg = {"players_rating": "players_avg", "critics_rating": "critics_avg"}.get(metric)
+    if avg is None:
+        raise ValueError(f"No rollup for {metric!r}")
+    branches = []
+    params = []
+    for key in dimension_keys:
+        dim = get_dimension(key)
+        branches.append(f"""
+            (SELECT dimension, value, {avg} AS score FROM Rating_rollup
+             WHERE dimension = %s AND {avg} IS NOT NULL
+             ORDER BY {avg} DESC LIMIT 1)""")
+        params.append(dim.key)
+    df = run_query("\nUNION ALL".join(branches), tuple(params))
+    if df.empty:
+        return pd.DataFrame(columns=["value", "score"])
+    return df.set_index("dimension")
+
+
+def platform_stats_from_rollups():
+    """Platform Stats rows (platform_name, game_count, avg_critic, avg_player) from the rollup table."""
+    return run_query("""
+        SELECT value AS platform_name, game_count, critics_avg AS avg_critic, players_avg AS avg_player
+        FROM Rating_rollup WHERE dimension = 'platform'
+        ORDER BY game_count DESC
+    """, compact=True)
+
+
+def genre_developer_source_sql():
+    """Source rows for the Top 5 Devs (Genre) ranking, read from the pair rollup."""
+    return """
+        SELECT genre_name, company_name, critics_avg AS avg_critic_rating
+        FROM Rating_rollup_genre_developer
+        WHERE critics_count > 0
+    """
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the VGDB rating rollups.")
+    parser.add_argument("--full", action="store_true", help="rebuild every rollup from scratch")
+    args = parser.parse_args()
+
+    from db import load_db_config
+    conn = mysql.connector.connect(**load_db_config())
+    try:
+        if args.full:
+            rebuild(conn)
+            print("Rollups rebuilt.")
+        else:
+            print(f"Refreshed rollups for {refresh(conn)} changed game(s).")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
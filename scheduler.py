@@ -0,0 +1,90 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import pandas as pd
+import streamlit as st
+
+from db import ConnectionUnavailable, fetch_query, get_pool, get_query_cache, get_replicas, get_result_limits
+from instrumentation import get_metrics
+from query_cache import DEFAULT_TTL
+
+# CONCURRENT PAGE QUERIES
+#
+# A page that needs several independent results submits them as one
+# QueryBatch. The queries run side by side on a process-wide thread pool
+# no larger than the connection pool, so the page waits for its slowest
+# query instead of the sum of all of them. Each query has its own timeout, and a failure or
+# timeout only blanks that query's result: the error is shown once the
+# batch is collected and the other results are returned as usual.
+
+DEFAULT_QUERY_TIMEOUT = 30.0   # seconds a page waits for one query of a batch
+
+
+@st.cache_resource
+def _get_executor():
+    """Creates the worker pool once per process; every session shares it."""
+    return ThreadPoolExecutor(max_workers=get_pool().size, thread_name_prefix="page-query")
+
+
+class QueryBatch:
+    """Independent queries submitted together and collected with run()."""
+
+    def __init__(self, timeout=None):
+        if timeout is None:
+            timeout = float(st.secrets["mysql"].get("query_timeout", DEFAULT_QUERY_TIMEOUT))
+        self.timeout = timeout
+        self._queries = {}
+
+    def add(self, name, query, params=None, ttl=DEFAULT_TTL, compact=False, max_rows=None, max_mb=None):
+        """Adds a query whose result run() returns under `name`; arguments as for run_query."""
+        self._queries[name] = (query, params, ttl, compact, max_rows, max_mb)
+        return self
+
+    def run(self):
+        """
+        Runs every query concurrently and returns {name: DataFrame}. Failed
+        and timed out queries come back as empty DataFrames after their error
+        is shown on the page.
+        """
+        if not self._queries:
+            return {}
+        # Resolve the shared resources in the script thread, where secrets and caches are set up
+        get_metrics()
+        get_query_cache()
+        get_result_limits()
+        get_replicas()
+        executor = _get_executor()
+
+        futures = {
+            name: executor.submit(fetch_query, query, params, ttl, compact, max_rows, max_mb)
+            for name, (query, params, ttl, compact, max_rows, max_mb) in self._queries.items()
+        }
+        # One deadline for the batch: every query gets `timeout` seconds from submission
+        wait(futures.values(), timeout=self.timeout)
+
+        results = {}
+        for name, future in futures.items():
+            if not future.done():
+                # The query keeps running on its worker and still fills the cache when it finishes
+                st.error(f"Query timed out after {self.timeout:.0f}s: {name}")
+                results[name] = pd.DataFrame()
+                continue
+            try:
+                results[name] = future.result()
+            except ConnectionUnavailable as e:
+                st.error(f"Error connecting to database: {e}")
+                results[name] = pd.DataFrame()
+            except Exception as e:
+                st.error(f"Query failed: {e}")
+                results[name] = pd.DataFrame()
+        return results
+
+
+def run_queries(queries, timeout=None):
+    """
+    Shorthand for a batch of (query, params) pairs given as {name: (query,
+    params)}; returns {name: DataFrame}.
+    """
+    batch = QueryBatch(timeout)
+    for name, (query, params) in queries.items():
+        batch.add(name, query, params)
+    return batch.run()
@@ -0,0 +1,67 @@
+from collections import namedtuple
+
+# CATALOG SCHEMA
+#
+# Every descriptive attribute of a game lives in its own link table keyed by
+# the Video_game composite key (game_name, initial_release_date).
+
+Dimension = namedtuple("Dimension", ["key", "label", "table", "column"])
+
+DIMENSIONS = [
+    Dimension("developer", "Developer", "Video_game_developer", "company_name"),
+    Dimension("publisher", "Publisher", "Video_game_publisher", "company_name"),
+    Dimension("genre", "Genre", "Video_game_genre", "genre_name"),
+    Dimension("setting", "Setting", "Video_game_setting", "setting_name"),
+    Dimension("perspective", "Perspective", "Video_game_perspective", "perspective_name"),
+    Dimension("pacing", "Pacing", "Video_game_pacing", "pacing_name"),
+    Dimension("interface", "Interface", "Video_game_interface", "interface"),
+    Dimension("input_device", "Input Device", "Video_game_input_devices", "input_device_name"),
+    Dimension("business_model", "Business Model", "Video_game_business_model", "business_model_name"),
+    Dimension("media_type", "Media Type", "Video_game_media_type", "media_type_name"),
+    Dimension("maturity_rating", "Maturity Rating", "Video_game_maturity_rating", "maturity_rating"),
+    Dimension("platform", "Platform", "Video_game_platform", "platform_name"),
+]
+
+DIMENSIONS_BY_KEY = {dim.key: dim for dim in DIMENSIONS}
+
+# Rating columns of Video_game that the analytics pages aggregate
+RATING_COLUMNS = ("players_rating", "critics_rating", "moby_score")
+
+# Tables other than the link tables that reference a game by its key
+GAME_REFERENCING_TABLES = ["User_Rating"]
+
+# How link tables are joined to Video_game: "composite" joins on
+# (game_name, initial_release_date); "surrogate" joins on the integer game_id
+# added by the opt-in migrations in migrations.SURROGATE_KEY_MIGRATIONS.
+GAME_KEYS = ("composite", "surrogate")
+_game_key = "composite"
+
+
+def get_dimension(key):
+    """Looks up a dimension by key, e.g. get_dimension("genre")."""
+    try:
+        return DIMENSIONS_BY_KEY[key]
+    except KeyError:
+        raise ValueError(f"Unknown dimension: {key!r}") from None
+
+
+def set_game_key(mode):
+    """Switches every query builder between composite and surrogate game keys."""
+    global _game_key
+    if mode not in GAME_KEYS:
+        raise ValueError(f"Unknown game key mode: {mode!r}")
+    _game_key = mode
+
+
+def get_game_key():
+    return _game_key
+
+
+def game_join(game_alias, link_alias):
+    """Returns the ON condition joining a Video_game alias to a link table alias."""
+    if _game_key == "surrogate":
+        return f"{game_alias}.game_id = {link_alias}.game_id"
+    return (
+        f"{game_alias}.game_name = {link_alias}.game_name"
+        f" AND {game_alias}.initial_release_date = {link_alias}.initial_release_date"
+    )
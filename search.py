@@ -0,0 +1,229 @@
+import bisect
+import re
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+from db import run_query
+
+# GAME TITLE SEARCH
+#
+# The Rate Games page searches titles on every keystroke. Instead of a
+# LIKE '%term%' scan of Video_game per keystroke, titles are loaded once per
+# process into an in-memory index shared by every session:
+#   * a sorted list of lower-cased titles answers prefix lookups by bisection
+#   * a trigram -> game ids map narrows substring lookups to a few candidates
+# Matches are ranked exact title first, then prefix, then substring.
+
+SEARCH_LIMIT = 10
+REFRESH_INTERVAL = 600   # seconds between incremental refreshes from the database
+
+_NON_WORD = re.compile(r"[^\w]")
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class GameSearchIndex:
+    """An in-memory prefix/trigram index over (game_name, initial_release_date) keys."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._refreshing = False
+        self.refreshed_at = None
+        self._reset()
+
+    def _reset(self):
+        self._games = {}        # game id -> (game_name, initial_release_date)
+        self._ids = {}          # (game_name, initial_release_date) -> game id
+        self._lowered = {}      # game id -> lower-cased name
+        self._sorted = []       # sorted (lower-cased name, game id)
+        self._grams = {}        # trigram -> set of game ids
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._games)
+
+    def add(self, game_name, release_date):
+        """Indexes one game; adding a game that is already indexed does nothing."""
+        key = (game_name, release_date)
+        with self._lock:
+            if key in self._ids:
+                return
+            game_id = self._next_id
+            self._next_id += 1
+            lowered = game_name.lower()
+            self._games[game_id] = key
+            self._ids[key] = game_id
+            self._lowered[game_id] = lowered
+            bisect.insort(self._sorted, (lowered, game_id))
+            for gram in _trigrams(lowered):
+                self._grams.setdefault(gram, set()).add(game_id)
+
+    def remove(self, game_name, release_date):
+        """Drops one game from the index if present."""
+        with self._lock:
+            game_id = self._ids.pop((game_name, release_date), None)
+            if game_id is None:
+                return
+            del self._games[game_id]
+            lowered = self._lowered.pop(game_id)
+            pos = bisect.bisect_left(self._sorted, (lowered, game_id))
+            if pos < len(self._sorted) and self._sorted[pos] == (lowered, game_id):
+                del self._sorted[pos]
+            for gram in _trigrams(lowered):
+                ids = self._grams.get(gram)
+                if ids is not None:
+                    ids.discard(game_id)
+                    if not ids:
+                        del self._grams[gram]
+
+    def sync(self, keys):
+        """
+        Brings the index in line with the given (game_name, release_date) keys,
+        adding new games and removing deleted ones without rebuilding the rest.
+        Returns (added, removed) counts.
+        """
+        keys = set(keys)
+        with self._lock:
+            current = set(self._ids)
+            added = keys - current
+            removed = current - keys
+            if len(added) > len(current):
+                # First load (or a near-total change): build in one go instead of insort per title
+                self._bulk_load(keys)
+            else:
+                for key in removed:
+                    self.remove(*key)
+                for key in added:
+                    self.add(*key)
+            self.refreshed_at = time.time()
+        return len(added), len(removed)
+
+    def _bulk_load(self, keys):
+        self._reset()
+        for key in keys:
+            game_id = self._next_id
+            self._next_id += 1
+            lowered = key[0].lower()
+            self._games[game_id] = key
+            self._ids[key] = game_id
+            self._lowered[game_id] = lowered
+            self._sorted.append((lowered, game_id))
+            for gram in _trigrams(lowered):
+                self._grams.setdefault(gram, set()).add(game_id)
+        self._sorted.sort()
+
+    def _prefix_ids(self, term, limit):
+        pos = bisect.bisect_left(self._sorted, (term, -1))
+        found = []
+        while pos < len(self._sorted) and len(found) < limit:
+            lowered, game_id = self._sorted[pos]
+            if not lowered.startswith(term):
+                break
+            found.append(game_id)
+            pos += 1
+        return found
+
+    def _substring_ids(self, term):
+        grams = _trigrams(term)
+        if not grams:
+            # One or two characters: no trigram to narrow by, check every title
+            return [game_id for game_id, lowered in self._lowered.items() if term in lowered]
+        candidates = None
+        for gram in sorted(grams, key=lambda g: len(self._grams.get(g, ()))):
+            ids = self._grams.get(gram)
+            if not ids:
+                return []
+            candidates = set(ids) if candidates is None else candidates & ids
+            if not candidates:
+                return []
+        return [game_id for game_id in candidates if term in self._lowered[game_id]]
+
+    def search(self, term, limit=SEARCH_LIMIT):
+        """Returns up to `limit` (game_name, release_date) keys: exact matches, then prefix, then substring."""
+        term = term.strip().lower()
+        if not term:
+            return []
+        with self._lock:
+            prefix = self._prefix_ids(term, limit)
+            exact = [game_id for game_id in prefix if self._lowered[game_id] == term]
+            ranked = exact + [game_id for game_id in prefix if game_id not in exact]
+            if len(ranked) < limit:
+                seen = set(ranked)
+                rest = [game_id for game_id in self._substring_ids(term) if game_id not in seen]
+                # Earlier matches and shorter titles first
+                rest.sort(key=lambda game_id: (self._lowered[game_id].find(term), len(self._lowered[game_id]), self._lowered[game_id]))
+                ranked += rest[:limit - len(ranked)]
+            return [self._games[game_id] for game_id in ranked[:limit]]
+
+
+def _load_game_keys():
+    # ttl=0: the index is the cache, no need to also keep the raw list in run_query's cache.
+    # No result caps either: the index needs every title.
+    df = run_query("SELECT game_name, initial_release_date FROM Video_game", ttl=0, max_rows=0, max_mb=0)
+    return zip(df["game_name"], df["initial_release_date"]) if not df.empty else []
+
+
+@st.cache_resource
+def get_search_index():
+    """
+    Builds the title index once per process; every session shares it. When
+    the first load fails the index starts empty with no refreshed_at, so the
+    next search retries the load in the background.
+    """
+    index = GameSearchIndex()
+    keys = list(_load_game_keys())
+    if keys:
+        index.sync(keys)
+    return index
+
+
+def _refresh_if_due(index):
+    """Starts a background sync once the index is older than REFRESH_INTERVAL; searches keep using the current index meanwhile."""
+    with index._lock:
+        if index._refreshing or (index.refreshed_at and time.time() - index.refreshed_at < REFRESH_INTERVAL):
+            return
+        index._refreshing = True
+
+    def refresh():
+        try:
+            keys = list(_load_game_keys())
+            if keys:
+                index.sync(keys)
+        finally:
+            index._refreshing = False
+
+    threading.Thread(target=refresh, name="game-search-refresh", daemon=True).start()
+
+
+def _search_fulltext(term, limit):
+    # Needs the FULLTEXT index from migrations.FULLTEXT_MIGRATIONS (`python migrations.py --fulltext`)
+    query = f"""
+        SELECT game_name, initial_release_date
+        FROM Video_game
+        WHERE MATCH(game_name) AGAINST (%s IN BOOLEAN MODE)
+        ORDER BY game_name = %s DESC, MATCH(game_name) AGAINST (%s IN BOOLEAN MODE) DESC
+        LIMIT {int(limit)}
+    """
+    words = " ".join(f"+{word}*" for word in (_NON_WORD.sub("", part) for part in term.split()) if word)
+    if not words:
+        return pd.DataFrame(columns=["game_name", "initial_release_date"])
+    return run_query(query, (words, term, words))
+
+
+def search_games(term, limit=SEARCH_LIMIT):
+    """
+    Returns a DataFrame of up to `limit` games whose title matches `term`.
+
+    Uses the in-process index unless `search_backend = "fulltext"` is set in
+    the [mysql] secrets, in which case MySQL's FULLTEXT search answers instead.
+    """
+    if st.secrets["mysql"].get("search_backend", "index") == "fulltext":
+        return _search_fulltext(term, limit)
+    index = get_search_index()
+    _refresh_if_due(index)
+    return pd.DataFrame(index.search(term, limit), columns=["game_name", "initial_release_date"])
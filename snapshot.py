@@ -0,0 +1,320 @@
+"""
+Local columnar snapshot of the catalog for the read-only analytics pages.
+
+Exports Video_game and every link table into Parquet files. Top Charts,
+Dream Game Builder and Platform Stats then compute their aggregates in
+pandas from memory and send no query to MySQL at all.
+Rating writes are unaffected. The snapshot is refreshed in the background
+once it is older than `snapshot_refresh_minutes`, or on demand:
+
+    python snapshot.py                 # export a fresh snapshot
+    python snapshot.py --out /path     # somewhere other than `snapshot_dir`
+
+Needs pyarrow. Without it the pages keep querying MySQL.
+"""
+import argparse
+import datetime
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+import mysql.connector
+import pandas as pd
+import streamlit as st
+
+from db import get_pool, read_chunks
+from schema import DIMENSIONS, get_dimension
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SNAPSHOT_DIR = "snapshot"   # relative paths are under APP_DIR
+DEFAULT_REFRESH_MINUTES = 24 * 60
+MANIFEST = "manifest.json"
+GAME_COLUMNS = ["game_name", "initial_release_date", "moby_score", "critics_rating", "players_rating"]
+EXPORT_CHUNK_ROWS = 100_000
+
+
+# EXPORT
+
+def export(conn, directory):
+    """
+    Writes a complete snapshot into `directory`, replacing the previous one
+    only once every file is written. Returns the row count per table.
+    """
+    staging = f"{directory}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    rows = {}
+
+    chunks = list(read_chunks(conn, f"SELECT {', '.join(GAME_COLUMNS)} FROM Video_game", None, EXPORT_CHUNK_ROWS, False))
+    games = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    # Links refer to games by row number ("gid") instead of the composite key
+    keys = pd.MultiIndex.from_frame(games[["game_name", "initial_release_date"]])
+    games["release_year"] = pd.array([date.year if date is not None else None for date in games["initial_release_date"]], dtype="Int16")
+    games.to_parquet(os.path.join(staging, "Video_game.parquet"), index=False)
+    rows["Video_game"] = len(games)
+
+    for dim in DIMENSIONS:
+        query = f"SELECT game_name, initial_release_date, {dim.column} FROM {dim.table}"
+        parts = []
+        for chunk in read_chunks(conn, query, None, EXPORT_CHUNK_ROWS, False):
+            gid = keys.get_indexer(pd.MultiIndex.from_frame(chunk[["game_name", "initial_release_date"]]))
+            known = gid >= 0
+            parts.append(pd.DataFrame({"gid": gid[known].astype("int32"), "value": chunk[dim.column].to_numpy()[known]}))
+        link = pd.concat(parts, ignore_index=True)
+        link["value"] = link["value"].astype("category")
+        link.to_parquet(os.path.join(staging, f"{dim.table}.parquet"), index=False)
+        rows[dim.table] = len(link)
+
+    with open(os.path.join(staging, MANIFEST), "w") as handle:
+        json.dump({"exported_at": datetime.datetime.now().isoformat(timespec="seconds"), "rows": rows}, handle, indent=2)
+
+    previous = f"{directory}.old-{os.getpid()}"
+    if os.path.exists(directory):
+        os.replace(directory, previous)
+    os.replace(staging, directory)
+    shutil.rmtree(previous, ignore_errors=True)
+    return rows
+
+
+def read_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST)) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+# QUERYING
+
+class CatalogSnapshot:
+    """One exported snapshot held in memory; link tables are read on first use."""
+
+    def __init__(self, directory, manifest):
+        self.directory = directory
+        self.exported_at = manifest["exported_at"]
+        self.games = pd.read_parquet(os.path.join(directory, "Video_game.parquet"))
+        self._links = {}
+        self._lock = threading.Lock()
+
+    def link(self, key):
+        """(gid, value) rows of one dimension's link table."""
+        dim = get_dimension(key)
+        with self._lock:
+            if dim.key not in self._links:
+                self._links[dim.key] = pd.read_parquet(os.path.join(self.directory, f"{dim.table}.parquet"))
+            return self._links[dim.key]
+
+    def _with_game_column(self, key, column):
+        """(value, <column>) for every link row whose game has `column` set."""
+        link = self.link(key)
+        frame = pd.DataFrame({"value": link["value"], column: self.games[column].to_numpy()[link["gid"].to_numpy()]})
+        return frame[frame[column].notna()]
+
+    def best_by_dimension(self, dimension_keys, metric="players_rating"):
+        """Same result as analytics.best_by_dimension."""
+        rows = []
+        for key in dimension_keys:
+            scored = self._with_game_column(key, metric)
+            if scored.empty:
+                continue
+            means = scored.groupby("value", observed=True)[metric].mean()
+            rows.append({"dimension": key, "value": str(means.idxmax()), "score": float(means.max())})
+        if not rows:
+            return pd.DataFrame(columns=["value", "score"])
+        return pd.DataFrame(rows).set_index("dimension")
+
+    def top_n_per_group(self, key, order_column, n):
+        """Top `n` games by `order_column` within each value of a dimension (group, game_name, score)."""
+        dim = get_dimension(key)
+        link = self.link(key)
+        gids = link["gid"].to_numpy()
+        frame = pd.DataFrame({
+            dim.column: link["value"],
+            "game_name": self.games["game_name"].to_numpy()[gids],
+            order_column: self.games[order_column].to_numpy()[gids],
+        })
+        frame = frame[frame[order_column].notna()]
+        top = frame.sort_values(order_column, ascending=False, kind="stable").groupby(dim.column, observed=True).head(n)
+        return top.sort_values([dim.column, order_column], ascending=[True, False]).reset_index(drop=True)
+
+    def top_devs_per_genre(self, n):
+        """Top `n` developers by average critics rating within each genre."""
+        genre = self.link("genre").rename(columns={"value": "genre_name"})
+        developer = self.link("developer").rename(columns={"value": "company_name"})
+        critics = self.games["critics_rating"]
+        rated = critics.index[critics.notna()]
+        pairs = genre[genre["gid"].isin(rated)].merge(developer, on="gid")
+        pairs["critics_rating"] = critics.to_numpy()[pairs["gid"].to_numpy()]
+        averages = (
+            pairs.groupby(["genre_name", "company_name"], observed=True)["critics_rating"].mean()
+            .rename("avg_critic_rating").reset_index()
+        )
+        top = averages.sort_values("avg_critic_rating", ascending=False, kind="stable").groupby("genre_name", observed=True).head(n)
+        return top.sort_values(["genre_name", "avg_critic_rating"], ascending=[True, False]).reset_index(drop=True)
+
+    def top_rated_games(self, metric, n=10, genre=None, year=None):
+        """Same result as analytics.top_rated_games."""
+        games = self.games[self.games[metric].notna()]
+        if genre is not None:
+            link = self.link("genre")
+            games = games[games.index.isin(link["gid"][link["value"] == genre])]
+        if year is not None:
+            games = games[games["release_year"] == int(year)]
+        return games.nlargest(n, metric)[["game_name", metric]].reset_index(drop=True)
+
+    def top_rated_games_by_metric(self, metrics, n=10, genre=None, year=None):
+        """Same result as analytics.top_rated_games_by_metric."""
+        return {metric: self.top_rated_games(metric, n, genre, year) for metric in metrics}
+
+    def release_years(self):
+        years = self.games["release_year"].dropna()
+        return sorted(set(years[years < 9999].astype(int)), reverse=True)
+
+    def platform_stats(self):
+        """Same columns as queries.platform_stats_sql."""
+        link = self.link("platform")
+        gids = link["gid"].to_numpy()
+        frame = pd.DataFrame({
+            "platform_name": link["value"],
+            "critics_rating": self.games["critics_rating"].to_numpy()[gids],
+            "players_rating": self.games["players_rating"].to_numpy()[gids],
+        })
+        stats = frame.groupby("platform_name", observed=True).agg(
+            game_count=("platform_name", "size"),
+            avg_critic=("critics_rating", "mean"),
+            avg_player=("players_rating", "mean"),
+        )
+        return stats.sort_values("game_count", ascending=False).reset_index()
+
+
+# APP INTEGRATION
+
+def snapshot_dir():
+    return os.path.join(APP_DIR, st.secrets["mysql"].get("snapshot_dir", DEFAULT_SNAPSHOT_DIR))
+
+
+class _SnapshotStore:
+    """Holds the loaded snapshot, swaps in newer exports and runs at most one export at a time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._exporting = False
+        self.last_error = None
+
+    def current(self, directory):
+        manifest = read_manifest(directory)
+        with self._lock:
+            if manifest and (self._snapshot is None or self._snapshot.exported_at != manifest["exported_at"]):
+                try:
+                    self._snapshot = CatalogSnapshot(directory, manifest)
+                except (OSError, ValueError) as err:
+                    logger.warning("Could not load the analytics snapshot in %s: %s", directory, err)
+            return self._snapshot
+
+    @property
+    def exporting(self):
+        return self._exporting
+
+    def trigger_export(self, directory):
+        with self._lock:
+            if self._exporting:
+                return
+            self._exporting = True
+        threading.Thread(target=self._export, args=(directory,), name="snapshot-export", daemon=True).start()
+
+    def _export(self, directory):
+        try:
+            with get_pool().connection() as conn:
+                export(conn, directory)
+            self.last_error = None
+        except (mysql.connector.Error, OSError, ValueError) as err:
+            logger.warning("Analytics snapshot export failed: %s", err)
+            self.last_error = str(err)
+        finally:
+            with self._lock:
+                self._exporting = False
+
+
+@st.cache_resource
+def _get_store():
+    return _SnapshotStore()
+
+
+def snapshot_enabled():
+    """True when `use_snapshot = true` is set in the secrets and pyarrow is installed."""
+    if not st.secrets["mysql"].get("use_snapshot", False):
+        return False
+    if importlib.util.find_spec("pyarrow") is None:
+        logger.warning("use_snapshot is set but pyarrow is not installed; analytics pages query MySQL")
+        return False
+    return True
+
+
+def get_snapshot():
+    """
+    Returns the current CatalogSnapshot, or None while the first export is
+    still running. Starts a background export when the snapshot is missing
+    or older than `snapshot_refresh_minutes`.
+    """
+    store = _get_store()
+    directory = snapshot_dir()
+    snapshot = store.current(directory)
+    max_age = float(st.secrets["mysql"].get("snapshot_refresh_minutes", DEFAULT_REFRESH_MINUTES)) * 60
+    if snapshot is None or time.time() - datetime.datetime.fromisoformat(snapshot.exported_at).timestamp() > max_age:
+        store.trigger_export(directory)
+    return snapshot
+
+
+def refresh_snapshot():
+    """Starts an export now (the Diagnostics page's refresh button)."""
+    _get_store().trigger_export(snapshot_dir())
+
+
+def show_snapshot_freshness(snapshot):
+    """Writes a caption saying which snapshot the page was computed from."""
+    store = _get_store()
+    note = f"Computed from the catalog snapshot of {snapshot.exported_at.replace('T', ' ')}"
+    if store.exporting:
+        note += " · newer snapshot being exported"
+    st.caption(note)
+
+
+def snapshot_status():
+    """Plain-data description of the snapshot for the Diagnostics page."""
+    store = _get_store()
+    manifest = read_manifest(snapshot_dir())
+    return {
+        "directory": snapshot_dir(),
+        "exported_at": manifest["exported_at"] if manifest else None,
+        "rows": manifest["rows"] if manifest else None,
+        "exporting": store.exporting,
+        "last_error": store.last_error,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the VGDB catalog into a local Parquet snapshot.")
+    parser.add_argument("--out", help="snapshot directory (default: snapshot_dir from the secrets)")
+    args = parser.parse_args()
+
+    from db import load_db_config
+    conn = mysql.connector.connect(**load_db_config())
+    try:
+        started = time.perf_counter()
+        rows = export(conn, args.out or snapshot_dir())
+    finally:
+        conn.close()
+    for table, count in rows.items():
+        print(f"{table:<28} {count:>12,}")
+    print(f"Exported in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+import pytest
+
+import schema
+
+
+@pytest.fixture(autouse=True)
+def composite_game_keys():
+    """Query builders use composite keys unless a test switches them."""
+    schema.set_game_key("composite")
+    yield
+    schema.set_game_key("composite")
@@ -0,0 +1,89 @@
+import datetime
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from browser import _cursor_from_row, browse_games_sql
+from schema import set_game_key
+
+GAMES = [
+    ("Alpha", "2001-01-01", 90.0),
+    ("Beta", "2002-01-01", 90.0),
+    ("Beta", "2003-01-01", 90.0),
+    ("Gamma", "2001-01-01", 75.5),
+    ("Delta", "2004-01-01", None),
+    ("Epsilon", "2004-01-01", None),
+    ("Zeta", "2005-01-01", 60.0),
+]
+GENRES = [("Alpha", "2001-01-01", "RPG"), ("Beta", "2003-01-01", "RPG"), ("Delta", "2004-01-01", "RPG"),
+          ("Alpha", "2001-01-01", "Action"), ("Zeta", "2005-01-01", "RPG")]
+
+
+@pytest.fixture
+def catalog():
+    # SQLite sorts NULLs last in DESC order like MySQL, so the keyset conditions behave the same
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE Video_game (game_name, initial_release_date, moby_score, critics_rating, players_rating)")
+    conn.execute("CREATE TABLE Video_game_genre (game_name, initial_release_date, genre_name)")
+    conn.executemany("INSERT INTO Video_game VALUES (?, ?, ?, NULL, NULL)", GAMES)
+    conn.executemany("INSERT INTO Video_game_genre VALUES (?, ?, ?)", GENRES)
+    yield conn
+    conn.close()
+
+
+def _run(conn, query, params):
+    return pd.read_sql(query.replace("%s", "?"), conn, params=params)
+
+
+def _walk(conn, filters, page_size):
+    rows, cursor = [], None
+    while True:
+        query, params = browse_games_sql(filters, cursor, page_size)
+        df = _run(conn, query, params)
+        page = df.iloc[:page_size]
+        rows += list(zip(page["game_name"], page["initial_release_date"]))
+        if len(df) <= page_size:
+            return rows
+        cursor = _cursor_from_row(page.iloc[-1])
+
+
+@pytest.mark.parametrize("page_size", [1, 2, 3, 100])
+def test_keyset_pages_match_the_full_ordering(catalog, page_size):
+    everything = _run(catalog, *browse_games_sql({}, page_size=len(GAMES)))
+    expected = list(zip(everything["game_name"], everything["initial_release_date"]))
+    assert expected[:3] == [("Alpha", "2001-01-01"), ("Beta", "2002-01-01"), ("Beta", "2003-01-01")]
+    assert expected[-2:] == [("Delta", "2004-01-01"), ("Epsilon", "2004-01-01")]
+    assert _walk(catalog, {}, page_size) == expected
+
+
+def test_filter_returns_each_game_once(catalog):
+    rows = _walk(catalog, {"genre": "RPG", "platform": None}, 2)
+    assert rows == [("Alpha", "2001-01-01"), ("Beta", "2003-01-01"), ("Zeta", "2005-01-01"), ("Delta", "2004-01-01")]
+
+
+def test_query_fetches_one_extra_row_and_skips_empty_filters():
+    query, params = browse_games_sql({"genre": None, "platform": "PC"}, page_size=10)
+    assert "Video_game_genre" not in query
+    assert "Video_game_platform" in query
+    assert query.endswith("LIMIT 11")
+    assert params == ("PC",)
+
+
+def test_cursor_for_unscored_rows_only_walks_unscored_games():
+    query, params = browse_games_sql({}, cursor=(None, "Delta", "2004-01-01"))
+    assert "v.moby_score IS NULL AND" in query
+    assert params == ("Delta", "Delta", "2004-01-01")
+
+
+def test_cursor_from_row_normalizes_values():
+    row = pd.Series({"moby_score": float("nan"), "game_name": "A", "initial_release_date": datetime.datetime(2001, 1, 1)})
+    assert _cursor_from_row(row) == (None, "A", datetime.date(2001, 1, 1))
+    row = pd.Series({"moby_score": 7, "game_name": "A", "initial_release_date": datetime.date(2001, 1, 1)})
+    assert _cursor_from_row(row) == (7.0, "A", datetime.date(2001, 1, 1))
+
+
+def test_surrogate_keys_join_on_game_id():
+    set_game_key("surrogate")
+    query, _ = browse_games_sql({"genre": "RPG"})
+    assert "v.game_id = f.game_id" in query
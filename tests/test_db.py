@@ -0,0 +1,20 @@
+import pytest
+
+from db import version_supports_window_functions
+
+
+@pytest.mark.parametrize("version, supported", [
+    ("8.0.35", True),
+    ("8.4.0-commercial", True),
+    ("5.7.44", False),
+    ("5.7.44-log", False),
+    ("10.1.48-MariaDB", False),
+    ("10.2.0-MariaDB", True),
+    ("10.6.12-MariaDB-1:10.6.12+maria~ubu2004", True),
+    ("5.5.5-10.6.12-MariaDB", True),
+    ("5.5.5-10.1.2-MariaDB", False),
+    ("", False),
+    ("unknown", False),
+])
+def test_version_supports_window_functions(version, supported):
+    assert version_supports_window_functions(version) is supported
@@ -0,0 +1,111 @@
+import pandas as pd
+import pytest
+
+import director_graph
+from director_graph import CollaborationGraph
+
+GAMES = pd.DataFrame([
+    ("Miyamoto", "Mario", "1985-09-13", 90.0, 8.0),
+    ("Miyamoto", "Zelda", "1986-02-21", 85.0, 9.0),
+    ("Miyamoto", "Pikmin", "2001-10-26", 80.0, None),
+    ("Kojima", "Metal Gear", "1987-07-07", 70.0, 7.0),
+    ("Kojima", "Death Stranding", "2019-11-08", 80.0, 8.0),
+    ("Suzuki", "Shenmue", "1999-12-29", 88.0, 9.0),
+], columns=["director_name", "game_name", "initial_release_date", "critics_rating", "players_rating"])
+
+DEVELOPERS = pd.DataFrame([
+    ("Miyamoto", "Mario", "1985-09-13", "Nintendo"),
+    ("Miyamoto", "Zelda", "1986-02-21", "Nintendo"),
+    ("Miyamoto", "Pikmin", "2001-10-26", "Nintendo"),
+    ("Kojima", "Metal Gear", "1987-07-07", "Konami"),
+    ("Kojima", "Death Stranding", "2019-11-08", "Kojima Productions"),
+    ("Suzuki", "Shenmue", "1999-12-29", "Sega"),
+    ("Suzuki", "Shenmue", "1999-12-29", "Nintendo"),
+], columns=["director_name", "game_name", "initial_release_date", "value"])
+
+GENRES = pd.DataFrame([
+    ("Miyamoto", "Mario", "1985-09-13", "Platform"),
+    ("Miyamoto", "Zelda", "1986-02-21", "Adventure"),
+    ("Kojima", "Metal Gear", "1987-07-07", "Stealth"),
+    ("Kojima", "Death Stranding", "2019-11-08", "Adventure"),
+    ("Suzuki", "Shenmue", "1999-12-29", "Adventure"),
+], columns=["director_name", "game_name", "initial_release_date", "value"])
+
+
+def _checksums(games):
+    return games.groupby("director_name").size().to_frame("games")
+
+
+def _graph(games=GAMES, links=None):
+    links = links or {"developer": DEVELOPERS, "genre": GENRES}
+    return CollaborationGraph(games, links, _checksums(games))
+
+
+def test_prolific_directors_and_collaborations():
+    graph = _graph()
+    assert graph.prolific_directors(2).values.tolist() == [["Miyamoto", 3], ["Kojima", 2]]
+    top = graph.top_collaborations(1)
+    assert top.columns.tolist() == ["director_name", "company_name", "collab_count"]
+    assert top.values.tolist() == [["Miyamoto", "Nintendo", 3]]
+
+
+def test_summary_and_timeline():
+    graph = _graph()
+    summary = graph.summary("Miyamoto")
+    assert summary["games"] == 3 and (summary["first_year"], summary["last_year"]) == (1985, 2001)
+    assert summary["avg_critic"] == pytest.approx(85.0)
+    assert summary["avg_player"] == pytest.approx(8.5)
+    assert graph.summary("Nobody") is None
+
+    timeline = graph.timeline("Miyamoto")
+    assert timeline["game_name"].tolist() == ["Mario", "Zelda", "Pikmin"]
+    assert timeline["genre_name"].tolist() == ["Platform", "Adventure", ""]
+    assert graph.timeline("Nobody").empty
+
+
+def test_partners_directors_and_similarity():
+    graph = _graph()
+    partners = graph.top_partners("Kojima")
+    assert sorted(partners["company_name"]) == ["Kojima Productions", "Konami"]
+    assert graph.top_directors("Nintendo")["director_name"].tolist() == ["Miyamoto", "Suzuki"]
+    assert graph.top_directors("Unknown").empty
+
+    shared = graph.shared_partners("Miyamoto", "Suzuki")
+    assert shared.values.tolist() == [["Nintendo", 3, 1]]
+    assert graph.similar_directors("Miyamoto")["director_name"].tolist() == ["Suzuki"]
+    assert graph.similar_directors("Kojima", dimension="genre")["director_name"].tolist() == ["Miyamoto", "Suzuki"]
+    assert "Suzuki" in graph and "Nobody" not in graph
+
+
+def _frames(graph):
+    return (
+        graph.prolific_directors(10).sort_values("director_name").reset_index(drop=True),
+        graph.top_collaborations(20).sort_values(["director_name", "company_name"]).reset_index(drop=True),
+        graph.timeline("Kojima"),
+    )
+
+
+def test_refresh_reloads_changed_directors_only(monkeypatch):
+    graph = _graph()
+    games = pd.concat([GAMES, pd.DataFrame([("Kojima", "Snatcher", "1988-11-26", 75.0, 7.5)], columns=GAMES.columns)],
+                      ignore_index=True)
+    developers = pd.concat([DEVELOPERS, pd.DataFrame([("Kojima", "Snatcher", "1988-11-26", "Konami")], columns=DEVELOPERS.columns)],
+                           ignore_index=True)
+    links = {"developer": developers, "genre": GENRES}
+    reloaded = []
+
+    def read_rows(directors=None):
+        reloaded.append(directors)
+        keep = (lambda df: df[df["director_name"].isin(directors)]) if directors is not None else (lambda df: df)
+        return keep(games), {key: keep(link) for key, link in links.items()}
+
+    monkeypatch.setattr(director_graph, "read_checksums", lambda: _checksums(games))
+    monkeypatch.setattr(director_graph, "read_rows", read_rows)
+    monkeypatch.setattr(director_graph, "FULL_RELOAD_SHARE", 0.5)
+
+    refreshed = graph.refreshed()
+    assert reloaded == [["Kojima"]]
+    for actual, expected in zip(_frames(refreshed), _frames(_graph(games, links))):
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+    assert refreshed.refreshed() is refreshed
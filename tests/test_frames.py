@@ -0,0 +1,49 @@
+import pandas as pd
+
+from frames import STRING_DTYPE, compact_frame, concat_frames
+
+
+def test_compact_frame_types():
+    df = pd.DataFrame({
+        "genre": ["Action", "Action", "RPG", "RPG"],
+        "game_name": ["a", "b", "c", "d"],
+        "count": pd.Series([1, 2, 3, 4], dtype="int64"),
+        "score": [1.5, 2.5, None, 4.0],
+    })
+    compact = compact_frame(df)
+    assert isinstance(compact["genre"].dtype, pd.CategoricalDtype)
+    assert compact["game_name"].dtype == STRING_DTYPE
+    assert compact["count"].dtype == "int8"
+    assert compact["score"].dtype == "float64"
+    assert compact["genre"].tolist() == df["genre"].tolist()
+    assert compact["game_name"].tolist() == df["game_name"].tolist()
+
+
+def test_compact_frame_keeps_values():
+    df = pd.DataFrame({"genre": ["Action", "Action", None], "n": [1, 300, 70000]})
+    compact = compact_frame(df)
+    assert compact["genre"].tolist()[:2] == ["Action", "Action"]
+    assert pd.isna(compact["genre"].tolist()[2])
+    assert compact["n"].tolist() == [1, 300, 70000]
+    assert compact["n"].dtype == "int32"
+
+
+def test_compact_frame_empty_is_unchanged():
+    df = pd.DataFrame(columns=["a"])
+    assert compact_frame(df) is df
+
+
+def test_concat_frames_merges_categories():
+    first = compact_frame(pd.DataFrame({"genre": ["Action", "Action"]}))
+    second = compact_frame(pd.DataFrame({"genre": ["RPG", "RPG"]}))
+    merged = concat_frames([first, second])
+    assert isinstance(merged["genre"].dtype, pd.CategoricalDtype)
+    assert merged["genre"].tolist() == ["Action", "Action", "RPG", "RPG"]
+
+
+def test_concat_frames_mixed_categorical_becomes_string():
+    first = compact_frame(pd.DataFrame({"genre": ["Action", "Action"]}))
+    second = compact_frame(pd.DataFrame({"genre": ["RPG", "Puzzle"]}))
+    merged = concat_frames([first, second])
+    assert merged["genre"].dtype == STRING_DTYPE
+    assert merged["genre"].tolist() == ["Action", "Action", "RPG", "Puzzle"]
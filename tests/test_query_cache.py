@@ -0,0 +1,86 @@
+import pandas as pd
+
+from query_cache import QueryCache, normalize_sql, tables_read, tables_written
+
+
+def test_tables_read_covers_from_and_joins():
+    query = """
+        SELECT v.game_name FROM Video_game v
+        JOIN `Video_game_genre` g ON v.game_name = g.game_name
+        WHERE EXISTS (SELECT 1 FROM video_game_platform p WHERE p.game_name = v.game_name)
+    """
+    assert tables_read(query) == {"video_game", "video_game_genre", "video_game_platform"}
+
+
+def test_tables_written():
+    assert tables_written("INSERT INTO User_Rating (email) VALUES (%s)") == {"user_rating"}
+    assert tables_written("  insert ignore into `User` VALUES (%s)") == {"user"}
+    assert tables_written("UPDATE Video_game SET moby_score = 1") == {"video_game"}
+    assert tables_written("DELETE FROM User WHERE email = %s") == {"user"}
+    assert tables_written("SELECT * FROM User") == frozenset()
+
+
+def test_make_key_ignores_whitespace():
+    assert QueryCache.make_key("SELECT  *\n FROM User", [1]) == QueryCache.make_key("SELECT * FROM User", (1,))
+    assert normalize_sql("  SELECT\t1  ") == "SELECT 1"
+
+
+def test_invalidation_drops_only_readers_of_the_table():
+    cache = QueryCache()
+    users = QueryCache.make_key("SELECT * FROM User")
+    games = QueryCache.make_key("SELECT * FROM Video_game")
+    cache.put(users, pd.DataFrame({"a": [1]}))
+    cache.put(games, pd.DataFrame({"a": [2]}))
+    assert cache.invalidate_tables(["USER"]) == 1
+    assert cache.get(users) is None
+    assert cache.get(games) is not None
+
+
+def test_put_skips_results_read_before_a_write():
+    cache = QueryCache()
+    key = QueryCache.make_key("SELECT * FROM User_Rating r JOIN User u ON r.email = u.email")
+    generation = cache.generation(key)
+    cache.invalidate_tables(["User"])
+    cache.put(key, pd.DataFrame({"a": [1]}), generation=generation)
+    assert cache.get(key) is None
+
+    cache.put(key, pd.DataFrame({"a": [1]}), generation=cache.generation(key))
+    assert cache.get(key) is not None
+
+
+def test_generation_ignores_unrelated_writes():
+    cache = QueryCache()
+    key = QueryCache.make_key("SELECT * FROM Video_game")
+    generation = cache.generation(key)
+    cache.invalidate_tables(["User"])
+    assert cache.generation(key) == generation
+    assert cache.data_version() != ()
+
+
+def test_expired_entries_are_misses():
+    cache = QueryCache()
+    key = QueryCache.make_key("SELECT * FROM User")
+    cache.put(key, pd.DataFrame({"a": [1]}), ttl=-1)
+    assert cache.get(key) is None
+
+
+def test_memory_bound_evicts_least_recently_used():
+    frame = pd.DataFrame({"a": range(100)})
+    size = int(frame.memory_usage(index=True, deep=True).sum())
+    cache = QueryCache(max_bytes=2 * size)
+    first, second, third = (QueryCache.make_key(f"SELECT {i} FROM User") for i in range(3))
+    cache.put(first, frame)
+    cache.put(second, frame)
+    cache.get(first)
+    cache.put(third, frame)
+    assert cache.get(second) is None
+    assert cache.get(first) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_written_within():
+    cache = QueryCache()
+    assert not cache.written_within({"user"}, 60)
+    cache.invalidate_tables(["User"])
+    assert cache.written_within({"user"}, 60)
+    assert not cache.written_within({"video_game"}, 60)
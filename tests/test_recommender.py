@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("scipy")
+
+from recommender import ItemItemRecommender  # noqa: E402
+
+COLUMNS = ["email", "game_name", "initial_release_date", "rating_score"]
+
+
+def _ratings(rng, users=30, games=12, count=150):
+    rows = {(f"user{rng.integers(users)}", f"game{rng.integers(games)}", "2000-01-01") for _ in range(count)}
+    return [(email, name, date, float(rng.integers(1, 11))) for email, name, date in sorted(rows)]
+
+
+def _neighbor_weights(recommender):
+    """{game key: {neighbour key: weight}} for comparing two recommenders by key."""
+    result = {}
+    for key, i in recommender.items.items():
+        row = recommender.neighbors[i]
+        result[key] = {
+            recommender.game_keys[j]: float(w) for j, w in zip(row, recommender.weights[i]) if j >= 0 and w > 0
+        }
+    return result
+
+
+def test_incremental_ratings_match_a_rebuild():
+    rng = np.random.default_rng(7)
+    ratings = _ratings(rng)
+    built, added = ratings[:100], ratings[100:] + [("newcomer", "game3", "2000-01-01", 9.0), ("user1", "brand new", "2001-01-01", 7.0)]
+
+    # k above the game count, so every list holds every neighbour and the two can be compared exactly
+    incremental = ItemItemRecommender.from_frame(pd.DataFrame(built, columns=COLUMNS), k=50)
+    for rating in added:
+        incremental.add_rating(*rating)
+    rebuilt = ItemItemRecommender.from_frame(pd.DataFrame(built + added, columns=COLUMNS), k=50)
+
+    assert incremental.pending == len(added)
+    expected = _neighbor_weights(rebuilt)
+    actual = _neighbor_weights(incremental)
+    assert actual.keys() == expected.keys()
+    for key in expected:
+        assert actual[key].keys() == expected[key].keys(), key
+        for neighbor, weight in expected[key].items():
+            assert actual[key][neighbor] == pytest.approx(weight, rel=1e-4)
+
+    for email in ("user1", "user5", "newcomer"):
+        pd.testing.assert_frame_equal(incremental.recommend(email), rebuilt.recommend(email), check_dtype=False)
+
+
+def test_known_ratings_are_not_counted_twice():
+    recommender = ItemItemRecommender.from_frame(pd.DataFrame([
+        ("a", "x", "2000-01-01", 8.0),
+        ("a", "y", "2000-01-01", 6.0),
+    ], columns=COLUMNS))
+    recommender.add_rating("a", "x", "2000-01-01", 8.0)
+    recommender.add_rating("b", "x", "2000-01-01", 5.0)
+    recommender.add_rating("b", "x", "2000-01-01", 5.0)
+    assert recommender.pending == 1
+
+
+def test_recommend_skips_rated_games_and_unknown_users():
+    recommender = ItemItemRecommender.from_frame(pd.DataFrame([
+        ("a", "x", "2000-01-01", 9.0),
+        ("a", "y", "2000-01-01", 8.0),
+        ("b", "x", "2000-01-01", 9.0),
+        ("b", "z", "2000-01-01", 2.0),
+    ], columns=COLUMNS))
+    result = recommender.recommend("a")
+    assert result["game_name"].tolist() == ["z"]
+    assert recommender.recommend("nobody").empty
@@ -0,0 +1,60 @@
+import search
+from search import GameSearchIndex
+
+GAMES = [
+    ("Doom", "1993-12-10"),
+    ("Doom", "2016-05-13"),
+    ("Doom II", "1994-10-10"),
+    ("Final Doom", "1996-06-17"),
+    ("Quake", "1996-06-22"),
+    ("Dominion", "2008-01-01"),
+]
+
+
+def _index(keys=GAMES):
+    index = GameSearchIndex()
+    index.sync(keys)
+    return index
+
+
+def test_exact_then_prefix_then_substring():
+    results = _index().search("doom")
+    assert set(results[:2]) == {("Doom", "1993-12-10"), ("Doom", "2016-05-13")}
+    assert results[2:] == [("Doom II", "1994-10-10"), ("Final Doom", "1996-06-17")]
+
+
+def test_search_is_case_insensitive_and_limited():
+    index = _index()
+    assert index.search("  QUAKE ") == [("Quake", "1996-06-22")]
+    assert len(index.search("o", limit=2)) == 2
+    assert index.search("") == []
+    assert index.search("zelda") == []
+
+
+def test_short_terms_match_substrings():
+    assert _index().search("ua") == [("Quake", "1996-06-22")]
+
+
+def test_sync_adds_and_removes_incrementally():
+    index = _index()
+    added, removed = index.sync(GAMES[1:] + [("Quake II", "1997-12-09")])
+    assert (added, removed) == (1, 1)
+    assert len(index) == len(GAMES)
+    assert ("Doom", "1993-12-10") not in index.search("doom")
+    assert index.search("quake ii") == [("Quake II", "1997-12-09")]
+    assert index.refreshed_at is not None
+
+
+def test_remove_cleans_trigrams():
+    index = _index()
+    index.remove("Dominion", "2008-01-01")
+    index.remove("Dominion", "2008-01-01")
+    assert index.search("minion") == []
+    assert "nio" not in index._grams
+
+
+def test_failed_first_load_leaves_index_unrefreshed(monkeypatch):
+    monkeypatch.setattr(search, "_load_game_keys", lambda: [])
+    index = search.get_search_index.__wrapped__()
+    assert len(index) == 0
+    assert index.refreshed_at is None
@@ -0,0 +1,149 @@
+import json
+from contextlib import contextmanager
+
+import mysql.connector
+import pytest
+
+import write_behind
+from write_behind import RatingQueue
+
+pytestmark = pytest.mark.skipif(write_behind.fcntl is None, reason="journal locking needs fcntl")
+
+
+class _Cursor:
+    def __init__(self, refused):
+        self.refused = refused
+
+    def executemany(self, query, rows):
+        if any(row[0] in self.refused for row in rows):
+            raise mysql.connector.IntegrityError(msg="foreign key")
+
+    def execute(self, query, row):
+        if row[0] in self.refused:
+            raise mysql.connector.IntegrityError(msg="unknown user")
+
+    def close(self):
+        pass
+
+
+class _Connection:
+    def __init__(self, refused):
+        self.refused = refused
+        self.commits = 0
+
+    def cursor(self):
+        return _Cursor(self.refused)
+
+    def rollback(self):
+        pass
+
+    def commit(self):
+        self.commits += 1
+
+
+class _Pool:
+    """Stands in for db.ConnectionPool; emails in `refused` fail like an unknown user."""
+
+    def __init__(self, refused=()):
+        self.conn = _Connection(set(refused))
+
+    @contextmanager
+    def connection(self):
+        yield self.conn
+
+
+class _Metrics:
+    def record_query(self, *args, **kwargs):
+        pass
+
+
+@pytest.fixture
+def queues(monkeypatch):
+    """Opens RatingQueues without the flushing thread and closes their journal locks afterwards."""
+    monkeypatch.setattr(RatingQueue, "_run", lambda self: None)
+    monkeypatch.setattr(write_behind, "get_metrics", _Metrics)
+    monkeypatch.setattr(write_behind, "invalidate_tables", lambda tables: None)
+    opened = []
+
+    def open_queue(path, pool=None, on_commit=None):
+        queue = RatingQueue(str(path), pool or _Pool(), on_commit)
+        opened.append(queue)
+        return queue
+
+    yield open_queue
+    for queue in opened:
+        queue._journal_lock.close()
+
+
+def _journal(path):
+    return [json.loads(line) for line in open(path, encoding="utf-8")]
+
+
+def test_submit_is_durable_and_reloaded(tmp_path, queues):
+    journal = tmp_path / "journal.jsonl"
+    queue = queues(journal)
+    assert queue.submit("a@x", "Doom", "1993-12-10", 9) is not None
+    assert queue.submit("a@x", "Doom", "1993-12-10", 3) is None
+    assert [entry["rating_score"] for entry in _journal(journal)] == [9.0]
+    assert queue.pending_for("a@x")["game_name"].tolist() == ["Doom"]
+
+    queue._journal_lock.close()
+    with open(journal, "a", encoding="utf-8") as handle:
+        handle.write('{"torn')
+    reopened = queues(journal)
+    assert reopened.journal_path == str(journal)
+    assert reopened.stats()["pending"] == 1
+
+
+def test_each_process_gets_its_own_journal(tmp_path, queues):
+    journal = tmp_path / "journal.jsonl"
+    first, second = queues(journal), queues(journal)
+    assert first.journal_path == str(journal)
+    assert second.journal_path == str(tmp_path / "journal.1.jsonl")
+    assert second.rejects_path == str(tmp_path / "journal.1.rejected.jsonl")
+
+    # A freed slot is taken again, with whatever its previous owner left queued
+    second.submit("a@x", "Doom", "1993-12-10", 9)
+    second._journal_lock.close()
+    third = queues(journal)
+    assert third.journal_path == second.journal_path
+    assert third.stats()["pending"] == 1
+    assert queues(journal).journal_path == str(tmp_path / "journal.2.jsonl")
+
+
+def test_relative_journal_is_under_the_app_directory(tmp_path, queues, monkeypatch):
+    monkeypatch.setattr(write_behind, "APP_DIR", str(tmp_path))
+    assert queues("journal.jsonl").journal_path == str(tmp_path / "journal.jsonl")
+
+
+def test_flush_compacts_journal_and_rejects_refused_rows(tmp_path, queues):
+    journal = tmp_path / "journal.jsonl"
+    committed = []
+    queue = queues(journal, _Pool(refused={"ghost@x"}), committed.append)
+    queue.submit("a@x", "Doom", "1993-12-10", 9)
+    queue.submit("ghost@x", "Doom", "1993-12-10", 2)
+
+    assert queue.flush() == 2
+    assert queue.flush() == 0
+    assert _journal(journal) == []
+    assert [entry["email"] for entry in committed] == ["a@x"]
+    rejected = _journal(queue.rejects_path)
+    assert [(entry["email"], entry["error"]) for entry in rejected] == [("ghost@x", "unknown user")]
+    stats = queue.stats()
+    assert (stats["flushed"], stats["rejected"], stats["pending"]) == (1, 1, 0)
+
+
+def test_failed_flush_keeps_ratings_queued(tmp_path, queues):
+    class _DownPool:
+        @contextmanager
+        def connection(self):
+            raise mysql.connector.InterfaceError(msg="server gone")
+            yield
+
+    journal = tmp_path / "journal.jsonl"
+    queue = queues(journal, _DownPool())
+    queue.submit("a@x", "Doom", "1993-12-10", 9)
+    with pytest.raises(mysql.connector.InterfaceError):
+        queue.flush()
+    assert queue.stats()["pending"] == 1
+    assert len(_journal(journal)) == 1
@@ -0,0 +1,33 @@
+"""
+The app's pages, one module each with a render() function.
+
+Streamlit re-runs app.py on every interaction, so app.py only draws the
+layout and the navigation and then renders the selected page. A page's
+module, and everything it imports (plotly for the charting pages, the
+recommender, the collaboration graph, ...), is imported the first time the
+page is shown in the process; Python keeps it in sys.modules, so later
+reruns and other sessions reuse it.
+"""
+import importlib
+
+# Menu label -> module in this package, in menu order
+PAGES = {
+    "User Registration": "registration",
+    "Rate Games": "rate_games",
+    "My Ratings": "my_ratings",
+    "Game Browser": "game_browser",
+    "Top Charts": "top_charts",
+    "Dream Game Builder": "dream_builder",
+    "Director Analytics": "director_analytics",
+    "Platform Stats": "platform_stats",
+}
+# Only listed for admins
+ADMIN_PAGES = {
+    "Diagnostics": "diagnostics",
+}
+
+
+def load_page(label):
+    """Returns the module of a menu label, importing it on first use."""
+    module = PAGES.get(label) or ADMIN_PAGES[label]
+    return importlib.import_module(f"{__name__}.{module}")
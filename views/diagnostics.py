@@ -0,0 +1,94 @@
+import json
+
+import streamlit as st
+
+from db import check_schema, get_pool, get_query_cache, get_replicas
+from director_graph import graph_stats
+from instrumentation import get_metrics
+from recommender import recommendations_enabled, recommender_stats
+from snapshot import refresh_snapshot, snapshot_enabled, snapshot_status
+from write_behind import get_rating_queue, write_behind_enabled
+
+
+def render():
+    """Draws the Diagnostics page."""
+    st.header("🩺 Diagnostics")
+    metrics = get_metrics()
+    snapshot = metrics.snapshot()
+    snapshot["pool"] = get_pool().stats()
+    snapshot["cache"] = get_query_cache().stats()
+    missing = check_schema()
+    snapshot["missing_indexes"] = [f"{table}.{name}" for table, name in missing] if missing is not None else None
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Connection Pool")
+        st.json(snapshot["pool"])
+    with col2:
+        st.subheader("Query Cache")
+        st.json(snapshot["cache"])
+    if snapshot["missing_indexes"] is None:
+        st.warning("Could not check the database indexes (database unreachable); see the server log.")
+    elif snapshot["missing_indexes"]:
+        st.warning("Missing indexes: " + ", ".join(snapshot["missing_indexes"]))
+
+    replicas = get_replicas()
+    if replicas.pools:
+        snapshot["replicas"] = replicas.stats()
+        st.subheader("Read Replicas")
+        st.json(snapshot["replicas"])
+
+    if write_behind_enabled():
+        snapshot["rating_queue"] = get_rating_queue().stats()
+        st.subheader("Rating Write-Behind Queue")
+        st.json(snapshot["rating_queue"])
+
+    if recommendations_enabled() and recommender_stats():
+        snapshot["recommender"] = recommender_stats()
+        st.subheader("Recommender")
+        st.json(snapshot["recommender"])
+
+    if graph_stats():
+        snapshot["director_graph"] = graph_stats()
+        st.subheader("Director Graph")
+        st.json(snapshot["director_graph"])
+
+    if snapshot_enabled():
+        snapshot["analytics_snapshot"] = snapshot_status()
+        st.subheader("Analytics Snapshot")
+        st.json(snapshot["analytics_snapshot"])
+        if st.button("Refresh snapshot now", disabled=snapshot["analytics_snapshot"]["exporting"]):
+            refresh_snapshot()
+            st.rerun()
+
+    st.subheader("Page Render Times")
+    st.dataframe(
+        [{"page": page, **{k: v for k, v in stats.items() if k != "histogram"}} for page, stats in snapshot["pages"].items()],
+        use_container_width=True,
+    )
+
+    st.subheader("Queries (by total time)")
+    queries = sorted(snapshot["queries"].items(), key=lambda item: item[1]["total_ms"], reverse=True)
+    st.dataframe(
+        [{"sql": sql, **{k: v for k, v in stats.items() if k != "histogram"}} for sql, stats in queries],
+        use_container_width=True,
+    )
+
+    st.subheader(f"Slow Queries (≥ {snapshot['slow_query_ms']:.0f} ms)")
+    for entry in reversed(snapshot["slow_queries"]):
+        with st.expander(f"{entry['at']} · {entry['ms']} ms · {entry['rows']} rows · {entry['sql'][:80]}"):
+            st.code(entry["sql"], language="sql")
+            st.caption(f"Parameters: {entry['params']}" + (f" · Error: {entry['error']}" if entry["error"] else ""))
+            if entry["explain"]:
+                st.dataframe(entry["explain"], use_container_width=True)
+            else:
+                st.caption("EXPLAIN not captured yet.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("Download JSON", json.dumps(snapshot, indent=2, default=str),
+                           file_name="vgdb-diagnostics.json", mime="application/json")
+    with col2:
+        if st.button("Reset metrics"):
+            metrics.reset()
+            st.rerun()
@@ -0,0 +1,81 @@
+import plotly.express as px
+import streamlit as st
+
+from dictionary import dimension_selector
+from director_graph import get_graph
+from panels import panel_selector
+
+
+def render():
+    """Draws the Director Analytics page."""
+    st.header("🎬 Director Analytics")
+    # Every panel reads the shared collaboration graph; no query per view
+    graph = get_graph()
+    if graph:
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("Top 5 Most Prolific Directors")
+            st.dataframe(graph.prolific_directors(), use_container_width=True)
+
+        with col2:
+            st.subheader("Top 5 Collaborations (Director + Company)")
+            st.dataframe(graph.top_collaborations(), use_container_width=True)
+
+        st.markdown("---")
+        view = panel_selector("Drill down", ["Director", "Company", "Genre", "Shared Collaborators"], key="director_view")
+
+        if view == "Director":
+            director = dimension_selector("Director", "director", key="director_pick", all_label="Select a director")
+            summary = graph.summary(director)
+            if summary:
+                c1, c2, c3, c4 = st.columns(4)
+                c1.metric("Games", summary["games"])
+                c2.metric("Active", f"{summary['first_year'] or '?'} – {summary['last_year'] or '?'}")
+                c3.metric("Avg Critic Rating", f"{summary['avg_critic']:.1f}" if summary["avg_critic"] is not None else "–")
+                c4.metric("Avg Player Rating", f"{summary['avg_player']:.2f}" if summary["avg_player"] is not None else "–")
+
+                timeline = graph.timeline(director)
+                rated = timeline.dropna(subset=["year", "critics_rating"])
+                if not rated.empty:
+                    fig = px.scatter(rated, x="year", y="critics_rating", hover_name="game_name",
+                                     hover_data=["company_name", "genre_name"], title=f"Career Timeline: {director}")
+                    st.plotly_chart(fig, use_container_width=True)
+                st.dataframe(timeline, use_container_width=True)
+
+                c1, c2, c3 = st.columns(3)
+                with c1:
+                    st.subheader("Top Companies")
+                    st.dataframe(graph.top_partners(director, "developer"), use_container_width=True)
+                with c2:
+                    st.subheader("Genres")
+                    st.dataframe(graph.top_partners(director, "genre"), use_container_width=True)
+                with c3:
+                    st.subheader("Shares the Most Companies With")
+                    st.dataframe(graph.similar_directors(director, "developer"), use_container_width=True)
+
+        elif view == "Company":
+            company = dimension_selector("Company", "company", key="director_company", all_label="Select a company")
+            if company:
+                st.subheader(f"Directors Who Worked Most With {company}")
+                st.dataframe(graph.top_directors(company, "developer"), use_container_width=True)
+
+        elif view == "Genre":
+            genre = dimension_selector("Genre", "genre", key="director_genre", all_label="Select a genre")
+            if genre:
+                st.subheader(f"Most Prolific {genre} Directors")
+                st.dataframe(graph.top_directors(genre, "genre"), use_container_width=True)
+
+        elif view == "Shared Collaborators":
+            col1, col2 = st.columns(2)
+            with col1:
+                director_a = dimension_selector("First director", "director", key="shared_a", all_label="Select a director")
+            with col2:
+                director_b = dimension_selector("Second director", "director", key="shared_b", all_label="Select a director")
+            if director_a and director_b:
+                shared = graph.shared_partners(director_a, director_b, "developer")
+                st.subheader(f"Companies Both Worked With ({len(shared)})")
+                st.dataframe(
+                    shared.rename(columns={"games_a": director_a, "games_b": director_b}),
+                    use_container_width=True,
+                )
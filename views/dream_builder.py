@@ -0,0 +1,68 @@
+import streamlit as st
+
+from analytics import DREAM_GAME_DIMENSIONS, best_by_dimension
+from rollups import best_by_dimension_from_rollups, rollups_enabled, show_rollup_freshness
+from schema import get_dimension
+from snapshot import get_snapshot, show_snapshot_freshness, snapshot_enabled
+
+
+def render():
+    """Draws the Dream Game Builder page."""
+    st.header("✨ Dream Game Builder")
+    st.markdown("Based on **Player Ratings**, here is the statistically 'Perfect' game spec:")
+
+
+    def flexible_metric(label, value, delta):
+        st.caption(label)  # Small label text
+        st.markdown(f"#### {value}")  # Header text
+        if delta:
+            st.markdown(f":green[↑ {delta}]")  # Colored delta text
+        else:
+            st.write("") # Spacer
+
+
+    # Every dimension's winner comes back from a single batched query
+    snap = get_snapshot() if snapshot_enabled() else None
+    if snap:
+        best = snap.best_by_dimension(DREAM_GAME_DIMENSIONS)
+        show_snapshot_freshness(snap)
+    elif rollups_enabled():
+        best = best_by_dimension_from_rollups(DREAM_GAME_DIMENSIONS)
+        show_rollup_freshness()
+    else:
+        best = best_by_dimension(DREAM_GAME_DIMENSIONS)
+
+    def dimension_metric(key):
+        dim = get_dimension(key)
+        if key in best.index:
+            flexible_metric(dim.label, best.at[key, 'value'], f"{best.at[key, 'score']:.1f} Rating")
+        else:
+            flexible_metric(dim.label, "N/A", None)
+
+
+    st.markdown("### 🏭 Core Production Specs")
+    for col, key in zip(st.columns(4), ["developer", "publisher", "genre", "setting"]):
+        with col:
+            dimension_metric(key)
+
+    st.divider() # Visual separator
+
+
+    st.markdown("### 🎮 Gameplay & Design")
+    for col, key in zip(st.columns(4), ["perspective", "pacing", "interface", "input_device"]):
+        with col:
+            dimension_metric(key)
+
+    st.divider()
+
+
+    st.markdown("### 📦 Market & Format")
+    col9, col10, col11, col12 = st.columns(4)
+    for col, key in zip([col9, col10, col11], ["business_model", "media_type", "maturity_rating"]):
+        with col:
+            dimension_metric(key)
+
+    # 12. Conclusion
+    with col12:
+        st.write("") # Spacer
+        st.success("If this game existed, it would be a masterpiece!")
@@ -0,0 +1,58 @@
+import streamlit as st
+
+from browser import browse_games
+from dictionary import dimension_selector, prefetch_dictionaries
+
+
+def render():
+    """Draws the Game Browser page."""
+    st.header("🔍 Browse Games")
+
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    # Lookup lists come from the shared dimension dictionaries; the company
+    # list is too long to send whole, so those two filters search as you type
+    prefetch_dictionaries(["genre", "platform", "company"])
+    with col1:
+        sel_genre = dimension_selector("Filter by Genre", "genre", key="browser_genre")
+
+    with col2:
+        sel_platform = dimension_selector("Filter by Platform", "platform", key="browser_platform")
+
+    with col3:
+        sel_dev = dimension_selector("Filter by Developer", "company", key="browser_developer")
+
+    with col4:
+        sel_pub = dimension_selector("Filter by Publisher", "company", key="browser_publisher")
+
+    # Only the selected filters are applied, each as an EXISTS probe on its link table
+    filters = {
+        "genre": sel_genre,
+        "platform": sel_platform,
+        "developer": sel_dev,
+        "publisher": sel_pub,
+    }
+
+    # Keyset pagination: remember the cursor each visited page started from,
+    # and start over whenever the filters change
+    filter_key = tuple(filters.values())
+    if st.session_state.get("browser_filters") != filter_key:
+        st.session_state.browser_filters = filter_key
+        st.session_state.browser_cursors = [None]
+    cursors = st.session_state.browser_cursors
+
+    results, next_cursor = browse_games(filters, cursors[-1])
+    st.dataframe(results, use_container_width=True)
+
+    prev_col, page_col, next_col = st.columns([1, 4, 1])
+    with prev_col:
+        if st.button("◀ Previous", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with page_col:
+        st.caption(f"Page {len(cursors)}")
+    with next_col:
+        if st.button("Next ▶", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun()
@@ -0,0 +1,39 @@
+import pandas as pd
+import streamlit as st
+
+from db import run_query
+from queries import MY_RATINGS
+from recommender import recommend_games, recommendations_enabled
+from write_behind import get_rating_queue, write_behind_enabled
+
+
+def render():
+    """Draws the My Ratings page."""
+    st.header("📜 My Rating History")
+    user_email = st.text_input("Enter your Email:")
+    if user_email:
+        df = run_query(MY_RATINGS, (user_email,))
+        if write_behind_enabled():
+            # Ratings still in the write-behind queue come first, as the newest
+            pending = get_rating_queue().pending_for(user_email)
+            if not pending.empty:
+                saved = set(zip(df.get("game_name", []), df.get("initial_release_date", pd.Series(dtype=object)).astype(str)))
+                pending = pending[[(name, date) not in saved for name, date in zip(pending["game_name"], pending["initial_release_date"])]]
+                if not pending.empty:
+                    st.caption(f"⏳ {len(pending)} rating(s) still being saved.")
+                    df = pd.concat([pending, df], ignore_index=True)
+        if not df.empty:
+            st.dataframe(df, use_container_width=True)
+        else:
+            st.info("No ratings found for this user.")
+
+        # Games similar to the ones this user rated highly, from other users' ratings
+        if recommendations_enabled():
+            st.subheader("🎯 Recommended for You")
+            recommended = recommend_games(user_email)
+            if recommended is None:
+                st.caption("Recommendations are still being prepared; check back in a moment.")
+            elif not recommended.empty:
+                st.dataframe(recommended, use_container_width=True, hide_index=True)
+            else:
+                st.caption("Rate a few more games to get recommendations.")
@@ -0,0 +1,32 @@
+import plotly.express as px
+import streamlit as st
+
+from db import run_query
+from queries import platform_stats_sql
+from rollups import platform_stats_from_rollups, rollups_enabled, show_rollup_freshness
+from snapshot import get_snapshot, show_snapshot_freshness, snapshot_enabled
+
+
+def render():
+    """Draws the Platform Stats page."""
+    st.header("🕹️ Platform Statistics")
+
+    snap = get_snapshot() if snapshot_enabled() else None
+    if snap:
+        df = snap.platform_stats()
+        show_snapshot_freshness(snap)
+    elif rollups_enabled():
+        df = platform_stats_from_rollups()
+        show_rollup_freshness()
+    else:
+        df = run_query(platform_stats_sql(), compact=True)
+
+    # Interactive Bubble Chart
+    if not df.empty:
+        fig = px.scatter(df, x="avg_critic", y="avg_player",
+                         size="game_count", color="platform_name",
+                         hover_name="platform_name", size_max=60,
+                         title="Platform Landscape: Quantity vs Quality")
+        st.plotly_chart(fig, use_container_width=True)
+
+        st.dataframe(df)
@@ -0,0 +1,59 @@
+import streamlit as st
+
+from db import run_query, run_transaction
+from queries import RATING_EXISTS, RATING_INSERT, USER_BY_EMAIL
+from recommender import record_rating
+from search import search_games
+from write_behind import get_rating_queue, write_behind_enabled
+
+
+def render():
+    """Draws the Rate Games page."""
+    st.header("⭐ Rate a Game")
+
+    # Step 1: Select User
+    user_email = st.text_input("Enter your Email to login:")
+
+    if user_email:
+        # Verify user exists
+        user_check = run_query(USER_BY_EMAIL, (user_email,))
+        if not user_check.empty:
+            st.success(f"Welcome back, {user_check.iloc[0]['username']}!")
+
+            # Step 2: Find Game to Rate
+            search_term = st.text_input("Search for a game to rate:")
+            if search_term:
+                games = search_games(search_term)
+
+                if not games.empty:
+                    # Create a selection list
+                    game_options = [f"{row['game_name']} ({row['initial_release_date']})" for index, row in games.iterrows()]
+                    selected_game_str = st.selectbox("Select Game", game_options)
+
+                    # Extract real values from selection
+                    selected_idx = game_options.index(selected_game_str)
+                    sel_game_name = games.iloc[selected_idx]['game_name']
+                    sel_release_date = str(games.iloc[selected_idx]['initial_release_date'])
+
+                    rating_val = st.slider("Your Rating", 1.0, 10.0, 5.0, 0.1)
+
+                    if st.button("Submit Rating"):
+                        if write_behind_enabled():
+                            # Queued locally and saved in the background; My Ratings shows it meanwhile
+                            queue = get_rating_queue()
+                            already_rated = not run_query(RATING_EXISTS, (user_email, sel_game_name, sel_release_date), ttl=0).empty
+                            success = not already_rated and queue.submit(user_email, sel_game_name, sel_release_date, rating_val) is not None
+                            if not success:
+                                st.warning("You have already rated this game.")
+                        else:
+                            success = run_transaction(RATING_INSERT, (user_email, sel_game_name, sel_release_date, rating_val))
+                            if success:
+                                # Queued ratings reach the recommender when the flush commits them
+                                record_rating(user_email, sel_game_name, sel_release_date, rating_val)
+                        if success:
+                            st.balloons()
+                            st.success("Rating submitted!")
+                else:
+                    st.info("No games found.")
+        else:
+            st.error("User not found. Please register first.")
@@ -0,0 +1,38 @@
+import datetime
+
+import streamlit as st
+
+from db import run_transaction
+from queries import USER_INSERT
+
+
+def render():
+    """Draws the User Registration page."""
+    st.header("📝 Register New User")
+    with st.form("register_form"):
+        col1, col2 = st.columns(2)
+        with col1:
+            new_username = st.text_input("Username")
+            new_email = st.text_input("Email")
+            new_gender = st.selectbox("Gender", ["Male", "Female", "Non-binary", "Prefer not to say"])
+        with col2:
+            new_age = st.number_input("Age", min_value=13, max_value=100)
+
+            min_date = datetime.date(1900, 1, 1)
+            max_date = datetime.date.today()
+            default_date = datetime.date(2000, 1, 1)
+
+            new_birthdate = st.date_input("Birthdate", value=default_date, min_value=min_date, max_value=max_date)
+            # -----------------------------
+
+            new_country = st.text_input("Country")
+
+        submit = st.form_submit_button("Register")
+
+        if submit:
+            if new_email and new_username:
+                success = run_transaction(USER_INSERT, (new_username, new_email, new_gender, new_age, new_birthdate, new_country))
+                if success:
+                    st.success(f"User {new_username} registered successfully!")
+            else:
+                st.warning("Email and Username are required.")
@@ -0,0 +1,117 @@
+import streamlit as st
+
+from analytics import top_n_per_group, top_rated_games_by_metric
+from db import run_query
+from dictionary import get_dictionary
+from panels import memoized_panel, panel_selector
+from query_cache import STATIC_TTL
+from queries import YEAR_LIST, devs_by_genre_source_sql, top_by_genre_source_sql, top_by_setting_source_sql
+from rollups import genre_developer_source_sql, rollups_enabled, show_rollup_freshness
+from snapshot import get_snapshot, show_snapshot_freshness, snapshot_enabled
+
+
+def render():
+    """Draws the Top Charts page."""
+    st.header("🏆 Top Charts")
+
+    # With snapshot mode on, every chart is computed locally from the catalog snapshot
+    snap = get_snapshot() if snapshot_enabled() else None
+    snap_version = snap.exported_at if snap else None
+    if snap:
+        show_snapshot_freshness(snap)
+
+    # Only the selected chart runs; each keeps its last result until its inputs change
+    chart = panel_selector("Chart", ["By Genre", "By Year", "Top 5 MobyScore (Genre)", "Top 5 MobyScore (Setting)", "Top 5 Devs (Genre)"], key="top_charts_panel")
+
+    # Top Games IN EACH Genre
+    if chart == "By Genre":
+        st.subheader("Top Rated Games by Genre")
+
+        # 1. Get list of genres for the dropdown
+        target_genre = st.selectbox("Select a Genre:", get_dictionary("genre").values())
+
+        if target_genre:
+            # 2. Let the database pick the top 10 for each rating
+            top_rated = snap.top_rated_games_by_metric if snap else top_rated_games_by_metric
+            top = memoized_panel("top_by_genre", (target_genre, snap_version), lambda: (
+                top_rated(["critics_rating", "players_rating"], 10, genre=target_genre)
+            ))
+            top_critics, top_players = top["critics_rating"], top["players_rating"]
+
+            if not (top_critics.empty and top_players.empty):
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    st.markdown("### 🏛️ Critics' Favorites")
+                    st.dataframe(top_critics, use_container_width=True, hide_index=True)
+
+                with col2:
+                    st.markdown("### 🎮 Players' Favorites")
+                    st.dataframe(top_players, use_container_width=True, hide_index=True)
+            else:
+                st.warning("No games found for this genre.")
+
+    # Top Games IN EACH Year
+    elif chart == "By Year":
+        st.subheader("Top Rated Games by Year")
+
+        # 1. Get list of years
+        years = snap.release_years() if snap else run_query(YEAR_LIST, ttl=STATIC_TTL)['yr'].tolist()
+        target_year = st.selectbox("Select a Year:", years)
+
+        if target_year:
+            # 2. Let the database pick the top 10 for each rating
+            top_rated = snap.top_rated_games_by_metric if snap else top_rated_games_by_metric
+            top = memoized_panel("top_by_year", (target_year, snap_version), lambda: (
+                top_rated(["critics_rating", "players_rating"], 10, year=target_year)
+            ))
+            top_critics, top_players = top["critics_rating"], top["players_rating"]
+
+            if not (top_critics.empty and top_players.empty):
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    st.markdown("### 🏛️ Critics' Choices")
+                    st.dataframe(top_critics, use_container_width=True, hide_index=True)
+
+                with col2:
+                    st.markdown("### 🎮 Players' Choices")
+                    st.dataframe(top_players, use_container_width=True, hide_index=True)
+            else:
+                st.warning("No games found for this year.")
+
+    elif chart == "Top 5 MobyScore (Genre)":
+        st.subheader("Top 5 Games per Genre (Moby Score)")
+        # Ranked per genre on the server, only the winners come back
+        top_5 = memoized_panel("top5_moby_genre", snap_version, lambda: (
+            snap.top_n_per_group("genre", "moby_score", 5) if snap
+            else top_n_per_group(top_by_genre_source_sql(), "genre_name", "moby_score", 5)
+        ))
+        if not top_5.empty:
+            st.dataframe(top_5, use_container_width=True)
+
+    elif chart == "Top 5 MobyScore (Setting)":
+        st.subheader("Top 5 Games per Setting (Moby Score)")
+        top_5 = memoized_panel("top5_moby_setting", snap_version, lambda: (
+            snap.top_n_per_group("setting", "moby_score", 5) if snap
+            else top_n_per_group(top_by_setting_source_sql(), "setting_name", "moby_score", 5)
+        ))
+        if not top_5.empty:
+            st.dataframe(top_5, use_container_width=True)
+
+    elif chart == "Top 5 Devs (Genre)":
+        st.subheader("Top 5 Development Companies per Genre (Critics Rating)")
+        # We calculate the average critic rating for each company within each genre
+        query = devs_by_genre_source_sql()
+        use_rollups = not snap and rollups_enabled()
+        if use_rollups:
+            # Same averages, kept up to date in the pair rollup table
+            query = genre_developer_source_sql()
+            show_rollup_freshness()
+        # Take the top 5 companies for each genre
+        top_5_devs = memoized_panel("top5_devs_genre", (use_rollups, snap_version), lambda: (
+            snap.top_devs_per_genre(5) if snap
+            else top_n_per_group(query, "genre_name", "avg_critic_rating", 5)
+        ))
+        if not top_5_devs.empty:
+            st.dataframe(top_5_devs, use_container_width=True)
@@ -0,0 +1,253 @@
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+import mysql.connector
+import pandas as pd
+import streamlit as st
+
+try:
+    import fcntl
+except ImportError:   # Windows: no journal locking
+    fcntl = None
+
+from db import PoolTimeout, get_pool, invalidate_tables
+from instrumentation import get_metrics
+from queries import RATING_INSERT_DATED
+from recommender import record_rating
+
+logger = logging.getLogger(__name__)
+
+# WRITE-BEHIND RATING SUBMISSIONS
+#
+# With `write_behind = true`, "Submit Rating" appends the rating to a local
+# journal file (fsynced) and returns at once. A background worker inserts
+# queued ratings in batches, one transaction per batch, and rewrites the
+# journal without them once they are committed. Ratings still in the journal
+# after a restart are loaded again and flushed then.
+#
+# Connection problems keep the batch queued and retry with backoff. A batch
+# the server rejects is retried row by row (as in bulk_import.py), and rows
+# that still fail go to the rejects file. The insert leaves an already
+# stored row unchanged, so a batch retried after a lost commit acknowledgement
+# cannot fail on its own earlier rows.
+#
+# The journal is only ever rewritten by the process that holds its lock
+# (<journal>.lock, kept for the life of the process). When several app
+# processes share a host, the others take the next free numbered journal
+# (rating_journal.1.jsonl, ...), so a restarted process also picks up the
+# ratings a previous one left in it.
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_JOURNAL = "rating_journal.jsonl"   # relative paths are under APP_DIR
+BATCH_SIZE = 200
+FLUSH_INTERVAL = 1.0       # seconds between flushes while ratings are queued
+MAX_BACKOFF = 60.0
+TRANSIENT_ERRORS = (mysql.connector.OperationalError, mysql.connector.InterfaceError, PoolTimeout)
+
+
+def _fsync_write(path, lines, mode):
+    with open(path, mode, encoding="utf-8") as handle:
+        handle.writelines(lines)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+def _claim_journal(path):
+    """
+    Returns (journal path, open lock file) for the first of `path`,
+    `<stem>.1<ext>`, `<stem>.2<ext>`, ... that no other process holds.
+    """
+    if fcntl is None:
+        return path, None
+    stem, ext = os.path.splitext(path)
+    slot = 0
+    while True:
+        candidate = f"{stem}.{slot}{ext}" if slot else path
+        lock_file = open(f"{candidate}.lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            slot += 1
+            continue
+        return candidate, lock_file
+
+
+class RatingQueue:
+    """Journal-backed queue of rating submissions, flushed by a background thread."""
+
+    def __init__(self, journal_path, pool=None, on_commit=None):
+        self.journal_path, self._journal_lock = _claim_journal(os.path.join(APP_DIR, journal_path))
+        self.rejects_path = f"{os.path.splitext(self.journal_path)[0]}.rejected.jsonl"
+        self._pool = pool
+        self._on_commit = on_commit   # called with each committed entry, from the flushing thread
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending = {}        # (email, game_name, release_date) -> entry, in submission order
+        self._stats = {"submitted": 0, "flushed": 0, "rejected": 0, "batches": 0, "retries": 0}
+        self.last_error = None
+        self._load_journal()
+        threading.Thread(target=self._run, name="rating-write-behind", daemon=True).start()
+
+    def _load_journal(self):
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue   # a line torn by a crash mid-append
+                self._pending[self._key(entry)] = entry
+        if self._pending:
+            logger.info("Loaded %d queued rating(s) from %s", len(self._pending), self.journal_path)
+
+    @staticmethod
+    def _key(entry):
+        return entry["email"], entry["game_name"], entry["initial_release_date"]
+
+    def submit(self, email, game_name, release_date, score):
+        """
+        Durably queues a rating and returns its entry, or None when the same
+        user's rating of the same game is already queued.
+        """
+        entry = {
+            "id": uuid.uuid4().hex,
+            "email": email,
+            "game_name": game_name,
+            "initial_release_date": str(release_date),
+            "rating_score": float(score),
+            "rating_date": datetime.date.today().isoformat(),
+        }
+        with self._lock:
+            if self._key(entry) in self._pending:
+                return None
+            _fsync_write(self.journal_path, [json.dumps(entry) + "\n"], "a")
+            self._pending[self._key(entry)] = entry
+            self._stats["submitted"] += 1
+            queued = len(self._pending)
+        if queued >= BATCH_SIZE:
+            self._wake.set()
+        return entry
+
+    def pending_for(self, email):
+        """Queued ratings of one user with the columns of the My Ratings query."""
+        with self._lock:
+            entries = [entry for entry in self._pending.values() if entry["email"] == email]
+        return pd.DataFrame(
+            [(e["game_name"], e["initial_release_date"], e["rating_score"], e["rating_date"]) for e in entries],
+            columns=["game_name", "initial_release_date", "rating_score", "rating_date"],
+        )
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["pending"] = len(self._pending)
+        snapshot["last_error"] = self.last_error
+        return snapshot
+
+    # Background flushing
+
+    def _run(self):
+        backoff = FLUSH_INTERVAL
+        while True:
+            self._wake.wait(backoff)
+            self._wake.clear()
+            try:
+                while self.flush():
+                    pass
+                backoff = FLUSH_INTERVAL
+                self.last_error = None
+            except TRANSIENT_ERRORS as err:
+                self.last_error = str(err)
+                with self._lock:
+                    self._stats["retries"] += 1
+                backoff = min(backoff * 2, MAX_BACKOFF)
+                logger.warning("Rating flush failed, retrying in %.0fs: %s", backoff, err)
+            except Exception as err:
+                self.last_error = str(err)
+                backoff = MAX_BACKOFF
+                logger.exception("Rating flush failed")
+
+    def flush(self):
+        """Inserts up to BATCH_SIZE queued ratings; returns how many left the queue."""
+        with self._lock:
+            batch = list(self._pending.values())[:BATCH_SIZE]
+        if not batch:
+            return 0
+
+        started = time.perf_counter()
+        rejected = []
+        pool = self._pool or get_pool()
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            params = [
+                (e["email"], e["game_name"], e["initial_release_date"], e["rating_score"], e["rating_date"])
+                for e in batch
+            ]
+            try:
+                try:
+                    cursor.executemany(RATING_INSERT_DATED, params)
+                except TRANSIENT_ERRORS:
+                    raise
+                except mysql.connector.Error:
+                    conn.rollback()
+                    # Isolate the rows the server refuses (unknown user or game, bad values)
+                    for entry, row in zip(batch, params):
+                        try:
+                            cursor.execute(RATING_INSERT_DATED, row)
+                        except TRANSIENT_ERRORS:
+                            raise
+                        except mysql.connector.Error as err:
+                            rejected.append(dict(entry, error=err.msg))
+                conn.commit()
+            finally:
+                cursor.close()
+        get_metrics().record_query(RATING_INSERT_DATED, params[0], time.perf_counter() - started, rows=len(batch) - len(rejected))
+
+        with self._lock:
+            for entry in batch:
+                self._pending.pop(self._key(entry), None)
+            remaining = [json.dumps(entry) + "\n" for entry in self._pending.values()]
+            temporary = f"{self.journal_path}.tmp"
+            _fsync_write(temporary, remaining, "w")
+            os.replace(temporary, self.journal_path)
+            self._stats["flushed"] += len(batch) - len(rejected)
+            self._stats["rejected"] += len(rejected)
+            self._stats["batches"] += 1
+        if rejected:
+            _fsync_write(self.rejects_path, [json.dumps(entry) + "\n" for entry in rejected], "a")
+            logger.warning("%d queued rating(s) rejected, see %s", len(rejected), self.rejects_path)
+        invalidate_tables(["User_Rating"])
+        if self._on_commit is not None:
+            rejected_ids = {entry["id"] for entry in rejected}
+            for entry in batch:
+                if entry["id"] not in rejected_ids:
+                    try:
+                        self._on_commit(entry)
+                    except Exception:
+                        logger.exception("on_commit failed for queued rating %s", entry["id"])
+        return len(batch)
+
+
+def write_behind_enabled():
+    """True when `write_behind = true` is set in the [mysql] secrets."""
+    return bool(st.secrets["mysql"].get("write_behind", False))
+
+
+@st.cache_resource
+def get_rating_queue():
+    """
+    Opens the journal and starts the flushing thread once per process.
+    Ratings reach the recommender once committed, so rejected ones never do.
+    """
+    return RatingQueue(st.secrets["mysql"].get("rating_journal", DEFAULT_JOURNAL), get_pool(), on_commit=_record_committed)
+
+
+def _record_committed(entry):
+    record_rating(entry["email"], entry["game_name"], entry["initial_release_date"], entry["rating_score"])